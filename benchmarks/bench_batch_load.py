@@ -0,0 +1,153 @@
+"""
+批量表格加载基准测试
+测量批量模式窗口加载员工数据并保存一次的耗时，验证耗时随行数线性增长；
+同时给出原QTableWidget逐格填充方式（每个单元格变化都重新计算并保存整表）的对比，
+以及单次编辑和延迟保存的耗时（应与行数无关）
+
+运行方式: python -m benchmarks.bench_batch_load [最大行数]
+"""
+
+import os
+import sys
+import math
+import time
+
+# 无显示环境下也可运行
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtWidgets import QApplication, QTableWidget, QTableWidgetItem
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.calculator import calculate_absence_deduction, calculate_net_salary
+from ui.employee_table_model import FIELDS
+
+
+# 原方式的耗时随行数平方增长，只测较小的行数
+LEGACY_MAX_ROWS = 500
+
+
+def build_employees(count):
+    """生成员工数据"""
+    return [{
+        'name': f"员工{i}",
+        'year': 2024,
+        'month': 5,
+        'base_salary': 5000.0 + i % 3000,
+        'required_days': 22,
+        'actual_days': 20 + i % 3,
+        'night_shift': 200,
+        'high_temp': 100,
+        'late_fine': -50,
+        'others': 0,
+        'signature': ''
+    } for i in range(count)]
+
+
+def legacy_load(table, employees):
+    """原加载方式：逐格setItem，每次cellChanged都计算该行并重新扫描整表保存"""
+    def save():
+        rows = []
+        for row in range(table.rowCount()):
+            item = table.item(row, 0)
+            if item is None or not item.text().strip():
+                continue
+            rows.append({field: (table.item(row, col).text() if table.item(row, col) else '')
+                         for col, field in enumerate(FIELDS)})
+        return [row.copy() for row in rows]
+    
+    def cell_changed(row, column):
+        if column >= 10:
+            return
+        values = []
+        for col in range(3, 10):
+            item = table.item(row, col)
+            try:
+                values.append(float(item.text()) if item else 0.0)
+            except ValueError:
+                values.append(0.0)
+        deduction = calculate_absence_deduction(values[0], values[1], values[2])
+        net_salary = calculate_net_salary(values[0], deduction, *values[3:])
+        table.setItem(row, 10, QTableWidgetItem(f"{deduction:.2f}"))
+        table.setItem(row, 11, QTableWidgetItem(f"{net_salary:.2f}"))
+        save()
+    
+    table.setRowCount(0)
+    table.cellChanged.connect(cell_changed)
+    try:
+        for employee in employees:
+            row = table.rowCount()
+            table.insertRow(row)
+            for col, field in enumerate(FIELDS):
+                if col not in (10, 11):
+                    table.setItem(row, col, QTableWidgetItem(str(employee.get(field, ''))))
+    finally:
+        table.cellChanged.disconnect(cell_changed)
+    save()
+
+
+def measure_edits(window, count=200):
+    """
+    连续编辑count个单元格后保存一次
+    
+    返回:
+        tuple: (单次编辑耗时, 延迟保存耗时)，单位为秒
+    """
+    model = window.table_model
+    rows = model.rowCount()
+    start = time.perf_counter()
+    for i in range(count):
+        model.setData(model.index(i * 7 % rows, 3), str(6000 + i))
+    edit_time = (time.perf_counter() - start) / count
+    
+    start = time.perf_counter()
+    window.flush_changes()
+    return edit_time, time.perf_counter() - start
+
+
+def measure(func, repeat=3):
+    """返回最快一次的耗时（秒）"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(max_rows=20000):
+    app = QApplication.instance() or QApplication(sys.argv)
+    from ui.batch_payslip_ui import BatchPayslipWindow
+    
+    window = BatchPayslipWindow()
+    legacy_table = QTableWidget(0, len(FIELDS))
+    
+    sizes = [size for size in (100, 500, 1000, 2000, 5000, 10000, 20000) if size <= max_rows]
+    timings = []
+    for size in sizes:
+        employees = build_employees(size)
+        
+        def load():
+            # 加载并保存一次（与导入数据时的流程相同）
+            window.load_employees(employees)
+            window.save_data()
+            app.processEvents()
+        
+        elapsed = measure(load)
+        timings.append(elapsed)
+        edit_time, flush_time = measure_edits(window)
+        line = (f"行数={size:6d} 加载+保存={elapsed:.4f}s 单行={elapsed / size * 1e6:.2f}us "
+                f"单次编辑={edit_time * 1e6:.1f}us 保存200处编辑={flush_time * 1e3:.2f}ms")
+        if size <= LEGACY_MAX_ROWS:
+            legacy = measure(lambda: legacy_load(legacy_table, employees), repeat=1)
+            line += f"  原方式={legacy:.3f}s"
+        print(line)
+    
+    # 耗时与行数的双对数斜率，接近1表示线性增长
+    if len(sizes) > 2:
+        slope = math.log(timings[-1] / timings[1]) / math.log(sizes[-1] / sizes[1])
+        print(f"增长指数（{sizes[1]}~{sizes[-1]}行）={slope:.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
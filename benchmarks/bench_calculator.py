@@ -0,0 +1,77 @@
+"""
+批量计算基准测试
+比较逐行调用、纯Python批量计算和NumPy向量化计算的耗时，并核对结果是否一致
+
+运行方式: python -m benchmarks.bench_calculator [员工数量]
+"""
+
+import os
+import sys
+import time
+import random
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core import calculator
+from core.calculator import calculate_absence_deduction, calculate_net_salary, calculate_batch
+
+
+def build_columns(count, seed=0):
+    """生成各列工资数据，包含应出勤天数为0和全勤的行"""
+    rng = random.Random(seed)
+    base_salary = [round(rng.uniform(2000, 30000), 2) for _ in range(count)]
+    required_days = [rng.choice([0, 21.75, 22, 30, 31]) for _ in range(count)]
+    actual_days = [max(0, required - rng.choice([0, 0, 0.5, 1, 3])) for required in required_days]
+    night_shift = [rng.choice([0, 100, 200]) for _ in range(count)]
+    high_temp = [rng.choice([0, 150.5]) for _ in range(count)]
+    late_fine = [rng.choice([0, -20, -50]) for _ in range(count)]
+    others = [round(rng.uniform(-100, 500), 2) for _ in range(count)]
+    return base_salary, required_days, actual_days, night_shift, high_temp, late_fine, others
+
+
+def calculate_rows(columns):
+    """逐行调用单个计算函数（原有调用方式）"""
+    deductions = []
+    net_salaries = []
+    for base, required, actual, night, temp, fine, other in zip(*columns):
+        deduction = calculate_absence_deduction(base, required, actual)
+        deductions.append(deduction)
+        net_salaries.append(calculate_net_salary(base, deduction, night, temp, fine, other))
+    return deductions, net_salaries
+
+
+def measure(func, repeat=3):
+    """返回 (最快一次耗时, 结果)"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main(count=100000):
+    columns = build_columns(count)
+
+    cases = [
+        ("逐行调用", lambda: calculate_rows(columns)),
+        ("批量(纯Python)", lambda: calculate_batch(*columns, use_numpy=False)),
+    ]
+    if calculator._load_numpy() is not None:
+        cases.append(("批量(NumPy)", lambda: calculate_batch(*columns, use_numpy=True)))
+    else:
+        print("未安装NumPy，跳过向量化计算")
+
+    expected = None
+    for label, func in cases:
+        elapsed, result = measure(func)
+        if expected is None:
+            expected = result
+        same = "一致" if result == expected else "不一致"
+        print(f"{label:14} 行数={count} 耗时={elapsed:.3f}s "
+              f"单行={elapsed / count * 1e6:.2f}us 结果{same}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
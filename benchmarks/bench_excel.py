@@ -0,0 +1,116 @@
+"""
+Excel汇总表写入基准测试
+比较旧版写法（内存中构建整张表、逐单元格新建样式对象）与当前实现的
+写入耗时、峰值内存和文件大小
+
+运行方式: python -m benchmarks.bench_excel [员工数量]
+"""
+
+import os
+import sys
+import time
+import tempfile
+import tracemalloc
+from openpyxl import Workbook
+from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.excel import generate_summary_excel
+
+
+HEADERS = ["姓名", "年份", "月份", "基本工资", "应出勤天数", "实际出勤天数",
+           "夜班补助", "高温补贴", "迟到罚款", "其他", "缺勤扣款", "实发工资", "签字"]
+
+FIELDS = ['name', 'year', 'month', 'base_salary', 'required_days', 'actual_days',
+          'night_shift', 'high_temp', 'late_fine', 'others', 'absence_deduction',
+          'net_salary', 'signature']
+
+
+def legacy_set_cell_style(cell, style_type):
+    """旧版实现：每个单元格都新建边框、对齐、字体和填充对象"""
+    cell.border = Border(left=Side(style='thin'), right=Side(style='thin'),
+                         top=Side(style='thin'), bottom=Side(style='thin'))
+    cell.alignment = Alignment(horizontal='center', vertical='center')
+    if style_type == 'header':
+        cell.font = Font(bold=True, size=12)
+        cell.fill = PatternFill(start_color="DDDDDD", end_color="DDDDDD", fill_type="solid")
+    elif style_type == 'normal':
+        cell.font = Font(size=11)
+    elif style_type == 'deduction':
+        cell.font = Font(size=11, color="FF0000")
+    elif style_type == 'total':
+        cell.font = Font(bold=True, size=12)
+        cell.fill = PatternFill(start_color="E6F2FF", end_color="E6F2FF", fill_type="solid")
+
+
+def legacy_generate_summary_excel(employees, month, output_path):
+    """旧版汇总表写法，作为对比基准"""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "工资表"
+    for col in 'ABCDEFGHIJKLM':
+        ws.column_dimensions[col].width = 15
+    
+    current_row = 1
+    for index, employee in enumerate(employees):
+        for col, header in enumerate(HEADERS, 1):
+            cell = ws.cell(row=current_row, column=col)
+            cell.value = header
+            legacy_set_cell_style(cell, 'header')
+        current_row += 1
+        for col, field in enumerate(FIELDS, 1):
+            cell = ws.cell(row=current_row, column=col)
+            cell.value = employee.get(field)
+            legacy_set_cell_style(cell, 'normal')
+        legacy_set_cell_style(ws.cell(row=current_row, column=11), 'deduction')
+        legacy_set_cell_style(ws.cell(row=current_row, column=12), 'total')
+        if index != len(employees) - 1:
+            current_row += 2
+    
+    current_row += 2
+    ws.cell(row=current_row, column=1).value = "总计"
+    legacy_set_cell_style(ws.cell(row=current_row, column=1), 'header')
+    for col, field in ((4, 'base_salary'), (8, 'high_temp'), (11, 'absence_deduction'), (12, 'net_salary')):
+        ws.cell(row=current_row, column=col).value = sum(e[field] for e in employees)
+        legacy_set_cell_style(ws.cell(row=current_row, column=col), 'total')
+    
+    wb.save(output_path)
+    return output_path
+
+
+def build_employees(count):
+    """生成指定数量的员工数据"""
+    return [{
+        'name': f"员工{i}", 'year': 2024, 'month': 5,
+        'base_salary': 5000.0 + i % 3000, 'required_days': 31.0, 'actual_days': 29.0 + i % 3,
+        'night_shift': 200.0, 'high_temp': 100.0, 'late_fine': -50.0, 'others': 0.0,
+        'absence_deduction': -322.58, 'net_salary': 4927.42, 'signature': ''
+    } for i in range(count)]
+
+
+def measure(writer, employees, path):
+    """返回写入耗时（秒）、峰值内存（字节）和文件大小（字节）"""
+    start = time.perf_counter()
+    writer(employees, 5, path)
+    elapsed = time.perf_counter() - start
+    
+    tracemalloc.start()
+    writer(employees, 5, path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, os.path.getsize(path)
+
+
+def main(count=5000):
+    employees = build_employees(count)
+    print(f"员工数量={count}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for label, writer in (("旧版写法", legacy_generate_summary_excel),
+                              ("当前实现", generate_summary_excel)):
+            elapsed, peak, size = measure(writer, employees, os.path.join(tmp_dir, "summary.xlsx"))
+            print(f"{label}: 耗时={elapsed:.3f}s 峰值内存={peak / 1024 / 1024:.1f}MB "
+                  f"文件={size / 1024:.1f}KB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,103 @@
+"""
+工资历史基准测试
+生成多年的按月工资历史，测量写入、按员工查询一段时间、取出某个月的数据，
+以及由每月汇总计算年度累计与直接扫描原始数据的耗时，并核对两者结果一致
+
+运行方式: python -m benchmarks.bench_history [员工数量] [月数]
+"""
+
+import os
+import sys
+import time
+import random
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.calculator import calculate_batch, from_cents
+from utils.employee_store import EmployeeStore
+from utils.history import ROLLUP_FIELDS
+from utils.storage import PayslipStorage
+from benchmarks.bench_storage import timed, query_plan
+
+
+def build_period(names, year, month, rng):
+    """生成一个月的员工数据"""
+    count = len(names)
+    base_salary = [float(rng.randrange(300000, 2000000)) / 100 for _ in range(count)]
+    required_days = [22.0] * count
+    actual_days = [float(22 - rng.choice([0, 0, 0, 1, 2])) for _ in range(count)]
+    night_shift = [float(rng.choice([0, 100, 200])) for _ in range(count)]
+    high_temp = [float(rng.choice([0, 150])) if 6 <= month <= 9 else 0.0 for _ in range(count)]
+    late_fine = [float(rng.choice([0, 0, -50])) for _ in range(count)]
+    others = [0.0] * count
+    deductions, net_salaries = calculate_batch(base_salary, required_days, actual_days,
+                                               night_shift, high_temp, late_fine, others)
+    return EmployeeStore.from_columns({
+        'name': names, 'year': [year] * count, 'month': [month] * count,
+        'base_salary': base_salary, 'required_days': required_days, 'actual_days': actual_days,
+        'night_shift': night_shift, 'high_temp': high_temp, 'late_fine': late_fine, 'others': others,
+        'absence_deduction': deductions, 'net_salary': net_salaries, 'signature': [''] * count,
+    })
+
+
+def scan_year_to_date(storage, year, month):
+    """直接扫描原始数据计算年度累计（用于对比和核对）"""
+    sums = ", ".join(f"SUM(to_cents({field}))" for field in ROLLUP_FIELDS)
+    row = storage.connection.execute(
+        f"SELECT COUNT(*), {sums} FROM payroll_history WHERE year = ? AND month <= ?", (year, month)).fetchone()
+    return row[0], [from_cents(cents or 0) for cents in row[1:]]
+
+
+def main(count=2000, months=36):
+    rng = random.Random(0)
+    names = [f"员工{i}" for i in range(count)]
+    
+    with tempfile.TemporaryDirectory() as directory:
+        storage = PayslipStorage(os.path.join(directory, "payslip.db"))
+        
+        # 每月归档一次（与每月生成工资表后归档的流程相同）
+        periods = [(2022 + i // 12, 1 + i % 12) for i in range(months)]
+        start = time.perf_counter()
+        for year, month in periods:
+            storage.archive(build_period(names, year, month, rng))
+        elapsed = time.perf_counter() - start
+        print(f"员工数量={count} 月数={months} 历史行数={count * months}")
+        print(f"逐月归档={elapsed:.2f}s 每月={elapsed / months * 1e3:.1f}ms")
+        
+        # 重新归档最后一个月：替换该月的全部历史
+        year, month = periods[-1]
+        period = build_period(names, year, month, rng)
+        elapsed, _ = timed(lambda: storage.archive(period))
+        print(f"重新归档{year}年{month}月={elapsed * 1e3:.2f}ms")
+        
+        # 一名员工24个月的实发工资
+        name = names[count // 2]
+        end = periods[-1]
+        begin = periods[max(0, len(periods) - 24)]
+        elapsed, rows = timed(lambda: storage.history.employee_history(name, begin, end))
+        plan = query_plan(storage, "SELECT * FROM payroll_history WHERE name = ? AND (year, month) >= (?, ?) "
+                                   "AND (year, month) <= (?, ?)", (name, *begin, *end))
+        print(f"{name} {begin[0]}年{begin[1]}月-{end[0]}年{end[1]}月={elapsed * 1e3:.2f}ms 结果={len(rows)}条 "
+              f"查询计划：{plan}")
+        
+        elapsed, period = timed(lambda: storage.history.period(*end))
+        print(f"取出{end[0]}年{end[1]}月={elapsed * 1e3:.2f}ms 结果={len(period)}条")
+        
+        # 年度累计：每月汇总与扫描原始数据
+        elapsed, total = timed(lambda: storage.history.year_to_date(end[0], end[1]))
+        scan_elapsed, (scan_count, scan_sums) = timed(lambda: scan_year_to_date(storage, end[0], end[1]))
+        same = (total['employee_count'] == scan_count
+                and [total[field] for field in ROLLUP_FIELDS] == scan_sums)
+        print(f"年度累计  每月汇总={elapsed * 1e3:.3f}ms  扫描原始数据={scan_elapsed * 1e3:.2f}ms  "
+              f"结果{'一致' if same else '不一致'}  实发合计={total['net_salary']:.2f}")
+        
+        # 重新计算全部汇总后应与归档时计算的结果相同
+        before = storage.history.periods()
+        storage.history.rebuild_rollups()
+        print(f"归档时计算的汇总与重新计算{'一致' if before == storage.history.periods() else '不一致'}")
+        storage.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 36)
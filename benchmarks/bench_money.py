@@ -0,0 +1,108 @@
+"""
+定点金额计算基准测试
+比较浮点数、整数分和decimal.Decimal三种实现的耗时，
+并用随机数据核对整数分计算与Decimal高精度计算的结果是否完全一致
+
+运行方式: python -m benchmarks.bench_money [员工数量] [核对轮数]
+"""
+
+import os
+import sys
+import random
+from decimal import Decimal, ROUND_HALF_UP, ROUND_HALF_EVEN, localcontext
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.calculator import calculate_batch, sum_cents
+from benchmarks.bench_calculator import build_columns, measure
+
+
+CENT = Decimal('0.01')
+
+
+def decimal_batch(columns, rounding):
+    """使用Decimal计算的参考实现：金额先舍入到分，扣款整个算式只在最后舍入一次"""
+    deductions = []
+    net_salaries = []
+    with localcontext() as context:
+        # 足够高的精度保证除法结果在舍入前不会先被截断到进位边界
+        context.prec = 60
+        for row in zip(*columns):
+            base, required, actual, night, temp, fine, other = (Decimal(repr(value)) for value in row)
+            base = base.quantize(CENT, rounding=rounding)
+            if required <= 0 or actual >= required:
+                deduction = Decimal(0)
+            else:
+                deduction = (-(base * (required - actual)) / required).quantize(CENT, rounding=rounding)
+            net = base + deduction + sum(value.quantize(CENT, rounding=rounding)
+                                         for value in (night, temp, fine, other))
+            deductions.append(float(deduction))
+            net_salaries.append(float(net))
+    return deductions, net_salaries
+
+
+def random_columns(rng, count):
+    """生成用于核对的随机数据，包含正好落在半分上的扣款和超过两位小数的金额"""
+    def amount():
+        choice = rng.random()
+        if choice < 0.4:
+            return rng.randint(0, 3000000) / 100
+        if choice < 0.6:
+            return rng.randint(0, 30000)
+        if choice < 0.8:
+            return rng.randint(-30000000, 30000000) / 1000
+        return rng.uniform(-1000, 30000)
+
+    def days():
+        return rng.choice([0, 8, 16, 20, 21.75, 22, 30, 31, rng.randint(0, 3100) / 100, rng.uniform(0, 31)])
+
+    base_salary = [amount() for _ in range(count)]
+    required_days = [days() for _ in range(count)]
+    actual_days = [days() for _ in range(count)]
+    allowances = [[amount() for _ in range(count)] for _ in range(4)]
+    return [base_salary, required_days, actual_days] + allowances
+
+
+def cross_check(rounds, count=2000, seed=0):
+    """随机核对整数分计算与Decimal参考实现，返回不一致的行数"""
+    rng = random.Random(seed)
+    mismatches = 0
+    for _ in range(rounds):
+        columns = random_columns(rng, count)
+        for rounding in (ROUND_HALF_UP, ROUND_HALF_EVEN):
+            result = calculate_batch(*columns, rounding=rounding)
+            expected = decimal_batch(columns, rounding)
+            mismatches += sum(1 for got, want in zip(zip(*result), zip(*expected)) if got != want)
+    return mismatches
+
+
+def main(count=100000, rounds=20):
+    columns = build_columns(count)
+
+    cases = [
+        ("浮点数(round)", lambda: calculate_batch(*columns, use_numpy=False)),
+        ("整数分(HALF_UP)", lambda: calculate_batch(*columns, rounding=ROUND_HALF_UP)),
+        ("整数分(HALF_EVEN)", lambda: calculate_batch(*columns, rounding=ROUND_HALF_EVEN)),
+        ("Decimal(HALF_UP)", lambda: decimal_batch(columns, ROUND_HALF_UP)),
+    ]
+    results = {}
+    for label, func in cases:
+        elapsed, results[label] = measure(func)
+        print(f"{label:18} 行数={count} 耗时={elapsed:.3f}s 单行={elapsed / count * 1e6:.2f}us")
+
+    # 与浮点数结果相比，逐行金额的差异和汇总合计的误差
+    float_net = results["浮点数(round)"][1]
+    cents_net = results["整数分(HALF_UP)"][1]
+    changed = sum(1 for a, b in zip(float_net, cents_net) if a != b)
+    float_total = 0
+    for value in float_net:
+        float_total += value
+    print(f"实发工资与浮点数结果不同的行数={changed} "
+          f"浮点累加合计={float_total!r} 整数分合计={sum_cents(cents_net)!r}")
+
+    mismatches = cross_check(rounds)
+    print(f"随机核对 {rounds}轮 x 2000行 x 2种舍入方式，与Decimal不一致的行数={mismatches}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 20)
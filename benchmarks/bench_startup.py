@@ -0,0 +1,110 @@
+"""
+启动耗时基准测试
+在子进程中用 -X importtime 启动程序，显示主窗口后立即退出，测量从启动解释器到显示主窗口的耗时，
+输出程序自身的启动报告（各步骤耗时）和导入最慢的模块，超出启动预算时返回退出码1
+
+运行方式: python -m benchmarks.bench_startup [数据库中的员工数量] [重复次数]
+"""
+
+import os
+import sys
+import time
+import tempfile
+import subprocess
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.employee_store import EmployeeStore
+from utils.storage import PayslipStorage
+from utils.startup import STARTUP_REPORT_ENV, startup_budget_ms
+from benchmarks.bench_store import build_columns
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 列出的导入最慢的模块数量
+TOP_IMPORTS = 10
+
+# 启动后不应加载的模块（第一次导入或生成Excel时才加载）
+LAZY_MODULES = ('openpyxl', 'utils.data_import', 'utils.excel')
+
+STARTUP_CODE = f"""
+import sys
+import main
+main.main(quit_after_start=True)
+print("已加载延迟模块:", ",".join(m for m in {LAZY_MODULES!r} if m in sys.modules) or "无", file=sys.stderr)
+"""
+
+
+def run_once(db_path):
+    """
+    启动一次程序
+    
+    返回:
+        tuple: (耗时秒数, 标准错误输出)
+    """
+    env = dict(os.environ, PAYSLIP_DB_PATH=db_path)
+    env[STARTUP_REPORT_ENV] = '1'
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', STARTUP_CODE],
+                            cwd=ROOT, env=env, capture_output=True, text=True, encoding='utf-8')
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"程序启动失败：\n{result.stderr}")
+    return elapsed, result.stderr
+
+
+def parse_importtime(output):
+    """
+    解析 -X importtime 的输出
+    
+    返回:
+        tuple: (顶层导入的(累计微秒, 模块名)列表（按耗时降序）, 其余输出行)
+    """
+    imports = []
+    lines = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            lines.append(line)
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2]
+        # 顶层导入前只有一个空格，嵌套导入按层级缩进
+        if not name.startswith("  "):
+            imports.append((int(parts[1]), name.strip()))
+    imports.sort(reverse=True)
+    return imports, lines
+
+
+def main(count=0, repeat=3):
+    budget = startup_budget_ms()
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "payslip.db")
+        if count:
+            storage = PayslipStorage(db_path)
+            storage.save_roster(EmployeeStore.from_columns(build_columns(count)))
+            storage.close()
+        
+        best = None
+        for _ in range(repeat):
+            elapsed, output = run_once(db_path)
+            if best is None or elapsed < best[0]:
+                best = (elapsed, output)
+    
+    elapsed, output = best
+    imports, lines = parse_importtime(output)
+    print(f"员工数量={count} 重复{repeat}次")
+    print(f"启动到显示主窗口（含解释器启动）最快={elapsed * 1e3:.0f}ms 预算={budget}ms")
+    for line in lines:
+        if line.strip() and not line.startswith("QStandardPaths"):
+            print(line)
+    print(f"导入最慢的{TOP_IMPORTS}个顶层模块（累计耗时）：")
+    for microseconds, name in imports[:TOP_IMPORTS]:
+        print(f"  {name:<32} {microseconds / 1e3:7.1f}ms")
+    return 1 if elapsed * 1e3 > budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 0,
+                  int(sys.argv[2]) if len(sys.argv) > 2 else 3))
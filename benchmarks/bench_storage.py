@@ -0,0 +1,78 @@
+"""
+数据库持久化基准测试
+测量保存员工名单、归档工资历史、重新打开数据库加载名单的耗时（启动时的加载开销），
+以及按员工和按月份查询历史、保存少量编辑的耗时，并检查查询是否使用索引
+
+运行方式: python -m benchmarks.bench_storage [员工数量]
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.employee_store import EmployeeStore
+from utils.storage import PayslipStorage
+from benchmarks.bench_store import build_columns, copy_columns
+
+
+def timed(func):
+    """返回 (耗时, 结果)"""
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def query_plan(storage, sql, params):
+    """返回查询计划的说明文字"""
+    rows = storage.connection.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    return "; ".join(row[-1] for row in rows)
+
+
+def main(count=50000):
+    columns = build_columns(count)
+    store = EmployeeStore.from_columns(copy_columns(columns))
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "payslip.db")
+        
+        storage = PayslipStorage(path)
+        elapsed, _ = timed(lambda: storage.save_roster(store))
+        print(f"员工数量={count}")
+        print(f"保存名单（一个事务）={elapsed * 1e3:.1f}ms")
+        
+        employees = store.to_dicts()
+        elapsed, _ = timed(lambda: storage.archive(employees))
+        print(f"归档工资历史（一个事务）={elapsed * 1e3:.1f}ms")
+        
+        # 少量编辑只写入变化的行
+        updates = [(row, store[row]) for row in range(0, count, max(1, count // 200))]
+        elapsed, _ = timed(lambda: storage.save_roster_rows(updates))
+        print(f"保存{len(updates)}处编辑={elapsed * 1e3:.2f}ms")
+        storage.close()
+        
+        # 模拟启动：重新打开数据库并加载名单
+        def reopen():
+            reopened = PayslipStorage(path)
+            return reopened, reopened.load_roster()
+        elapsed, (storage, loaded) = timed(reopen)
+        same = "一致" if loaded.rows() == store.rows() else "不一致"
+        print(f"启动加载{len(loaded)}人={elapsed * 1e3:.1f}ms 数据{same}")
+        
+        name = columns['name'][count // 2]
+        elapsed, rows = timed(lambda: storage.history.employee_history(name))
+        plan = query_plan(storage, "SELECT * FROM payroll_history WHERE name = ?", (name,))
+        print(f"按员工查询={elapsed * 1e3:.2f}ms 结果={len(rows)}条 查询计划：{plan}")
+        
+        elapsed, period = timed(lambda: storage.history.period(2024, 5))
+        plan = query_plan(storage, "SELECT * FROM payroll_history WHERE year = ? AND month = ?", (2024, 5))
+        print(f"按月份查询={elapsed * 1e3:.2f}ms 结果={len(period)}条 查询计划：{plan}")
+        
+        elapsed, periods = timed(storage.history.periods)
+        print(f"月份列表={elapsed * 1e3:.2f}ms 共{len(periods)}个月")
+        storage.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
@@ -0,0 +1,175 @@
+"""
+员工数据存储基准测试
+比较原来每人一个字典的列表存储与按列存储EmployeeStore的内存占用，
+以及保存、获取（复制）、快照后编辑和合并导入数据的耗时
+
+运行方式: python -m benchmarks.bench_store [员工数量]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from array import array
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.employee_store import EmployeeStore, FIELDS, TEXT_FIELDS, INT_FIELDS
+
+
+def build_columns(count):
+    """生成与批量模式表格相同类型的各列数据"""
+    return {
+        'name': [f"员工{i}" for i in range(count)],
+        'year': array('l', [2024]) * count,
+        'month': array('l', (1 + i % 12 for i in range(count))),
+        'base_salary': array('d', (5000.0 + i % 3000 for i in range(count))),
+        'required_days': array('d', [22.0]) * count,
+        'actual_days': array('d', (20.0 + i % 3 for i in range(count))),
+        'night_shift': array('d', (float(i % 5 * 50) for i in range(count))),
+        'high_temp': array('d', (100.5 + i % 7 for i in range(count))),
+        'late_fine': array('d', (-float(i % 4 * 10) for i in range(count))),
+        'others': array('d', (i % 11 * 1.25 for i in range(count))),
+        'absence_deduction': array('d', (-(i % 3) * 227.27 for i in range(count))),
+        'net_salary': array('d', (5300.0 + i % 3000 * 0.5 for i in range(count))),
+        'signature': [''] * count,
+    }
+
+
+def build_dicts(columns):
+    """按原方式把各列转换为每人一个字典（与表格模型的employees()相同）"""
+    return [dict(zip(FIELDS, values)) for values in zip(*(columns[field] for field in FIELDS))]
+
+
+def copy_columns(columns):
+    """复制各列（与表格模型的employee_store()相同，每列整块复制）"""
+    return {field: values[:] for field, values in columns.items()}
+
+
+def measure_memory(func):
+    """返回func返回的对象占用的内存（字节），字符串由调用方另行创建，不计入"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = func()
+        size = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    return size, result
+
+
+def measure(func, repeat=5):
+    """返回最快一次的耗时（秒）"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def legacy_save(data_list):
+    """原save_batch_mode_data：补齐年月后复制每个字典"""
+    for item in data_list:
+        if 'year' not in item:
+            item['year'] = 2024
+        if 'month' not in item:
+            item['month'] = 1
+    return [item.copy() for item in data_list]
+
+
+def legacy_get(data):
+    """原get_batch_mode_data：复制每个字典"""
+    return [item.copy() for item in data]
+
+
+def legacy_merge(data, employees):
+    """原方式合并：每名导入的员工都线性查找同名数据，总耗时随人数平方增长"""
+    for employee in employees:
+        for i, item in enumerate(data):
+            if (item['name'], item['year'], item['month']) == (employee['name'], employee['year'], employee['month']):
+                data[i] = employee.copy()
+                break
+        else:
+            data.append(employee.copy())
+    return data
+
+
+def build_roster(columns, count):
+    """生成导入数据：前一半为已有员工（相同月份），后一半为新员工"""
+    names = columns['name']
+    months = columns['month']
+    half = count // 2
+    roster = []
+    for i in range(count):
+        if i < count - half:
+            name, month = names[half + i], months[half + i]
+        else:
+            name, month = f"新员工{i}", 1
+        roster.append({'name': name, 'year': 2024, 'month': month,
+                       'base_salary': 6000.0, 'required_days': 22.0, 'actual_days': 22.0})
+    return roster
+
+
+# 原合并方式的耗时随人数平方增长，只测较小的人数
+LEGACY_MERGE_ROWS = 5000
+
+
+def main(count=100000):
+    columns = build_columns(count)
+    
+    # 内存占用：字符串由两种方式共用，只统计存储结构和数值对象
+    dict_size, dicts = measure_memory(lambda: build_dicts(columns))
+    store_size, store = measure_memory(lambda: EmployeeStore.from_columns(copy_columns(columns)))
+    print(f"员工数量={count}")
+    print(f"内存  字典列表={dict_size / count:.0f}B/人  列存储={store_size / count:.0f}B/人  "
+          f"减少{(1 - store_size / dict_size) * 100:.0f}%")
+    
+    # 保存：原方式逐个复制字典；新方式整列复制表格模型的列并直接交给数据管理器
+    legacy = measure(lambda: legacy_save(build_dicts(columns)))
+    current = measure(lambda: EmployeeStore.from_columns(copy_columns(columns)))
+    print(f"保存  字典列表={legacy * 1e3:.2f}ms  列存储={current * 1e3:.2f}ms")
+    
+    # 获取：原方式复制全部字典；新方式返回快照，不复制数据
+    legacy = measure(lambda: legacy_get(dicts))
+    current = measure(store.snapshot)
+    print(f"获取  字典列表={legacy * 1e3:.2f}ms  快照={current * 1e6:.2f}us")
+    
+    # 快照后第一次编辑需复制各列，之后的编辑原地修改
+    row = dict(store[0])
+    def first_edit():
+        store.snapshot()
+        store.set_row(0, row)
+    first = measure(first_edit)
+    edit = measure(lambda: store.set_row(count // 2, row), repeat=1000)
+    print(f"编辑  快照后第一次={first * 1e3:.2f}ms（复制各列）  之后每次={edit * 1e6:.2f}us")
+    
+    # 加载到表格：整列读取只读视图
+    numeric = [field for field in FIELDS if field not in TEXT_FIELDS + INT_FIELDS]
+    def load_columns():
+        for field in numeric:
+            array('d').frombytes(store.column(field).cast('B'))
+    legacy = measure(lambda: [[employee.get(field) for employee in dicts] for field in numeric])
+    current = measure(load_columns)
+    print(f"读取数值列  字典列表={legacy * 1e3:.2f}ms  列视图={current * 1e3:.2f}ms")
+    
+    # 合并导入数据：按(姓名, 年份, 月份)更新或添加
+    size = min(count, LEGACY_MERGE_ROWS)
+    small = {field: values[:size] for field, values in columns.items()}
+    roster = build_roster(small, size)
+    legacy = measure(lambda: legacy_merge(build_dicts(small), roster), repeat=1)
+    current = measure(lambda: EmployeeStore.from_columns(copy_columns(small)).merge(roster), repeat=3)
+    print(f"合并{size}人  线性查找={legacy * 1e3:.1f}ms  索引={current * 1e3:.2f}ms")
+    
+    roster = build_roster(columns, count)
+    target = EmployeeStore.from_columns(copy_columns(columns))
+    start = time.perf_counter()
+    summary = target.merge(roster)
+    elapsed = time.perf_counter() - start
+    duplicates = target.duplicates()
+    print(f"合并{count}人  索引={elapsed * 1e3:.1f}ms  新增={summary.inserted} 更新={summary.updated} "
+          f"重复键={len(duplicates)}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,143 @@
+"""
+员工名单生成器
+按固定随机种子生成N名员工的名单，写成与导入模板（export_template）相同的多表头格式，
+支持.xlsx和.csv；messy=True时混入实际名单中常见的不规范写法：
+多余的空行和空单元格行、带千位分隔符的文本数字、缺少月份列、姓名前后有空格、可选列留空
+
+运行方式: python -m benchmarks.roster 员工数量 输出文件.xlsx|.csv [--messy] [--seed 种子]
+"""
+
+import os
+import sys
+import random
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.calculator import calculate_batch
+from benchmarks.bench_import import HEADERS, write_xlsx, write_csv
+
+
+SURNAMES = "王李张刘陈杨黄赵吴周徐孙马朱胡郭何高林罗"
+
+# 名单中的数值字段（与HEADERS中月份之后的列对应）
+NUMBER_FIELDS = ('base_salary', 'required_days', 'actual_days', 'night_shift', 'high_temp',
+                 'late_fine', 'others')
+
+# 可留空的列（导入时按0处理）
+OPTIONAL_FIELDS = ('night_shift', 'high_temp', 'late_fine', 'others')
+
+WRITERS = {
+    '.xlsx': write_xlsx,
+    '.csv': write_csv,
+}
+
+
+def generate_employees(count, seed=0, year=2024, month=5):
+    """
+    生成员工数据，相同的参数总是得到相同的结果
+    
+    参数:
+        count (int): 员工数量
+        seed (int, optional): 随机种子
+        year (int, optional): 年份
+        month (int, optional): 月份
+    
+    返回:
+        list: 员工数据字典列表，已计算缺勤扣款和实发工资，可直接用于生成工资表
+    """
+    rng = random.Random(seed)
+    employees = []
+    for i in range(count):
+        required_days = rng.choice((21.0, 22.0, 23.0, 30.0))
+        employees.append({
+            'name': f"{SURNAMES[i % len(SURNAMES)]}员工{i}",
+            'year': year,
+            'month': month,
+            'base_salary': float(rng.randrange(3000, 15001, 50)),
+            'required_days': required_days,
+            'actual_days': required_days - rng.choice((0, 0, 0, 1, 2, 3.5)),
+            'night_shift': float(rng.choice((0, 0, 200, 500))),
+            'high_temp': float(rng.choice((0, 100, 300))),
+            'late_fine': float(rng.choice((0, 0, 0, -50, -100))),
+            'others': rng.choice((0.0, 0.0, 88.5, -20.0, 1234.56)),
+            'signature': '',
+        })
+    
+    deductions, net_salaries = calculate_batch(*([employee[field] for employee in employees]
+                                                 for field in NUMBER_FIELDS))
+    for employee, deduction, net_salary in zip(employees, deductions, net_salaries):
+        employee['absence_deduction'] = deduction
+        employee['net_salary'] = net_salary
+    return employees
+
+
+def roster_rows(employees, messy=False, seed=0):
+    """
+    将员工数据转换为多表头格式的名单行：每名员工一个表头行、一个数据行和一个空行
+    
+    参数:
+        employees (list): 员工数据字典列表
+        messy (bool, optional): 是否混入不规范写法（每种写法按固定比例出现）
+        seed (int, optional): 不规范写法的随机种子
+    
+    生成:
+        list: 名单的一行
+    """
+    rng = random.Random(seed)
+    for employee in employees:
+        values = [employee['name'], employee['month']] + [employee[field] for field in NUMBER_FIELDS]
+        headers = HEADERS
+        if messy:
+            kind = rng.random()
+            if kind < 0.15:
+                # 带千位分隔符的文本数字
+                values[2:] = [f"{value:,.2f}" for value in values[2:]]
+            elif kind < 0.3:
+                # 缺少月份列，导入时按当前月份处理
+                headers = HEADERS[:1] + HEADERS[2:]
+                values = values[:1] + values[2:]
+            elif kind < 0.45:
+                # 姓名前后有空格，可选列留空
+                values[0] = f"  {values[0]} "
+                for field in OPTIONAL_FIELDS:
+                    if employee[field] == 0:
+                        values[2 + NUMBER_FIELDS.index(field)] = None
+        yield headers
+        yield values
+        yield []
+        if messy and rng.random() < 0.1:
+            # 多余的空行和只有空单元格的行
+            yield []
+            yield [None, "", " "]
+
+
+def write_roster(path, count, messy=False, seed=0):
+    """
+    生成名单文件，格式由扩展名决定
+    
+    参数:
+        path (str): 输出文件路径（.xlsx或.csv）
+        count (int): 员工数量
+        messy (bool, optional): 是否混入不规范写法
+        seed (int, optional): 随机种子
+    
+    返回:
+        list: 写入的员工数据字典列表
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in WRITERS:
+        raise ValueError(f"不支持的名单格式：{ext}")
+    employees = generate_employees(count, seed)
+    WRITERS[ext](path, roster_rows(employees, messy, seed))
+    return employees
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.roster", description="生成多表头格式的员工名单")
+    parser.add_argument("count", type=int, help="员工数量")
+    parser.add_argument("path", help="输出文件路径（.xlsx或.csv）")
+    parser.add_argument("--messy", action='store_true', help="混入空行、千位分隔符、缺少月份列等不规范写法")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子，默认为0")
+    args = parser.parse_args()
+    write_roster(args.path, args.count, args.messy, args.seed)
+    print(f"已生成{args.count}名员工的名单：{args.path}")
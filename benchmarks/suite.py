@@ -0,0 +1,259 @@
+"""
+性能基准测试套件
+用名单生成器（benchmarks.roster）按固定随机种子生成100/1千/1万/5万人的名单，
+分别测量导入（.xlsx/.csv，规范和不规范写法）、批量计算、生成汇总工资表和生成个人工资条的耗时，
+输出每个阶段的吞吐量（人/秒）和峰值内存（RSS），结果为JSON，可保存后与其他提交的结果比较
+
+每个阶段在单独的子进程中运行，峰值内存只包含该阶段（和生成输入数据）的占用
+
+运行方式:
+    python -m benchmarks.suite [-s 100 -s 1000] [--stage import_csv] [-o 结果.json]
+    python -m benchmarks.suite --compare 旧结果.json 新结果.json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_SIZES = (100, 1000, 10000, 50000)
+
+# 阶段名 -> 说明
+STAGES = {
+    'import_xlsx': "导入规范的.xlsx名单",
+    'import_xlsx_messy': "导入不规范的.xlsx名单",
+    'import_csv': "导入规范的.csv名单",
+    'import_csv_messy': "导入不规范的.csv名单",
+    'calculate': "批量计算缺勤扣款和实发工资",
+    'summary_excel': "生成汇总工资表",
+    'batch_excel': "生成个人工资条（每人一个文件）",
+}
+
+# 比较结果时耗时增加超过该比例视为退化；两次耗时都短于MIN_COMPARE_SECONDS时误差太大，不判断
+REGRESSION_THRESHOLD = 0.2
+MIN_COMPARE_SECONDS = 0.01
+
+
+def peak_rss():
+    """
+    获取当前进程的峰值内存占用
+    
+    返回:
+        int: 峰值常驻内存（字节），无法获取时返回None
+    """
+    try:
+        import resource
+    except ImportError:
+        return _windows_peak_rss()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS以字节为单位，Linux以KB为单位
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _windows_peak_rss():
+    """通过GetProcessMemoryInfo获取Windows进程的峰值工作集"""
+    try:
+        import ctypes
+        from ctypes import wintypes
+    except ImportError:
+        return None
+    
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                    ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                    ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                    ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t)]
+    
+    counters = ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(counters)
+    try:
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return None
+    except (AttributeError, OSError):
+        return None
+    return counters.PeakWorkingSetSize
+
+
+def prepare_stage(stage, size, work_dir, seed):
+    """
+    准备一个阶段的输入数据（不计时）
+    
+    返回:
+        callable: 执行该阶段一次的函数，返回处理的员工人数
+    """
+    from benchmarks.roster import generate_employees, write_roster, NUMBER_FIELDS
+    
+    if stage.startswith('import_'):
+        from utils.data_import import import_employee_data
+        ext = '.' + stage.split('_')[1]
+        path = os.path.join(work_dir, f"roster{ext}")
+        write_roster(path, size, messy=stage.endswith('_messy'), seed=seed)
+        return lambda: len(import_employee_data(path))
+    
+    employees = generate_employees(size, seed)
+    if stage == 'calculate':
+        from core.calculator import calculate_batch
+        columns = [[employee[field] for employee in employees] for field in NUMBER_FIELDS]
+        return lambda: len(calculate_batch(*columns)[0])
+    
+    if stage == 'summary_excel':
+        from utils.excel import generate_summary_excel
+        path = os.path.join(work_dir, "summary.xlsx")
+        def summary_excel():
+            generate_summary_excel(employees, employees[0]['month'], path)
+            return len(employees)
+        return summary_excel
+    
+    if stage == 'batch_excel':
+        from utils.excel import batch_generate_excel
+        output_dir = os.path.join(work_dir, "payslips")
+        def batch_excel():
+            # 每次都写入空目录，避免文件系统中已有文件影响耗时
+            shutil.rmtree(output_dir, ignore_errors=True)
+            return len(batch_generate_excel(employees, output_dir))
+        return batch_excel
+    
+    raise ValueError(f"未知的阶段：{stage}")
+
+
+def run_stage(stage, size, repeat=3, seed=0):
+    """
+    在当前进程中执行一个阶段，取最快一次的耗时
+    
+    返回:
+        dict: 阶段结果，见main()输出的results
+    """
+    with tempfile.TemporaryDirectory() as work_dir:
+        func = prepare_stage(stage, size, work_dir, seed)
+        rss_before = peak_rss()
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            processed = func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        if processed != size:
+            raise RuntimeError(f"{stage}处理了{processed}人，应为{size}人")
+    
+    return {
+        'stage': stage,
+        'size': size,
+        'repeat': repeat,
+        'seconds': best,
+        'throughput': size / best if best else None,
+        'peak_rss': peak_rss(),
+        'peak_rss_before': rss_before,
+    }
+
+
+def run_in_subprocess(stage, size, repeat, seed):
+    """在新的子进程中执行一个阶段，使峰值内存互不影响"""
+    command = [sys.executable, '-m', 'benchmarks.suite', '--run-stage', stage,
+               '--size', str(size), '--repeat', str(repeat), '--seed', str(seed)]
+    result = subprocess.run(command, cwd=ROOT, capture_output=True, text=True, encoding='utf-8')
+    if result.returncode != 0:
+        raise RuntimeError(f"{stage} {size}人运行失败：\n{result.stderr}")
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def git_commit():
+    """当前提交的哈希，不在git仓库中时返回None"""
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True)
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def compare(old, new):
+    """
+    比较两次运行的结果，打印各阶段耗时和峰值内存的变化
+    
+    返回:
+        int: 有阶段耗时退化超过REGRESSION_THRESHOLD时返回1，否则返回0
+    """
+    old_results = {(item['stage'], item['size']): item for item in old['results']}
+    print(f"{old.get('commit')} -> {new.get('commit')}")
+    regressed = 0
+    for item in new['results']:
+        before = old_results.get((item['stage'], item['size']))
+        if before is None:
+            continue
+        ratio = item['seconds'] / before['seconds']
+        flag = ""
+        if ratio > 1 + REGRESSION_THRESHOLD and max(item['seconds'], before['seconds']) >= MIN_COMPARE_SECONDS:
+            flag = "  退化"
+            regressed += 1
+        memory = ""
+        if item.get('peak_rss') and before.get('peak_rss'):
+            memory = f"  峰值内存 {before['peak_rss'] / 2**20:.0f}MB -> {item['peak_rss'] / 2**20:.0f}MB"
+        print(f"  {item['stage']:<18} {item['size']:>6}人  {before['seconds'] * 1e3:9.1f}ms -> "
+              f"{item['seconds'] * 1e3:9.1f}ms ({ratio:.2f}x){memory}{flag}")
+    return 1 if regressed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite", description="性能基准测试套件")
+    parser.add_argument("-s", "--size", type=int, action='append', help="员工数量，可重复指定，默认为100/1000/10000/50000")
+    parser.add_argument("--stage", action='append', choices=list(STAGES), help="只运行指定阶段，可重复指定")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="每个阶段的重复次数，取最快一次，默认为3")
+    parser.add_argument("--seed", type=int, default=0, help="名单生成器的随机种子，默认为0")
+    parser.add_argument("-o", "--output", help="结果JSON文件路径，默认输出到标准输出")
+    parser.add_argument("--compare", nargs=2, metavar=("旧结果", "新结果"), help="比较两个结果文件")
+    parser.add_argument("--run-stage", choices=list(STAGES), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    
+    if args.compare:
+        with open(args.compare[0], encoding='utf-8') as f:
+            old = json.load(f)
+        with open(args.compare[1], encoding='utf-8') as f:
+            new = json.load(f)
+        return compare(old, new)
+    
+    if args.run_stage:
+        # 子进程：执行一个阶段并输出一行JSON
+        print(json.dumps(run_stage(args.run_stage, args.size[0], args.repeat, args.seed)))
+        return 0
+    
+    results = []
+    for size in args.size or DEFAULT_SIZES:
+        for stage in args.stage or STAGES:
+            result = run_in_subprocess(stage, size, args.repeat, args.seed)
+            results.append(result)
+            print(f"{stage:<18} {size:>6}人  {result['seconds'] * 1e3:9.1f}ms  "
+                  f"{result['throughput']:10.0f}人/秒  峰值内存={(result['peak_rss'] or 0) / 2**20:.0f}MB",
+                  file=sys.stderr)
+    
+    report = {
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'results': results,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
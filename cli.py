@@ -0,0 +1,246 @@
+"""
+工资条生成器命令行入口
+不导入PyQt5，可在没有显示器的服务器上定时批量处理员工名单：
+导入名单 -> 计算缺勤扣款和实发工资 -> 生成汇总工资表和/或个人工资条
+
+运行方式:
+    python -m cli 名单.xlsx [名单2.csv ...] -o 输出目录 [-m summary -m payslips] [-w 进程数]
+"""
+
+import os
+import sys
+import time
+import argparse
+import logging
+from datetime import datetime
+
+# 添加当前目录到系统路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.diagnostics import configure_logging
+from utils.data_import import import_employee_data
+from utils.excel import (generate_summary_excel, batch_generate_excel, generate_payslip_archive,
+                         BatchGenerateError)
+from core.calculator import calculate_batch
+
+logger = logging.getLogger(__name__)
+
+
+# 输出方式 -> 说明
+MODES = {
+    'summary': "汇总工资表",
+    'payslips': "个人工资条（每位员工一个Excel文件）",
+    'zip': "个人工资条（打包为一个ZIP压缩包）",
+    'workbook': "个人工资条（合并为一个Excel工作簿）",
+}
+
+# 退出码
+EXIT_OK = 0
+EXIT_FAILED = 1
+
+# 参与计算的数值字段
+NUMBER_FIELDS = ('base_salary', 'required_days', 'actual_days', 'night_shift', 'high_temp', 'late_fine', 'others')
+
+
+def build_parser():
+    """创建命令行参数解析器"""
+    parser = argparse.ArgumentParser(
+        prog="python -m cli",
+        description="不启动图形界面，批量导入员工名单并生成工资表和工资条",
+    )
+    parser.add_argument("rosters", nargs='+', metavar="名单文件",
+                        help="员工名单文件（.xlsx/.csv/.tsv/.jsonl），可指定多个")
+    parser.add_argument("-o", "--output-dir", default=".",
+                        help="输出目录，默认为当前目录；指定多个名单时每个名单输出到以文件名命名的子目录（重名时加上扩展名或所在目录名）")
+    parser.add_argument("-m", "--mode", action='append', choices=list(MODES),
+                        help="输出方式，可重复指定：" + "，".join(f"{k}={v}" for k, v in MODES.items())
+                             + "（默认summary）")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="生成个人工资条的并行进程数，默认为1，0表示使用全部CPU核心")
+    parser.add_argument("--year", type=int, help="名单中没有年份时使用的年份，默认为当前年份")
+    parser.add_argument("--month", type=int, choices=range(1, 13), metavar="{1..12}",
+                        help="汇总工资表的月份，默认为名单中第一名员工的月份")
+    parser.add_argument("--log-level", help="日志级别，如INFO、DEBUG（默认读取环境变量PAYSLIP_LOG_LEVEL）")
+    return parser
+
+
+def prepare_employees(employees, year):
+    """
+    补齐年份并计算缺勤扣款和实发工资，跳过基本工资或应出勤天数不大于零的员工
+    （与批量模式窗口生成前的检查相同）
+    
+    参数:
+        employees (list): 导入的员工数据字典列表
+        year (int): 缺少年份时使用的年份
+    
+    返回:
+        tuple: (可生成的员工数据列表, 跳过的员工姓名列表)
+    """
+    columns = [[employee.get(field) or 0 for employee in employees] for field in NUMBER_FIELDS]
+    deductions, net_salaries = calculate_batch(*columns)
+    
+    valid = []
+    skipped = []
+    for employee, deduction, net_salary in zip(employees, deductions, net_salaries):
+        if employee.get('base_salary', 0) <= 0 or employee.get('required_days', 0) <= 0:
+            logger.info("员工 %s 的数据无效: 基本工资或应出勤天数必须大于零", employee.get('name'))
+            skipped.append(employee.get('name'))
+            continue
+        employee.setdefault('year', year)
+        employee['absence_deduction'] = deduction
+        employee['net_salary'] = net_salary
+        valid.append(employee)
+    return valid, skipped
+
+
+def period_label(employees):
+    """
+    生成名单所含月份的文字，用于输出文件名
+    
+    参数:
+        employees (list): 员工数据字典列表（已补齐年份和月份）
+    
+    返回:
+        str: 只有一个月时如"2024年5月"，跨多个月时为最早和最晚的月份，如"2024年5月-2024年7月"
+    """
+    periods = sorted({(employee['year'], employee['month']) for employee in employees})
+    first = f"{periods[0][0]}年{periods[0][1]}月"
+    if len(periods) == 1:
+        return first
+    return f"{first}-{periods[-1][0]}年{periods[-1][1]}月"
+
+
+def roster_output_dirs(paths, output_dir):
+    """
+    为每个名单分配单独的输出子目录，名称互不相同
+    
+    默认以文件名（不含扩展名）命名；文件名相同时保留扩展名（如r.xlsx和r.csv），
+    仍然相同时加上所在目录名（如site_a_名单.xlsx），最后按出现顺序加编号
+    
+    参数:
+        paths (list): 名单文件路径列表
+        output_dir (str): 输出目录
+    
+    返回:
+        list: 与paths对应的输出子目录路径列表
+    """
+    def names(name_of, candidates):
+        # 只给仍然重名的名单换用更长的名称（Windows的文件名不区分大小写）
+        counts = {}
+        for name in candidates:
+            counts[name.lower()] = counts.get(name.lower(), 0) + 1
+        return [name_of(path) if counts[name.lower()] > 1 else name for path, name in zip(paths, candidates)]
+    
+    candidates = [os.path.splitext(os.path.basename(path))[0] for path in paths]
+    candidates = names(os.path.basename, candidates)
+    candidates = names(lambda path: "_".join(
+        [os.path.basename(os.path.dirname(os.path.abspath(path))), os.path.basename(path)]), candidates)
+    
+    # 同一文件指定多次等情况
+    used = set()
+    result = []
+    for name in candidates:
+        unique = name
+        number = 2
+        while unique.lower() in used:
+            unique = f"{name}_{number}"
+            number += 1
+        used.add(unique.lower())
+        result.append(os.path.join(output_dir, unique))
+    return result
+
+
+def process_roster(path, output_dir, modes, workers=1, year=None, month=None):
+    """
+    处理一个员工名单
+    
+    参数:
+        path (str): 名单文件路径
+        output_dir (str): 输出目录
+        modes (list): 输出方式列表，见MODES
+        workers (int, optional): 生成个人工资条的并行进程数
+        year (int, optional): 名单中没有年份时使用的年份
+        month (int, optional): 汇总工资表的月份
+    
+    输出文件以名单所含的月份命名，跨多个月时为月份范围（见period_label()）
+    
+    返回:
+        list: 生成的文件或目录路径列表
+    
+    异常:
+        ValueError: 名单中没有可生成的员工数据
+        BatchGenerateError: 部分员工的工资条生成失败
+    """
+    employees, skipped = prepare_employees(import_employee_data(path), year or datetime.now().year)
+    if skipped:
+        print(f"  跳过{len(skipped)}名数据无效的员工（基本工资或应出勤天数必须大于零）")
+    if not employees:
+        raise ValueError("没有有效的员工数据")
+    
+    os.makedirs(output_dir, exist_ok=True)
+    if month is None:
+        month = employees[0].get('month')
+    label = period_label(employees)
+    
+    outputs = []
+    for mode in modes:
+        if mode == 'summary':
+            output_path = os.path.join(output_dir, f"{label}工资表.xlsx")
+            outputs.append(generate_summary_excel(employees, month, output_path))
+        elif mode == 'payslips':
+            batch_generate_excel(employees, output_dir, workers=workers)
+            outputs.append(output_dir)
+        else:
+            extension = 'xlsx' if mode == 'workbook' else 'zip'
+            output_path = os.path.join(output_dir, f"{label}工资条.{extension}")
+            outputs.append(generate_payslip_archive(employees, output_path, as_workbook=mode == 'workbook'))
+    return outputs
+
+
+def main(argv=None):
+    """
+    命令行主入口
+    
+    返回:
+        int: 退出码，全部名单处理成功时为0，有名单失败时为1
+    """
+    args = build_parser().parse_args(argv)
+    configure_logging(args.log_level)
+    modes = list(dict.fromkeys(args.mode or ['summary']))
+    
+    # 多个名单时每个名单输出到单独的子目录，避免文件名冲突
+    output_dirs = [args.output_dir]
+    if len(args.rosters) > 1:
+        output_dirs = roster_output_dirs(args.rosters, args.output_dir)
+    
+    failed = 0
+    start = time.perf_counter()
+    for path, output_dir in zip(args.rosters, output_dirs):
+        print(f"{path}:")
+        roster_start = time.perf_counter()
+        try:
+            outputs = process_roster(path, output_dir, modes, args.workers, args.year, args.month)
+        except BatchGenerateError as e:
+            failed += 1
+            print(f"  部分失败：{e}")
+            continue
+        except (OSError, ValueError) as e:
+            failed += 1
+            print(f"  失败：{e}")
+            continue
+        except Exception as e:
+            # 格式损坏的文件可能由openpyxl/xlrd抛出其他异常，记录后继续处理下一个名单
+            failed += 1
+            logger.exception("处理名单 %s 时出错", path)
+            print(f"  失败：{type(e).__name__}: {e}")
+            continue
+        for output in outputs:
+            print(f"  已生成：{output}")
+        print(f"  耗时{time.perf_counter() - roster_start:.2f}秒")
+    
+    print(f"共处理{len(args.rosters)}个名单，失败{failed}个，总耗时{time.perf_counter() - start:.2f}秒")
+    return EXIT_FAILED if failed else EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
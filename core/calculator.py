@@ -3,8 +3,25 @@
 包含缺勤扣款和实发工资的计算函数
 """
 
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP, ROUND_HALF_EVEN
 
-def calculate_absence_deduction(base_salary, required_days, actual_days):
+# NumPy为可选依赖：安装时批量计算使用向量化实现，否则逐行调用单个计算函数。
+# 导入NumPy需要数十毫秒，推迟到第一次计算较多行时再导入，不拖慢程序启动（见_load_numpy）
+np = None
+_numpy_loaded = False
+
+# 行数少于此值时逐行计算已足够快，不使用（也不导入）NumPy
+NUMPY_MIN_ROWS = 64
+
+# 向量化舍入只在此范围内可靠，超出范围或接近0.005进位边界的值改用round()逐个计算
+ROUND_SAFE_LIMIT = 1e7
+ROUND_TIE_TOLERANCE = 1e-6
+
+# 定点（整数分）计算支持的舍入方式：四舍五入、银行家舍入
+ROUNDING_MODES = (ROUND_HALF_UP, ROUND_HALF_EVEN)
+
+
+def calculate_absence_deduction(base_salary, required_days, actual_days, rounding=None):
     """
     计算缺勤扣款
     
@@ -12,6 +29,8 @@ def calculate_absence_deduction(base_salary, required_days, actual_days):
         base_salary (float): 基本工资
         required_days (float): 应出勤天数
         actual_days (float): 实际出勤天数
+        rounding (str, optional): 舍入方式，为None时按浮点数计算并用round()保留两位小数；
+            为ROUND_HALF_UP或ROUND_HALF_EVEN时按整数分精确计算
     
     返回:
         float: 缺勤扣款金额 (负值表示扣款)
@@ -22,11 +41,16 @@ def calculate_absence_deduction(base_salary, required_days, actual_days):
     if actual_days >= required_days:
         return 0.0
     
+    if rounding is not None:
+        return from_cents(absence_deduction_cents(to_cents(base_salary, rounding),
+                                                  required_days, actual_days, rounding))
+    
     deduction = -(base_salary / required_days) * (required_days - actual_days)
     return round(deduction, 2)  # 保留两位小数
 
 
-def calculate_net_salary(base_salary, absence_deduction, night_shift, high_temp, late_fine, others):
+def calculate_net_salary(base_salary, absence_deduction, night_shift, high_temp, late_fine, others,
+                         rounding=None):
     """
     计算实发工资
     
@@ -37,14 +61,273 @@ def calculate_net_salary(base_salary, absence_deduction, night_shift, high_temp,
         high_temp (float): 高温补贴
         late_fine (float): 迟到罚款
         others (float): 其他
+        rounding (str, optional): 舍入方式，为None时按浮点数计算；
+            为ROUND_HALF_UP或ROUND_HALF_EVEN时各项先换算为整数分再精确求和
     
     返回:
         float: 实发工资金额
     """
+    if rounding is not None:
+        return from_cents(sum(to_cents(amount, rounding) for amount in
+                              (base_salary, absence_deduction, night_shift, high_temp, late_fine, others)))
+    
     net_salary = base_salary + absence_deduction + night_shift + high_temp + late_fine + others
     return round(net_salary, 2)  # 保留两位小数
 
 
+def calculate_batch(base_salary, required_days, actual_days, night_shift=None,
+                    high_temp=None, late_fine=None, others=None, use_numpy=None, rounding=None):
+    """
+    批量计算缺勤扣款和实发工资
+    
+    每个参数为一列数据（列表、元组或数组），长度相同。结果与逐行调用
+    calculate_absence_deduction 和 calculate_net_salary 完全一致
+    
+    参数:
+        base_salary (sequence): 基本工资
+        required_days (sequence): 应出勤天数
+        actual_days (sequence): 实际出勤天数
+        night_shift (sequence, optional): 夜班补助，默认为0
+        high_temp (sequence, optional): 高温补贴，默认为0
+        late_fine (sequence, optional): 迟到罚款，默认为0
+        others (sequence, optional): 其他，默认为0
+        use_numpy (bool, optional): 是否使用NumPy，默认在已安装且行数不少于NUMPY_MIN_ROWS时使用
+        rounding (str, optional): 舍入方式，不为None时按整数分精确计算（不使用NumPy）
+    
+    返回:
+        tuple: (缺勤扣款列表, 实发工资列表)
+    """
+    count = len(base_salary)
+    allowances = [column if column is not None else [0] * count
+                  for column in (night_shift, high_temp, late_fine, others)]
+    columns = [base_salary, required_days, actual_days] + allowances
+    if any(len(column) != count for column in columns):
+        raise ValueError("批量计算的各列长度不一致")
+    
+    if rounding is not None:
+        return _calculate_batch_cents(columns, rounding)
+    
+    if use_numpy is None:
+        use_numpy = count >= NUMPY_MIN_ROWS
+    if use_numpy and _load_numpy() is not None:
+        return _calculate_batch_numpy(*columns)
+    
+    # 纯Python实现：逐行调用单个计算函数
+    deductions = []
+    net_salaries = []
+    for base, required, actual, night, temp, fine, other in zip(*columns):
+        deduction = calculate_absence_deduction(base, required, actual)
+        deductions.append(deduction)
+        net_salaries.append(calculate_net_salary(base, deduction, night, temp, fine, other))
+    return deductions, net_salaries
+
+
+def _load_numpy():
+    """
+    第一次调用时导入NumPy
+    
+    返回:
+        module: numpy模块，未安装时返回None
+    """
+    global np, _numpy_loaded
+    if not _numpy_loaded:
+        _numpy_loaded = True
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        np = numpy
+    return np
+
+
+def _calculate_batch_cents(columns, rounding):
+    """按整数分逐行精确计算，金额只换算一次"""
+    deductions = []
+    net_salaries = []
+    for base, required, actual, night, temp, fine, other in zip(*columns):
+        base_cents = to_cents(base, rounding)
+        if required <= 0 or actual >= required:
+            deduction_cents = 0
+        else:
+            deduction_cents = absence_deduction_cents(base_cents, required, actual, rounding)
+        net_cents = (base_cents + deduction_cents + to_cents(night, rounding) + to_cents(temp, rounding)
+                     + to_cents(fine, rounding) + to_cents(other, rounding))
+        deductions.append(deduction_cents / 100)
+        net_salaries.append(net_cents / 100)
+    return deductions, net_salaries
+
+
+def _calculate_batch_numpy(base_salary, required_days, actual_days, night_shift,
+                           high_temp, late_fine, others):
+    """使用NumPy向量化计算，运算顺序与单个计算函数相同"""
+    base = np.asarray(base_salary, dtype=float)
+    required = np.asarray(required_days, dtype=float)
+    actual = np.asarray(actual_days, dtype=float)
+    
+    # 非有限值与单个计算函数一样直接参与运算，不发出警告
+    with np.errstate(all='ignore'):
+        # 应出勤天数为0或全勤时不扣款，只计算其余行
+        charged = ~((required <= 0) | (actual >= required))
+        deduction = np.zeros(len(base))
+        deduction[charged] = _round2(-(base[charged] / required[charged]) *
+                                     (required[charged] - actual[charged]))
+        
+        net = base + deduction
+        for column in (night_shift, high_temp, late_fine, others):
+            net = net + np.asarray(column, dtype=float)
+        net = _round2(net)
+    
+    return deduction.tolist(), net.tolist()
+
+
+def _round2(values):
+    """
+    向量化保留两位小数，结果与round(value, 2)一致
+    
+    先用rint(value * 100) / 100计算，乘法误差可能影响进位的值
+    （接近0.005边界、数值过大或非有限值）再逐个用round()修正
+    """
+    scaled = values * 100
+    result = np.rint(scaled) / 100
+    
+    uncertain = ~(np.abs(values) < ROUND_SAFE_LIMIT)
+    uncertain |= np.abs(scaled - np.floor(scaled) - 0.5) <= ROUND_TIE_TOLERANCE
+    for index in np.flatnonzero(uncertain):
+        result[index] = round(float(values[index]), 2)
+    return result
+
+
+def to_cents(amount, rounding=ROUND_HALF_UP):
+    """
+    将金额换算为整数分
+    
+    金额按输入时的十进制数值换算（如1.005按1.005而不是其二进制近似值处理），
+    超过两位小数的部分按指定方式舍入
+    
+    参数:
+        amount (int/float/Decimal/str): 金额
+        rounding (str, optional): 舍入方式，ROUND_HALF_UP或ROUND_HALF_EVEN
+    
+    返回:
+        int: 金额对应的分数
+    """
+    _check_rounding(rounding)
+    if type(amount) is int:
+        return amount * 100
+    
+    if type(amount) is float:
+        # 最多两位小数的金额乘以100后非常接近整数，直接取整即可
+        if abs(amount) < ROUND_SAFE_LIMIT:
+            scaled = amount * 100
+            cents = round(scaled)
+            if abs(scaled - cents) < ROUND_TIE_TOLERANCE:
+                return cents
+        amount = repr(amount)
+    
+    value = _finite_decimal(amount, "金额")
+    return int(value.scaleb(2).quantize(Decimal(1), rounding=rounding))
+
+
+def from_cents(cents):
+    """
+    将整数分换算为金额
+    
+    参数:
+        cents (int): 分数
+    
+    返回:
+        float: 金额，最接近该两位小数的浮点数
+    """
+    return cents / 100
+
+
+def absence_deduction_cents(base_cents, required_days, actual_days, rounding=ROUND_HALF_UP):
+    """
+    按整数分精确计算缺勤扣款
+    
+    出勤天数按十进制数值换算为分数，扣款 = -基本工资 * (应出勤 - 实际出勤) / 应出勤，
+    整个算式只在最后舍入一次
+    
+    参数:
+        base_cents (int): 基本工资（分）
+        required_days (float): 应出勤天数
+        actual_days (float): 实际出勤天数
+        rounding (str, optional): 舍入方式，ROUND_HALF_UP或ROUND_HALF_EVEN
+    
+    返回:
+        int: 缺勤扣款（分，负值表示扣款）
+    """
+    _check_rounding(rounding)
+    if required_days <= 0 or actual_days >= required_days:
+        return 0
+    
+    required_numerator, required_denominator = _days_ratio(required_days)
+    actual_numerator, actual_denominator = _days_ratio(actual_days)
+    
+    # (应出勤 - 实际出勤) / 应出勤 化为整数分子分母
+    numerator = required_numerator * actual_denominator - actual_numerator * required_denominator
+    denominator = actual_denominator * required_numerator
+    return -_divide_rounded(base_cents * numerator, denominator, rounding)
+
+
+def sum_cents(amounts, rounding=ROUND_HALF_UP):
+    """
+    按整数分精确求和
+    
+    参数:
+        amounts (iterable): 金额序列
+        rounding (str, optional): 超过两位小数的金额的舍入方式
+    
+    返回:
+        float: 合计金额
+    """
+    return from_cents(sum(to_cents(amount, rounding) for amount in amounts))
+
+
+def _days_ratio(days):
+    """将天数按十进制数值换算为 (分子, 分母)"""
+    if type(days) is int:
+        return days, 1
+    
+    if type(days) is float:
+        # 最多两位小数的天数（如21.75）直接换算为百分之一天
+        if abs(days) < ROUND_SAFE_LIMIT:
+            scaled = days * 100
+            hundredths = round(scaled)
+            if abs(scaled - hundredths) < ROUND_TIE_TOLERANCE:
+                return hundredths, 100
+        days = repr(days)
+    
+    return _finite_decimal(days, "天数").as_integer_ratio()
+
+
+def _finite_decimal(value, label):
+    """转换为有限的Decimal，无法转换时抛出ValueError"""
+    try:
+        result = Decimal(value)
+    except InvalidOperation:
+        raise ValueError(f"{label}不是有效数值：{value}")
+    if not result.is_finite():
+        raise ValueError(f"{label}必须是有限数值：{value}")
+    return result
+
+
+def _divide_rounded(numerator, denominator, rounding):
+    """整数除法并按指定方式舍入到整数（分母为正数）"""
+    quotient, remainder = divmod(abs(numerator), denominator)
+    twice_remainder = remainder * 2
+    if twice_remainder > denominator or (
+            twice_remainder == denominator and (rounding == ROUND_HALF_UP or quotient % 2)):
+        quotient += 1
+    return -quotient if numerator < 0 else quotient
+
+
+def _check_rounding(rounding):
+    """检查舍入方式是否支持"""
+    if rounding not in ROUNDING_MODES:
+        raise ValueError(f"不支持的舍入方式：{rounding}")
+
+
 def validate_input(text, default=0.0):
     """
     验证并转换用户输入
@@ -3,59 +3,114 @@
 """
 
 import sys
+import time
+
+# 尽早记录开始时间和已加载的模块，使后续模块的导入计入启动报告
+STARTUP_START = time.perf_counter()
+STARTUP_MODULES = set(sys.modules)
+
 import os
+import sqlite3
+import logging
+import multiprocessing
 from PyQt5.QtWidgets import QApplication, QSplashScreen
 from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QPixmap
-import time
+from PyQt5.QtGui import QPixmap, QPainter, QColor, QFont
 
 # 添加当前目录到系统路径
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-# 初始化数据管理器
-from utils.data_manager import DataManager
-data_manager = DataManager.get_instance()
+# 配置日志输出（默认只输出警告，可通过环境变量PAYSLIP_LOG_LEVEL调整）
+from utils.diagnostics import configure_logging
+configure_logging()
+
+from utils.startup import StartupTimer
+
+logger = logging.getLogger(__name__)
 
 # 导入资源路径辅助函数
 from utils.resource_helper import resource_path
 
+# 没有启动图像时绘制的启动画面大小
+SPLASH_SIZE = (420, 240)
+
 def show_splash_screen(app):
-    """显示启动屏幕"""
-    # 检查是否有启动图像
+    """
+    显示启动画面，没有启动图像时绘制一个只有程序名称的画面
+    
+    返回:
+        QSplashScreen: 启动画面
+    """
     splash_path = resource_path(os.path.join("assets", "splash.png"))
     if os.path.exists(splash_path):
         splash_pix = QPixmap(splash_path)
-        splash = QSplashScreen(splash_pix, Qt.WindowStaysOnTopHint)
-        splash.setWindowFlags(Qt.WindowStaysOnTopHint | Qt.FramelessWindowHint)
-        splash.show()
-        app.processEvents()
-        
-        # 显示加载消息
-        splash.showMessage("正在加载应用...", Qt.AlignBottom | Qt.AlignCenter, Qt.white)
-        time.sleep(1)
-        
-        return splash
-    
-    return None
-
-def main():
-    """应用主入口点"""
+    else:
+        splash_pix = QPixmap(*SPLASH_SIZE)
+        splash_pix.fill(QColor("#2b5797"))
+        painter = QPainter(splash_pix)
+        painter.setPen(Qt.white)
+        painter.setFont(QFont("", 20, QFont.Bold))
+        painter.drawText(splash_pix.rect(), Qt.AlignCenter, app.applicationName())
+        painter.end()
+    
+    splash = QSplashScreen(splash_pix, Qt.WindowStaysOnTopHint)
+    splash.setWindowFlags(Qt.WindowStaysOnTopHint | Qt.FramelessWindowHint)
+    splash.show()
+    app.processEvents()
+    return splash
+
+def show_progress(app, splash, message):
+    """在启动画面上显示当前的初始化步骤"""
+    splash.showMessage(f"{message}...", Qt.AlignBottom | Qt.AlignCenter, Qt.white)
+    app.processEvents()
+
+def main(quit_after_start=False):
+    """
+    应用主入口点
+    
+    参数:
+        quit_after_start (bool, optional): 显示主窗口后立即退出，用于测量启动耗时
+    """
+    timer = StartupTimer(STARTUP_START, modules=STARTUP_MODULES)
     app = QApplication(sys.argv)
     app.setApplicationName("工资条生成器")
     
-    # 显示启动画面
+    # 显示启动画面，之后每个初始化步骤都显示在启动画面上
+    timer.step("显示启动画面")
     splash = show_splash_screen(app)
+    timer.on_step = lambda message: show_progress(app, splash, message)
+    
+    # 打开数据库并加载上次保存的数据，失败时只在内存中保存
+    timer.step("正在打开数据库")
+    from utils.data_manager import DataManager
+    data_manager = DataManager.get_instance()
+    count = 0
+    try:
+        count = data_manager.open_storage()
+        logger.info("已从数据库加载 %d 条员工数据", count)
+    except (sqlite3.Error, OSError) as e:
+        logger.warning("无法打开数据库，本次修改不会保存到磁盘：%s", e)
+    app.aboutToQuit.connect(data_manager.close_storage)
     
-    # 只使用批量模式
+    # 只使用批量模式（导入和生成Excel的模块在第一次使用时才加载）
+    timer.step("正在加载界面")
     from ui.batch_payslip_ui import BatchPayslipWindow
+    timer.step(f"正在显示{count}名员工的数据" if count else "正在创建主窗口")
     window = BatchPayslipWindow()
     
-    # 关闭启动画面并显示主窗口
-    if splash:
-        splash.finish(window)
+    # 关闭启动画面并显示主窗口，主窗口绘制完成后结束启动计时
+    timer.step("显示主窗口")
     window.show()
+    app.processEvents()
+    splash.finish(window)
+    timer.finish()
     
+    if quit_after_start:
+        data_manager.close_storage()
+        return
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # 打包后的程序使用多进程生成工资条时需要
+    multiprocessing.freeze_support()
+    main()
@@ -0,0 +1,158 @@
+"""
+工资计算测试：整数分计算与Decimal参考结果比较，NumPy批量计算与逐行计算比较
+运行方式: python -m unittest discover -s tests
+"""
+
+import os
+import sys
+import random
+import unittest
+from decimal import Decimal, ROUND_HALF_UP, ROUND_HALF_EVEN, localcontext
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core import calculator
+from core.calculator import (to_cents, from_cents, absence_deduction_cents, sum_cents,
+                             calculate_batch, NUMPY_MIN_ROWS)
+
+
+CENT = Decimal('0.01')
+
+# 正好落在半分上的金额（包括二进制近似值略小于半分的2.675和1.005）和负数
+TIE_AMOUNTS = [0.125, 0.135, 2.675, 1.005, 0.005, 0.015, -0.125, -2.675, -1.005, 12345.565, 99999.995]
+
+AMOUNTS = TIE_AMOUNTS + [0, 1, -1, 0.1, 0.29, 4897.59, 1e-7, 30000, -50.0, 123.4567, "0.125", Decimal("-0.135")]
+
+
+def decimal_cents(amount, rounding):
+    """Decimal参考实现：按输入的十进制数值舍入到分"""
+    value = Decimal(repr(amount)) if isinstance(amount, float) else Decimal(amount)
+    return int(value.quantize(CENT, rounding=rounding).scaleb(2))
+
+
+def decimal_deduction_cents(base_cents, required_days, actual_days, rounding):
+    """Decimal参考实现：缺勤扣款整个算式只在最后舍入一次"""
+    required, actual = Decimal(repr(required_days)), Decimal(repr(actual_days))
+    if required <= 0 or actual >= required:
+        return 0
+    with localcontext() as context:
+        context.prec = 60
+        deduction = -(Decimal(base_cents) / 100 * (required - actual)) / required
+        return int(deduction.quantize(CENT, rounding=rounding).scaleb(2))
+
+
+class CentsTest(unittest.TestCase):
+    
+    def test_to_cents_matches_decimal(self):
+        """两种舍入方式下换算结果都与Decimal一致"""
+        for rounding in (ROUND_HALF_UP, ROUND_HALF_EVEN):
+            for amount in AMOUNTS:
+                with self.subTest(rounding=rounding, amount=amount):
+                    self.assertEqual(to_cents(amount, rounding), decimal_cents(amount, rounding))
+    
+    def test_to_cents_ties(self):
+        """半分按舍入方式进位"""
+        self.assertEqual(to_cents(0.125, ROUND_HALF_UP), 13)
+        self.assertEqual(to_cents(0.125, ROUND_HALF_EVEN), 12)
+        self.assertEqual(to_cents(0.135, ROUND_HALF_EVEN), 14)
+        self.assertEqual(to_cents(2.675, ROUND_HALF_UP), 268)
+        self.assertEqual(to_cents(1.005, ROUND_HALF_UP), 101)
+        self.assertEqual(to_cents(1.005, ROUND_HALF_EVEN), 100)
+        self.assertEqual(to_cents(-0.125, ROUND_HALF_UP), -13)
+        self.assertEqual(to_cents(-0.125, ROUND_HALF_EVEN), -12)
+    
+    def test_to_cents_rejects_invalid(self):
+        """非有限值、无法转换的值和不支持的舍入方式抛出ValueError"""
+        for amount in (float('nan'), float('inf'), "abc"):
+            with self.subTest(amount=amount):
+                with self.assertRaises(ValueError):
+                    to_cents(amount)
+        with self.assertRaises(ValueError):
+            to_cents(1.0, 'ROUND_DOWN')
+    
+    def test_from_cents(self):
+        """整数分换算为最接近的两位小数"""
+        self.assertEqual(from_cents(0), 0.0)
+        self.assertEqual(from_cents(13), 0.13)
+        self.assertEqual(from_cents(-268), -2.68)
+        self.assertEqual(from_cents(489759), 4897.59)
+        for cents in range(-1000, 1000):
+            self.assertEqual(to_cents(from_cents(cents)), cents)
+    
+    def test_absence_deduction_cents_matches_decimal(self):
+        """缺勤扣款与Decimal参考结果一致（包括正好落在半分上的扣款）"""
+        rng = random.Random(0)
+        days = [0, 8, 16, 20, 20.5, 21.75, 22, 30, 31]
+        cases = [(500000, 22, 20.5), (100, 8, 7), (1, 2, 1), (3, 4, 3), (-1001, 2, 1), (500000, 0, 0)]
+        cases += [(rng.randint(-3000000, 3000000), rng.choice(days), rng.choice(days + [rng.randint(0, 3100) / 100]))
+                  for _ in range(500)]
+        for rounding in (ROUND_HALF_UP, ROUND_HALF_EVEN):
+            for base_cents, required, actual in cases:
+                with self.subTest(rounding=rounding, case=(base_cents, required, actual)):
+                    self.assertEqual(absence_deduction_cents(base_cents, required, actual, rounding),
+                                     decimal_deduction_cents(base_cents, required, actual, rounding))
+    
+    def test_absence_deduction_cents_ties(self):
+        """扣款正好是半分时按舍入方式进位"""
+        # 1分 * 1/2 = 0.5分
+        self.assertEqual(absence_deduction_cents(1, 2, 1, ROUND_HALF_UP), -1)
+        self.assertEqual(absence_deduction_cents(1, 2, 1, ROUND_HALF_EVEN), 0)
+        # 3分 * 1/2 = 1.5分
+        self.assertEqual(absence_deduction_cents(3, 2, 1, ROUND_HALF_EVEN), -2)
+        self.assertEqual(absence_deduction_cents(500000, 22, 22), 0)
+        self.assertEqual(absence_deduction_cents(500000, 0, 0), 0)
+    
+    def test_sum_cents(self):
+        """各项先舍入到分再求和，没有浮点累积误差"""
+        self.assertEqual(sum_cents([0.1] * 10), 1.0)
+        self.assertEqual(sum_cents([0.125, 0.125, 0.125], ROUND_HALF_UP), 0.39)
+        self.assertEqual(sum_cents([0.125, 0.125, 0.125], ROUND_HALF_EVEN), 0.36)
+        self.assertEqual(sum_cents([]), 0.0)
+        for rounding in (ROUND_HALF_UP, ROUND_HALF_EVEN):
+            with self.subTest(rounding=rounding):
+                expected = sum(decimal_cents(amount, rounding) for amount in AMOUNTS)
+                self.assertEqual(sum_cents(AMOUNTS, rounding), expected / 100)
+
+
+class CalculateBatchTest(unittest.TestCase):
+    
+    def setUp(self):
+        rng = random.Random(1)
+        count = NUMPY_MIN_ROWS * 4
+        
+        def amount():
+            return rng.choice([rng.randint(0, 3000000) / 100, rng.randint(-30000000, 30000000) / 1000,
+                               rng.choice(TIE_AMOUNTS), 0])
+        
+        def days():
+            return rng.choice([0, 8, 20.5, 21.75, 22, 30, 31, rng.randint(0, 3100) / 100])
+        
+        self.columns = [[amount() for _ in range(count)], [days() for _ in range(count)],
+                        [days() for _ in range(count)]] + [[amount() for _ in range(count)] for _ in range(4)]
+    
+    @unittest.skipIf(calculator._load_numpy() is None, "未安装NumPy")
+    def test_numpy_matches_python(self):
+        """行数达到NUMPY_MIN_ROWS时使用NumPy，结果与逐行计算完全一致"""
+        self.assertGreaterEqual(len(self.columns[0]), NUMPY_MIN_ROWS)
+        expected = calculate_batch(*self.columns, use_numpy=False)
+        self.assertEqual(calculate_batch(*self.columns), expected)
+        self.assertEqual(calculate_batch(*self.columns, use_numpy=True), expected)
+    
+    def test_cents_matches_single_functions(self):
+        """按整数分批量计算与单个计算函数的结果一致"""
+        for rounding in (ROUND_HALF_UP, ROUND_HALF_EVEN):
+            with self.subTest(rounding=rounding):
+                deductions, net_salaries = calculate_batch(*self.columns, rounding=rounding)
+                for row, deduction, net in zip(zip(*self.columns), deductions, net_salaries):
+                    base, required, actual = row[:3]
+                    self.assertEqual(deduction, calculator.calculate_absence_deduction(
+                        base, required, actual, rounding))
+                    self.assertEqual(net, calculator.calculate_net_salary(base, deduction, *row[3:], rounding))
+    
+    def test_length_mismatch(self):
+        """各列长度不一致时抛出ValueError"""
+        with self.assertRaises(ValueError):
+            calculate_batch([1.0, 2.0], [22, 22], [22])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+数据导入测试
+运行方式: python -m unittest discover -s tests
+"""
+
+import os
+import sys
+import unittest
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.data_import import parse_employee_rows, ImportSummary
+
+
+HEADER = ("姓名", "月份", "基本工资", "应出勤天数", "实际出勤天数", "其他")
+
+
+class ParseEmployeeRowsTest(unittest.TestCase):
+    
+    def parse(self, *rows):
+        """解析表头和数据行，返回员工数据和统计摘要"""
+        summary = ImportSummary()
+        lines = []
+        for row in rows:
+            lines += [HEADER, row]
+        return list(parse_employee_rows(lines, summary=summary)), summary
+    
+    def test_valid_rows(self):
+        """有效的数据按数值导入，没有警告"""
+        employees, summary = self.parse(("张三", "5", "5,000", 22, 20.5, None), ("李四", 12.0, 4800, 22, 22, "-0.5"))
+        self.assertEqual([e['month'] for e in employees], [5, 12])
+        self.assertEqual(employees[0]['base_salary'], 5000.0)
+        self.assertEqual(employees[0]['others'], 0)
+        self.assertEqual(employees[1]['others'], -0.5)
+        self.assertEqual(summary.warnings, [])
+    
+    def test_invalid_month_warns(self):
+        """月份不是1到12的整数时设为当前月份，并记录所在行号"""
+        with self.assertLogs('utils.data_import', 'WARNING'):
+            employees, summary = self.parse(("张三", 13, 5000, 22, 22), ("李四", "0", 5000, 22, 22),
+                                            ("王五", 5.5, 5000, 22, 22), ("赵六", 10 ** 400, 5000, 22, 22),
+                                            ("孙七", "一月", 5000, 22, 22))
+        current_month = datetime.now().month
+        self.assertEqual([e['month'] for e in employees], [current_month] * 5)
+        self.assertEqual([(row, field, value) for row, field, value, _ in summary.warnings],
+                         [(2, 'month', 13), (4, 'month', "0"), (6, 'month', 5.5), (8, 'month', 10 ** 400),
+                          (10, 'month', "一月")])
+    
+    def test_out_of_range_number_warns(self):
+        """超出浮点数范围或非有限的数值设为0，并记录所在行号"""
+        with self.assertLogs('utils.data_import', 'WARNING'):
+            employees, summary = self.parse(("张三", 5, 10 ** 400, 22, 22, "1e999"), ("李四", 5, 5000, "nan", 22))
+        self.assertEqual(employees[0]['base_salary'], 0)
+        self.assertEqual(employees[0]['others'], 0)
+        self.assertEqual(employees[1]['required_days'], 0)
+        self.assertEqual([(row, field) for row, field, _, _ in summary.warnings],
+                         [(2, 'base_salary'), (2, 'others'), (4, 'required_days')])
+        self.assertIn("第2行 base_salary", summary.format_report())
+
+
+if __name__ == "__main__":
+    unittest.main()
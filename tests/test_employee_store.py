@@ -0,0 +1,127 @@
+"""
+员工数据列存储测试
+运行方式: python -m unittest discover -s tests
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.employee_store import EmployeeStore, MergeSummary, INT_MIN, INT_MAX, _to_int
+
+
+def employee(name, month=5, base_salary=5000.0):
+    """生成一名员工的数据"""
+    return {'name': name, 'year': 2024, 'month': month, 'base_salary': base_salary}
+
+
+class EmployeeStoreTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.store = EmployeeStore([employee("张三"), employee("李四"), employee("王五")])
+    
+    def test_upsert_updates_existing(self):
+        """同一员工同一月份的数据被更新，不添加新行"""
+        self.assertEqual(self.store.upsert(employee("李四", base_salary=6000.0)), (1, False))
+        self.assertEqual(len(self.store), 3)
+        self.assertEqual(self.store[1]['base_salary'], 6000.0)
+    
+    def test_upsert_inserts_new(self):
+        """新员工或其他月份的数据添加到末尾"""
+        self.assertEqual(self.store.upsert(employee("赵六")), (3, True))
+        self.assertEqual(self.store.upsert(employee("张三", month=6)), (4, True))
+        self.assertEqual(len(self.store), 5)
+        self.assertEqual(self.store.find("张三", 2024, 6), 4)
+        self.assertEqual(self.store.find("张三", 2024, 5), 0)
+    
+    def test_upsert_after_rename(self):
+        """set_row改名后索引同步更新，旧姓名不再匹配"""
+        self.assertEqual(self.store.find("李四", 2024, 5), 1)
+        self.store.set_row(1, employee("赵六"))
+        self.assertEqual(self.store.find("李四", 2024, 5), -1)
+        self.assertEqual(self.store.find("赵六", 2024, 5), 1)
+        
+        self.assertEqual(self.store.upsert(employee("赵六", base_salary=7000.0)), (1, False))
+        self.assertEqual(self.store.upsert(employee("李四")), (3, True))
+        self.assertEqual([e['name'] for e in self.store], ["张三", "赵六", "王五", "李四"])
+    
+    def test_rename_to_duplicate(self):
+        """改名与其他行重复时记录为重复行，再改回后不再重复"""
+        self.store.set_row(2, employee("张三"))
+        self.assertEqual(self.store.duplicates(), {("张三", 2024, 5): [0, 2]})
+        self.store.set_row(0, employee("孙七"))
+        self.assertEqual(self.store.find("张三", 2024, 5), 2)
+        self.assertEqual(self.store.duplicates(), {})
+    
+    def test_merge_counts_duplicates(self):
+        """合并时统计新增、更新和导入数据内部的重复"""
+        summary = self.store.merge([employee("李四", base_salary=6000.0), employee("赵六"),
+                                    employee("赵六", base_salary=5500.0), employee("赵六", base_salary=5800.0),
+                                    employee("李四", base_salary=6100.0)])
+        self.assertEqual(summary.inserted, 1)
+        self.assertEqual(summary.updated, 1)
+        self.assertEqual(summary.duplicates, {("赵六", 2024, 5): 3, ("李四", 2024, 5): 2})
+        
+        # 重复的数据使用最后一条
+        self.assertEqual(len(self.store), 4)
+        self.assertEqual(self.store[1]['base_salary'], 6100.0)
+        self.assertEqual(self.store[3]['base_salary'], 5800.0)
+        self.assertIn("赵六（2024年5月）在导入数据中出现3次", summary.format_report())
+    
+    def test_merge_accumulates_summary(self):
+        """分批合并时传入同一个统计对象，跨批次的重复也被统计"""
+        summary = MergeSummary()
+        self.store.merge([employee("赵六")], summary=summary)
+        self.store.merge([employee("赵六"), employee("张三")], summary=summary)
+        self.assertEqual((summary.inserted, summary.updated), (1, 1))
+        self.assertEqual(summary.duplicates, {("赵六", 2024, 5): 2})
+    
+    def test_snapshot_isolated(self):
+        """快照不受原存储之后修改的影响，原存储也不受快照修改的影响"""
+        self.store.find("张三", 2024, 5)
+        snapshot = self.store.snapshot()
+        
+        self.store.set_row(0, employee("赵六", base_salary=1.0))
+        self.store.append(employee("孙七"))
+        self.assertEqual([e['name'] for e in snapshot], ["张三", "李四", "王五"])
+        self.assertEqual(snapshot[0]['base_salary'], 5000.0)
+        self.assertEqual(snapshot.find("张三", 2024, 5), 0)
+        self.assertEqual(snapshot.find("赵六", 2024, 5), -1)
+        
+        snapshot.upsert(employee("李四", base_salary=2.0))
+        self.assertEqual(self.store[1]['base_salary'], 5000.0)
+        self.assertEqual(len(self.store), 4)
+    
+    def test_column_view_isolated(self):
+        """导出的列视图在存储修改后保持不变"""
+        view = self.store.column('base_salary')
+        self.store.set_row(0, employee("张三", base_salary=1.0))
+        self.assertEqual(view[0], 5000.0)
+        self.assertEqual(self.store[0]['base_salary'], 1.0)
+    
+    def test_to_int_range(self):
+        """超出array('l')范围或无法识别的整数使用默认值"""
+        self.assertEqual(_to_int(INT_MAX, 1), INT_MAX)
+        self.assertEqual(_to_int(INT_MIN, 1), INT_MIN)
+        self.assertEqual(_to_int(INT_MAX + 1, 1), 1)
+        self.assertEqual(_to_int(INT_MIN - 1, 1), 1)
+        self.assertEqual(_to_int(10 ** 400, 1), 1)
+        self.assertEqual(_to_int(1e30, 1), 1)
+        self.assertEqual(_to_int("1e30", 1), 1)
+        for value in (float('inf'), float('nan'), 5.5, "abc", None):
+            with self.subTest(value=value):
+                self.assertEqual(_to_int(value, 1), 1)
+        self.assertEqual(_to_int("2024", 1), 2024)
+        self.assertEqual(_to_int(6.0, 1), 6)
+    
+    def test_out_of_range_values_stored(self):
+        """超出范围的年份和金额不会导致添加失败"""
+        store = EmployeeStore([{'name': "张三", 'year': 10 ** 30, 'month': 5, 'base_salary': 10 ** 400}],
+                              year=2024)
+        self.assertEqual(store[0]['year'], 2024)
+        self.assertEqual(store[0]['base_salary'], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
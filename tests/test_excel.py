@@ -0,0 +1,117 @@
+"""
+个人工资条模板测试：模板拼接的文件与openpyxl直接生成的文件逐个单元格比较
+运行方式: python -m unittest discover -s tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from io import BytesIO
+from copy import copy
+
+from openpyxl import load_workbook
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.excel import PayslipTemplate, BatchGenerateError, generate_excel, generate_payslip_archive
+
+
+EMPLOYEES = [
+    {'name': "张三", 'year': 2024, 'month': 5, 'base_salary': 5000.0, 'required_days': 22.0,
+     'actual_days': 20.5, 'night_shift': 200.0, 'high_temp': 0.0, 'late_fine': -50.0, 'others': 88.5,
+     'absence_deduction': 340.91, 'net_salary': 4897.59, 'signature': ''},
+    # 整数、负数、很小的小数、前后有空格和需要转义的文字
+    {'name': " <李&四> ", 'year': 2023, 'month': 12, 'base_salary': 12345, 'required_days': 30,
+     'actual_days': 30, 'night_shift': 0, 'high_temp': 300, 'late_fine': 0, 'others': -0.01,
+     'absence_deduction': 0.0, 'net_salary': 1e-7, 'signature': "已签"},
+    # 缺少的字段按默认值处理
+    {'name': "王五", 'year': 2024, 'month': 1},
+]
+
+# 比较的单元格样式属性
+STYLE_ATTRIBUTES = ('font', 'fill', 'border', 'alignment', 'number_format', 'protection')
+
+
+def cell_style(cell, attribute):
+    """取出单元格的样式（openpyxl返回的样式代理之间不能直接比较，取其副本）"""
+    value = getattr(cell, attribute)
+    return value if isinstance(value, str) else copy(value)
+
+
+class PayslipTemplateTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.template = PayslipTemplate()
+        self.directory = tempfile.TemporaryDirectory()
+    
+    def tearDown(self):
+        self.directory.cleanup()
+    
+    def assert_same_workbook(self, expected, actual):
+        """逐个单元格比较值和样式，并比较列宽、行高和合并单元格"""
+        expected_ws, actual_ws = expected.active, actual.active
+        self.assertEqual(actual_ws.title, expected_ws.title)
+        self.assertEqual(actual_ws.max_row, expected_ws.max_row)
+        self.assertEqual(actual_ws.max_column, expected_ws.max_column)
+        for expected_row, actual_row in zip(expected_ws.iter_rows(), actual_ws.iter_rows()):
+            for expected_cell, actual_cell in zip(expected_row, actual_row):
+                coordinate = expected_cell.coordinate
+                self.assertEqual(actual_cell.value, expected_cell.value, coordinate)
+                self.assertEqual(actual_cell.data_type, expected_cell.data_type, coordinate)
+                for attribute in STYLE_ATTRIBUTES:
+                    self.assertEqual(cell_style(actual_cell, attribute), cell_style(expected_cell, attribute),
+                                     f"{coordinate} {attribute}")
+        for key, dimension in expected_ws.column_dimensions.items():
+            self.assertEqual(actual_ws.column_dimensions[key].width, dimension.width, key)
+        for key, dimension in expected_ws.row_dimensions.items():
+            self.assertEqual(actual_ws.row_dimensions[key].height, dimension.height, key)
+        self.assertEqual(actual_ws.merged_cells.ranges, expected_ws.merged_cells.ranges)
+    
+    def test_render_matches_generate_excel(self):
+        """模板生成的工资条与generate_excel生成的内容相同"""
+        for i, employee in enumerate(EMPLOYEES):
+            with self.subTest(name=employee['name']):
+                content = self.template.render(employee)
+                self.assertIsNotNone(content)
+                path = generate_excel(employee, os.path.join(self.directory.name, f"{i}.xlsx"))
+                with open(path, 'rb') as f:
+                    expected = load_workbook(BytesIO(f.read()))
+                self.assert_same_workbook(expected, load_workbook(BytesIO(content)))
+    
+    def test_unsupported_values_fall_back(self):
+        """模板无法直接写入的值交给openpyxl处理"""
+        employee = {**EMPLOYEES[0], 'signature': "换行\x01字符"}
+        self.assertIsNone(self.template.render(employee))
+        employee = {**EMPLOYEES[0], 'others': float('nan')}
+        self.assertIsNone(self.template.render(employee))
+        
+        path = os.path.join(self.directory.name, "fallback.xlsx")
+        employee = {**EMPLOYEES[0], 'base_salary': float('nan')}
+        self.assertEqual(self.template.save(employee, path), path)
+        self.assertTrue(os.path.exists(path))
+    
+    def test_workbook_falls_back(self):
+        """合并为一个工作簿时，模板无法直接写入的值改用openpyxl生成该工作表"""
+        employees = [EMPLOYEES[0], {**EMPLOYEES[1], 'others': float('nan')}, {**EMPLOYEES[2], 'base_salary': True}]
+        path = generate_payslip_archive(employees, os.path.join(self.directory.name, "all.xlsx"), as_workbook=True)
+        with open(path, 'rb') as f:
+            workbook = load_workbook(BytesIO(f.read()))
+        self.assertEqual(workbook.sheetnames, ["索引", "1_张三", "2_ <李&四> ", "3_王五"])
+        self.assertEqual(workbook["2_ <李&四> "]["A2"].value, " <李&四> ")
+        self.assertIsNone(workbook["2_ <李&四> "]["J2"].value)
+        self.assertIs(workbook["3_王五"]["D2"].value, True)
+        self.assertEqual(workbook["索引"].max_row, 4)
+    
+    def test_workbook_reports_unwritable(self):
+        """openpyxl也无法写入的值记为失败，其余员工仍写入工作簿"""
+        employees = [EMPLOYEES[0], {**EMPLOYEES[1], 'signature': "换行\x01字符"}]
+        path = os.path.join(self.directory.name, "all.xlsx")
+        with self.assertRaises(BatchGenerateError) as context:
+            generate_payslip_archive(employees, path, as_workbook=True)
+        self.assertEqual([index for index, _, _ in context.exception.failures], [1])
+        with open(path, 'rb') as f:
+            self.assertEqual(load_workbook(BytesIO(f.read())).sheetnames, ["索引", "1_张三"])
+
+
+if __name__ == "__main__":
+    unittest.main()
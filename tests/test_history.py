@@ -0,0 +1,75 @@
+"""
+工资历史测试
+运行方式: python -m unittest discover -s tests
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.employee_store import EmployeeStore
+from utils.storage import PayslipStorage
+
+
+def employee(name, net_salary, month=5):
+    """生成一名员工的数据"""
+    return {
+        'name': name, 'year': 2024, 'month': month,
+        'base_salary': 5000.0, 'required_days': 22.0, 'actual_days': 22.0,
+        'night_shift': 0.0, 'high_temp': 0.0, 'late_fine': 0.0, 'others': 0.125,
+        'absence_deduction': 0.0, 'net_salary': net_salary, 'signature': '',
+    }
+
+
+class PayrollHistoryTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.storage = PayslipStorage(':memory:')
+        self.employees = [employee("张三", 5000.0), employee("李四", 4800.5), employee("王五", 4700.25)]
+        self.storage.save_roster(EmployeeStore(self.employees))
+        self.storage.archive(self.employees)
+    
+    def tearDown(self):
+        self.storage.close()
+    
+    def test_autosave_does_not_change_history(self):
+        """改名和删除行后自动保存名单，工资历史和汇总不变"""
+        rollups = self.storage.history.periods()
+        
+        # 逐字输入新姓名时每次编辑都会保存
+        for name in ("赵", "赵六"):
+            self.storage.save_roster_rows([(0, {**self.employees[0], 'name': name})])
+        self.storage.save_roster(EmployeeStore([{**self.employees[0], 'name': "赵六"}, self.employees[1]]))
+        
+        self.assertEqual(self.storage.history.periods(), rollups)
+        self.assertEqual([e['name'] for e in self.storage.history.period(2024, 5)], ["张三", "李四", "王五"])
+    
+    def test_archive_replaces_period(self):
+        """重新归档一个月时，改名或删除的员工不再留在该月的历史中"""
+        self.storage.archive([{**self.employees[0], 'name': "赵六"}, self.employees[1]])
+        
+        rollup = self.storage.history.rollup(2024, 5)
+        self.assertEqual(rollup['employee_count'], 2)
+        self.assertEqual(rollup['net_salary'], 9800.5)
+        self.assertEqual(sorted(e['name'] for e in self.storage.history.period(2024, 5)), ["李四", "赵六"])
+        self.assertEqual(self.storage.history.employee_history("张三"), [])
+    
+    def test_archive_keeps_other_periods(self):
+        """归档一个月不影响其他月份"""
+        self.storage.archive([employee("张三", 5100.0, month=6)])
+        
+        self.assertEqual(self.storage.history.rollup(2024, 5)['employee_count'], 3)
+        self.assertEqual(self.storage.history.rollup(2024, 6)['employee_count'], 1)
+        self.assertEqual(self.storage.history.year_to_date(2024, 6)['net_salary'], 19600.75)
+    
+    def test_rollups_match_rebuild(self):
+        """归档时计算的汇总与重新计算的结果相同（包括需要舍入到分的金额）"""
+        rollups = self.storage.history.periods()
+        self.assertEqual(rollups[0]['others'], 0.39)
+        self.storage.history.rebuild_rollups()
+        self.assertEqual(self.storage.history.periods(), rollups)
+
+
+if __name__ == "__main__":
+    unittest.main()
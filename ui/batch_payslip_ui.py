@@ -4,29 +4,63 @@
 
 import sys
 import os
+import logging
 import calendar
+from array import array
 from datetime import datetime
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                            QHBoxLayout, QFormLayout, QLabel, QLineEdit, 
                            QPushButton, QMessageBox, QDesktopWidget,
-                           QTableWidget, QTableWidgetItem, QHeaderView,
-                           QFileDialog, QSpinBox, QInputDialog)
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QColor, QBrush
+                           QTableView, QAbstractItemView, QHeaderView,
+                           QFileDialog, QSpinBox, QInputDialog, QProgressDialog, QAction)
+from PyQt5.QtCore import Qt, QTimer, QThreadPool, QCoreApplication, QEvent
+from PyQt5.QtGui import QKeySequence
 
 # 导入自定义模块
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from core.calculator import calculate_absence_deduction, calculate_net_salary, validate_input
 from utils.data_manager import DataManager
+from ui.employee_table_model import (EmployeeTableModel, HEADERS, NAME_COLUMN, YEAR_COLUMN,
+                                     MONTH_COLUMN, REQUIRED_DAYS_COLUMN, COMPUTED_COLUMNS)
+from ui.workers import Worker
+from utils import perf
+
+logger = logging.getLogger(__name__)
 
 
 class BatchPayslipWindow(QMainWindow):
     """批量工资条处理窗口"""
     
+    WINDOW_TITLE = "工资条批量生成器"
+    
+    # 开启或关闭性能分析的快捷键（没有菜单项）
+    PROFILE_SHORTCUT = "Ctrl+Shift+P"
+    
+    # 个人工资条数量达到此值时使用多进程并行生成
+    PARALLEL_THRESHOLD = 200
+    
+    # 编辑后延迟保存的时间（毫秒），期间的连续编辑合并为一次保存
+    SAVE_DELAY_MS = 500
+    
+    # 导入时每批显示到表格中的行数
+    IMPORT_CHUNK_SIZE = 500
+    
+    # 已有数据时的导入方式 -> 是否合并到现有数据
+    IMPORT_MODES = {
+        "替换现有数据": False,
+        "合并到现有数据（同一员工同一月份的数据被更新）": True,
+    }
+    
+    # 个人工资条输出方式 -> 是否合并为一个工作簿（None表示每位员工单独一个文件）
+    OUTPUT_MODES = {
+        "每位员工一个Excel文件": None,
+        "打包为一个ZIP压缩包": False,
+        "合并为一个Excel工作簿（每人一个工作表）": True,
+    }
+    
     def __init__(self):
         """初始化窗口"""
         super().__init__()
-        self.setWindowTitle("工资条批量生成器")
+        self.setWindowTitle(self.WINDOW_TITLE)
         self.setMinimumSize(800, 600)
         
         # 获取数据管理器实例
@@ -35,11 +69,33 @@ class BatchPayslipWindow(QMainWindow):
         # 员工数据列表
         self.employee_data = []
         
+        # 编辑过、尚未保存到数据管理器的行
+        self.dirty_rows = set()
+        # 行增删后需要整表保存
+        self.snapshot_pending = False
+        # 表格行号 -> 数据管理器中的位置（没有姓名的行为-1），整表保存时重建
+        self.saved_positions = array('l')
+        
+        # 正在执行的后台任务，及按其实际结果处理的函数（关闭窗口时直接调用）
+        self.current_worker = None
+        self.settle_task = None
+        
+        # 性能统计面板，第一次打开时创建
+        self.perf_dialog = None
+        # 正在进行的性能分析（从点击按钮到后台任务结束）
+        self.profile_session = None
+        
+        # 延迟保存定时器，每次编辑重新计时
+        self.save_timer = QTimer(self)
+        self.save_timer.setSingleShot(True)
+        self.save_timer.setInterval(self.SAVE_DELAY_MS)
+        
         # 设置UI
         self.setup_ui()
         
         # 连接信号
         self.connect_signals()
+        self.setup_profiling()
         
         # 加载保存的数据
         self.load_data()
@@ -79,12 +135,16 @@ class BatchPayslipWindow(QMainWindow):
         self.export_template_button = QPushButton("导出模板")
         self.add_row_button = QPushButton("添加员工")
         self.delete_row_button = QPushButton("删除所选")
+        self.history_button = QPushButton("历史月份")
+        self.perf_button = QPushButton("性能统计")
         
         toolbar_layout.addWidget(self.import_button)
         toolbar_layout.addWidget(self.export_template_button)
         toolbar_layout.addWidget(self.add_row_button)
         toolbar_layout.addWidget(self.delete_row_button)
+        toolbar_layout.addWidget(self.history_button)
         toolbar_layout.addStretch()
+        toolbar_layout.addWidget(self.perf_button)
         
         main_layout.addLayout(toolbar_layout)
         
@@ -116,9 +176,9 @@ class BatchPayslipWindow(QMainWindow):
         main_layout.addLayout(date_layout)
         
         # 表格视图
-        self.table_widget = QTableWidget()
+        self.table_view = QTableView()
         self.setup_table()
-        main_layout.addWidget(self.table_widget)
+        main_layout.addWidget(self.table_view)
         
         # 底部按钮
         button_layout = QHBoxLayout()
@@ -142,64 +202,215 @@ class BatchPayslipWindow(QMainWindow):
     
     def setup_table(self):
         """设置表格视图"""
-        # 表头 - 增加年份和月份列
-        headers = ["姓名", "年份", "月份", "基本工资", "应出勤天数", "实际出勤天数", 
-                  "夜班补助", "高温补贴", "迟到罚款", "其他", "缺勤扣款", "实发工资", "签字"]
-        
-        self.table_widget.setColumnCount(len(headers))
-        self.table_widget.setHorizontalHeaderLabels(headers)
+        # 表格数据由模型按列保存，视图只读取可见的单元格
+        self.table_model = EmployeeTableModel(self)
+        self.table_model.default_year = self.year_spinbox.value()
+        self.table_model.default_month = self.month_spinbox.value()
+        self.table_view.setModel(self.table_model)
         
         # 设置表格属性
-        self.table_widget.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table_widget.setAlternatingRowColors(True)
+        self.table_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table_view.setAlternatingRowColors(True)
         # 修改编辑触发方式为单击
-        self.table_widget.setEditTriggers(QTableWidget.CurrentChanged | QTableWidget.DoubleClicked | QTableWidget.EditKeyPressed)
+        self.table_view.setEditTriggers(QAbstractItemView.CurrentChanged | QAbstractItemView.DoubleClicked | QAbstractItemView.EditKeyPressed)
         
         # 设置列宽
-        header = self.table_widget.horizontalHeader()
-        for i in range(len(headers)):
+        header = self.table_view.horizontalHeader()
+        for i in range(len(HEADERS)):
             header.setSectionResizeMode(i, QHeaderView.Stretch)
+        
+        # 固定行高，行数很多时无需逐行计算高度
+        self.table_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
     
     def connect_signals(self):
         """连接信号和槽"""
-        self.import_button.clicked.connect(self.import_data)
-        self.export_template_button.clicked.connect(self.export_template)
-        self.add_row_button.clicked.connect(self.add_row)
-        self.delete_row_button.clicked.connect(self.delete_rows)
-        self.generate_button.clicked.connect(self.generate_summary)
-        self.generate_individual_button.clicked.connect(self.generate_individual_payslips)
-        self.clear_button.clicked.connect(self.clear_data)
-        self.table_widget.cellChanged.connect(self.cell_changed)
+        # 按钮的槽函数在开启性能分析时于分析下执行，见profiled()
+        buttons = [
+            (self.import_button, self.import_data),
+            (self.export_template_button, self.export_template),
+            (self.add_row_button, self.add_row),
+            (self.delete_row_button, self.delete_rows),
+            (self.history_button, self.load_history_period),
+            (self.perf_button, self.show_perf_stats),
+            (self.generate_button, self.generate_summary),
+            (self.generate_individual_button, self.generate_individual_payslips),
+            (self.clear_button, self.clear_data),
+        ]
+        for button, slot in buttons:
+            button.clicked.connect(self.profiled(slot, button.text()))
+        self.table_model.dataChanged.connect(self.cell_changed)
+        self.table_model.rowsInserted.connect(self.rows_changed)
+        self.table_model.rowsRemoved.connect(self.rows_changed)
+        self.table_model.modelReset.connect(self.rows_changed)
+        self.save_timer.timeout.connect(self.flush_changes)
         self.year_spinbox.valueChanged.connect(self.update_year)
         self.month_spinbox.valueChanged.connect(self.update_month)
     
+    def setup_profiling(self):
+        """添加开启或关闭性能分析的隐藏操作（只有快捷键，没有菜单项）"""
+        self.profile_action = QAction("性能分析", self)
+        self.profile_action.setShortcut(QKeySequence(self.PROFILE_SHORTCUT))
+        self.profile_action.setShortcutContext(Qt.ApplicationShortcut)
+        self.profile_action.triggered.connect(self.toggle_profiling)
+        self.addAction(self.profile_action)
+        self.update_profiling_title()
+    
+    def toggle_profiling(self):
+        """开启或关闭性能分析"""
+        from utils import profiling
+        
+        if profiling.enabled:
+            profiling.disable()
+        else:
+            profiling.enable()
+        self.update_profiling_title()
+    
+    def update_profiling_title(self, saved_path=None):
+        """在窗口标题中显示性能分析状态和上次保存的位置"""
+        from utils import profiling
+        
+        title = self.WINDOW_TITLE
+        if profiling.enabled:
+            title += " - 性能分析已开启"
+            if saved_path:
+                title += f"，结果已保存到：{saved_path}"
+        self.setWindowTitle(title)
+    
+    def profiled(self, slot, action):
+        """
+        包装按钮的槽函数：开启性能分析时，从点击到槽函数启动的后台任务结束都在分析下执行
+        
+        参数:
+            slot (callable): 槽函数
+            action (str): 操作名称，用于分析结果的文件名
+        
+        返回:
+            callable: 可连接到clicked信号的函数
+        """
+        def run(*args):
+            from utils import profiling
+            
+            if not profiling.enabled or self.profile_session is not None:
+                slot()
+                return
+            
+            session = profiling.ProfileSession(action)
+            self.profile_session = session
+            session.start()
+            try:
+                slot()
+            finally:
+                # 槽函数启动了后台任务时，在任务结束后保存（见start_task）
+                worker = self.current_worker
+                if worker is None or worker.profile_session is not session:
+                    self.finish_profile(session)
+        return run
+    
+    def finish_profile(self, session, result=None):
+        """
+        结束性能分析并保存结果：有输出文件时保存在输出文件旁边，否则保存到默认目录
+        
+        参数:
+            session (ProfileSession): 性能分析
+            result (optional): 后台任务的返回值或异常，用于确定输出文件的位置
+        """
+        self.profile_session = None
+        try:
+            prof_path, report_path = session.finish(_output_dir(result))
+        except (OSError, TypeError) as e:
+            logger.warning("保存性能分析结果时出错：%s", e)
+            return
+        logger.info("性能分析结果已保存：%s，%s", prof_path, report_path)
+        self.update_profiling_title(os.path.dirname(prof_path))
+    
     def update_year(self, year):
         """更新当前年份，仅影响新添加的行"""
         self.data_manager.set_current_year(year)
-        print(f"已将默认年份设置为：{year}年")
+        self.table_model.default_year = year
+        logger.debug("已将默认年份设置为：%d年", year)
     
     def update_month(self, month):
         """更新当前月份，仅影响新添加的行"""
         self.data_manager.set_current_month(month)
-        print(f"已将默认月份设置为：{month}月")
+        self.table_model.default_month = month
+        logger.debug("已将默认月份设置为：%d月", month)
     
     def import_data(self):
-        """导入数据"""
+        """导入数据（在后台线程读取，分批显示到表格中）"""
         file_path, _ = QFileDialog.getOpenFileName(
-            self, "选择数据文件", "", "Excel文件 (*.xlsx *.xls);;CSV文件 (*.csv);;所有文件 (*)"
+            self, "选择数据文件", "", "Excel文件 (*.xlsx *.xls);;CSV文件 (*.csv);;其他文本文件 (*.tsv *.jsonl);;所有文件 (*)"
         )
         
-        if file_path:
-            try:
-                from utils.data_import import import_employee_data
-                employees = import_employee_data(file_path)
-                self.load_employees(employees)
-                QMessageBox.information(self, "成功", f"成功导入{len(employees)}条员工数据")
-                
-                # 保存导入的数据
-                self.save_data()
-            except Exception as e:
-                QMessageBox.critical(self, "导入错误", f"导入数据时出错：{str(e)}")
+        if not file_path:
+            return
+        
+        from utils.data_import import ImportSummary
+        from utils.employee_store import MergeSummary
+        summary = ImportSummary()
+        
+        # 保存当前数据，导入失败或取消时恢复
+        self.save_data()
+        previous_employees = self.data_manager.get_batch_mode_data()
+        
+        # 已有数据时选择替换还是合并
+        merge = False
+        if previous_employees:
+            import_modes = list(self.IMPORT_MODES)
+            mode, ok = QInputDialog.getItem(self, "导入方式", "表格中已有员工数据，请选择导入方式：",
+                                            import_modes, 0, False)
+            if not ok:
+                return
+            merge = self.IMPORT_MODES[mode]
+        
+        if merge:
+            # 合并时按(姓名, 年份, 月份)索引更新或添加，完成后再显示到表格中
+            merge_summary = MergeSummary()
+            
+            def on_rows(rows):
+                self.data_manager.merge_batch_mode_data(rows, merge_summary)
+        else:
+            self.table_model.clear()
+            on_rows = self.table_model.append_employees
+        
+        def finished(count):
+            if merge:
+                self.load_data()
+            
+            # 更新月份选择器为最后一名员工的月份（仅用于未来新行的默认值）
+            self.month_spinbox.setValue(self.table_model.value(self.table_model.rowCount() - 1, MONTH_COLUMN))
+            logger.info("导入摘要：\n%s", summary.format_report())
+            
+            message = f"成功导入{count}条员工数据"
+            if merge:
+                logger.info("合并结果：\n%s", merge_summary.format_report())
+                message += f"\n新增{merge_summary.inserted}人，更新{merge_summary.updated}人"
+                if merge_summary.duplicates:
+                    message += (f"\n导入数据中有{len(merge_summary.duplicates)}名员工同一月份出现多次，"
+                                f"已使用最后一条：{_format_keys(merge_summary.duplicates)}")
+            if summary.warnings:
+                rows = "、".join(str(w[0]) for w in summary.warnings[:10])
+                if len(summary.warnings) > 10:
+                    rows += "等"
+                message += f"\n\n有{len(summary.warnings)}处数据无法识别，已按默认值处理（第{rows}行）"
+            
+            # 保存导入的数据，并从索引中检查表格里同一员工同一月份的重复数据
+            self.save_data()
+            duplicates = self.data_manager.batch_mode_data.duplicates()
+            if duplicates:
+                message += f"\n\n表格中有{len(duplicates)}名员工同一月份有多条数据：{_format_keys(duplicates)}"
+            QMessageBox.information(self, "成功", message)
+        
+        def restore():
+            self.load_employees(previous_employees)
+            self.save_data()
+        
+        def failed(error):
+            restore()
+            QMessageBox.critical(self, "导入错误", f"导入数据时出错：{str(error)}")
+        
+        self.start_task("正在导入数据", _import_task, file_path, summary, self.IMPORT_CHUNK_SIZE,
+                        on_finished=finished, on_failed=failed, on_cancelled=restore,
+                        on_rows=on_rows)
     
     def export_template(self):
         """导出模板"""
@@ -215,206 +426,155 @@ class BatchPayslipWindow(QMainWindow):
             except Exception as e:
                 QMessageBox.critical(self, "导出错误", f"导出模板时出错：{str(e)}")
     
+    def load_history_period(self):
+        """加载以前某个月的工资数据，用于核对或重新生成工资条"""
+        periods = self.data_manager.history_periods()
+        if not periods:
+            QMessageBox.information(self, "历史月份", "还没有保存过工资历史。")
+            return
+        
+        # 最近的月份排在前面
+        periods.reverse()
+        items = [f"{p['year']}年{p['month']}月（{p['employee_count']}人，实发合计{p['net_salary']:.2f}）"
+                 for p in periods]
+        item, ok = QInputDialog.getItem(
+            self, "历史月份", "请选择要加载的月份（将替换当前表格中的数据，生成过工资表或工资条的月份才有历史）：",
+            items, 0, False)
+        if not ok:
+            return
+        period = periods[items.index(item)]
+        year, month = period['year'], period['month']
+        
+        # 先保存当前表格，再用该月的数据替换表格内容
+        self.save_data()
+        self.load_employees(self.data_manager.get_period_data(year, month))
+        self.year_spinbox.setValue(year)
+        self.month_spinbox.setValue(month)
+        self.save_data()
+        
+        total = self.data_manager.year_to_date(year, month)
+        QMessageBox.information(
+            self,
+            "历史月份",
+            f"已加载{year}年{month}月的{period['employee_count']}条员工数据\n\n"
+            f"{year}年1-{month}月累计：实发工资{total['net_salary']:.2f}，"
+            f"缺勤扣款{total['absence_deduction']:.2f}（{total['months']}个月）"
+        )
+    
     def get_days_in_month(self, year, month):
         """获取指定年月的天数"""
         return calendar.monthrange(year, month)[1]
     
     def add_row(self):
         """添加新行"""
-        row_count = self.table_widget.rowCount()
-        self.table_widget.insertRow(row_count)
-        
         # 获取当前选择的年份和月份
         year = self.year_spinbox.value()
         month = self.month_spinbox.value()
         
-        # 计算当月天数
-        days_in_month = self.get_days_in_month(year, month)
-        
-        # 设置年份列的值为当前选择的年份
-        year_item = QTableWidgetItem(str(year))
-        self.table_widget.setItem(row_count, 1, year_item)
-        
-        # 设置月份列的值为当前选择的月份
-        month_item = QTableWidgetItem(str(month))
-        self.table_widget.setItem(row_count, 2, month_item)
-        
-        # 设置应出勤天数为当月天数
-        required_days_item = QTableWidgetItem(str(days_in_month))
-        self.table_widget.setItem(row_count, 4, required_days_item)
-        
-        # 设置缺勤扣款和实发工资单元格为只读
-        for col in [10, 11]:  # 缺勤扣款和实发工资列
-            item = QTableWidgetItem("0.00")
-            item.setFlags(item.flags() & ~Qt.ItemIsEditable)
-            self.table_widget.setItem(row_count, col, item)
-        
-        # 为数值列添加默认值0
-        for col in [3, 5, 6, 7, 8, 9]:
-            self.table_widget.setItem(row_count, col, QTableWidgetItem("0"))
-            
-        # 为签字列添加空白
-        self.table_widget.setItem(row_count, 12, QTableWidgetItem(""))
+        # 应出勤天数默认为当月天数，其余数值列为0，签字为空
+        self.table_model.append_employee({
+            'year': year,
+            'month': month,
+            'required_days': self.get_days_in_month(year, month)
+        })
     
     def delete_rows(self):
         """删除选中行"""
-        selected_rows = sorted(set(index.row() for index in self.table_widget.selectedIndexes()))
+        selected_rows = set(index.row() for index in self.table_view.selectionModel().selectedIndexes())
         if not selected_rows:
             return
         
-        for i, row in enumerate(selected_rows):
-            self.table_widget.removeRow(row - i)  # 考虑删除后索引变化
+        self.table_model.remove_rows(selected_rows)
         
         # 保存数据
         self.save_data()
     
-    def cell_changed(self, row, column):
-        """单元格内容变化时更新计算结果"""
-        # 忽略缺勤扣款和实发工资列的变化，它们是自动计算的
-        # 忽略签字列的变化，它不参与计算
-        if column == 1 or column == 2:  # 年份或月份列变化
+    def cell_changed(self, top_left, bottom_right, roles=()):
+        """单元格内容变化时更新应出勤天数，并记录需要保存的行"""
+        # 忽略缺勤扣款和实发工资列的变化，它们由模型自动计算
+        if top_left.column() >= COMPUTED_COLUMNS[0] and bottom_right.column() <= COMPUTED_COLUMNS[-1]:
+            return
+        
+        row = top_left.row()
+        if top_left.column() in (YEAR_COLUMN, MONTH_COLUMN):  # 年份或月份列变化
             try:
-                # 获取年份和月份
-                year = int(self.get_cell_text(row, 1) or self.year_spinbox.value())
-                month = int(self.get_cell_text(row, 2) or self.month_spinbox.value())
-                
-                # 计算当月天数并更新应出勤天数
+                # 计算当月天数并更新应出勤天数（会再次触发本方法）
+                year = self.table_model.value(row, YEAR_COLUMN)
+                month = self.table_model.value(row, MONTH_COLUMN)
                 days_in_month = self.get_days_in_month(year, month)
-                self.table_widget.setItem(row, 4, QTableWidgetItem(str(days_in_month)))
-                
-                # 重新计算该行
-                self.calculate_row(row)
+                self.table_model.setData(self.table_model.index(row, REQUIRED_DAYS_COLUMN), days_in_month)
             except Exception as e:
-                print(f"更新应出勤天数时出错: {str(e)}")
-            
-            # 保存数据
-            self.save_data()
-        elif column < 10 and column not in [1, 2]:  # 排除年份和月份列
-            self.calculate_row(row)
-            # 保存数据
-            self.save_data()
-        elif column == 12:  # 签字列变化，只保存数据但不重新计算
-            self.save_data()
+                logger.warning("更新应出勤天数时出错: %s", e)
+        
+        # 只记录编辑过的行，延迟后统一保存
+        self.dirty_rows.add(row)
+        self.schedule_save()
     
-    def calculate_row(self, row):
-        """计算指定行的缺勤扣款和实发工资"""
-        try:
-            # 获取输入值
-            base_salary = self.get_cell_value(row, 3, 0.0)
-            required_days = self.get_cell_value(row, 4, 0.0)  # 改为浮点数默认值
-            actual_days = self.get_cell_value(row, 5, 0.0)    # 改为浮点数默认值
-            night_shift = self.get_cell_value(row, 6, 0.0)
-            high_temp = self.get_cell_value(row, 7, 0.0)
-            late_fine = self.get_cell_value(row, 8, 0.0)
-            others = self.get_cell_value(row, 9, 0.0)
-            
-            # 计算缺勤扣款和实发工资
-            absence_deduction = calculate_absence_deduction(base_salary, required_days, actual_days)
-            net_salary = calculate_net_salary(base_salary, absence_deduction, night_shift, high_temp, late_fine, others)
-            
-            # 更新表格
-            self.update_cell_value(row, 10, f"{absence_deduction:.2f}")
-            self.update_cell_value(row, 11, f"{net_salary:.2f}")
-            
-        except Exception as e:
-            print(f"计算错误：{str(e)}")
+    def rows_changed(self, *args):
+        """表格行增删或整表替换后，延迟整表保存"""
+        self.snapshot_pending = True
+        self.schedule_save()
+    
+    def schedule_save(self):
+        """
+        重新开始延迟保存的计时
+        
+        后台任务执行期间（如分批导入）不计时，避免把只导入了一部分的表格保存下来，
+        任务结束后由任务的回调保存或恢复数据
+        """
+        if self.current_worker is None:
+            self.save_timer.start()
     
-    def get_cell_value(self, row, column, default=None):
-        """获取单元格值"""
-        item = self.table_widget.item(row, column)
-        if item is None or not item.text().strip():
-            return default
+    def flush_changes(self):
+        """将延迟期间的修改保存到数据管理器"""
+        if self.snapshot_pending:
+            self.save_data()
+            return
         
-        try:
-            if isinstance(default, int):
-                return int(float(item.text()))
-            return float(item.text())
-        except (ValueError, TypeError):
-            return default
-    
-    def update_cell_value(self, row, column, value):
-        """更新单元格值"""
-        item = QTableWidgetItem(str(value))
-        if column in [9, 10]:  # 缺勤扣款和实发工资列设为只读
-            item.setFlags(item.flags() & ~Qt.ItemIsEditable)
-        if column == 9:  # 缺勤扣款列，负值显示为红色
-            try:
-                if float(value) < 0:
-                    item.setForeground(QBrush(QColor("red")))
-            except:
-                pass
-        self.table_widget.setItem(row, column, item)
+        rows = self.dirty_rows
+        self.dirty_rows = set()
+        updates = []
+        for row in rows:
+            position = self.saved_positions[row]
+            if position < 0 or not self.table_model.value(row, NAME_COLUMN):
+                # 有姓名的行发生变化（新填写或清空了姓名），数据管理器中的位置随之改变
+                self.save_data()
+                return
+            updates.append((position, self.table_model.employee(row)))
+        
+        # 所有修改一次保存（打开数据库时在一个事务中写入）
+        with perf.span('window.flush'):
+            self.data_manager.update_batch_mode_rows(updates)
+        perf.count('window.flushed_rows', len(updates))
+        if rows:
+            logger.debug("已保存 %d 行修改", len(rows))
     
     def load_employees(self, employees):
         """加载员工数据到表格"""
-        self.table_widget.setRowCount(0)  # 清除现有数据
+        # 整表一次性替换，期间暂停重绘
+        self.table_view.setUpdatesEnabled(False)
+        try:
+            self.table_model.set_employees(employees)
+        finally:
+            self.table_view.setUpdatesEnabled(True)
         
-        for employee in employees:
-            row = self.table_widget.rowCount()
-            self.table_widget.insertRow(row)
-            
-            # 填充数据
-            self.table_widget.setItem(row, 0, QTableWidgetItem(employee.get('name', '')))
-            self.table_widget.setItem(row, 1, QTableWidgetItem(str(employee.get('year', self.year_spinbox.value()))))
-            self.table_widget.setItem(row, 2, QTableWidgetItem(str(employee.get('month', self.month_spinbox.value()))))
-            self.table_widget.setItem(row, 3, QTableWidgetItem(str(employee.get('base_salary', '0'))))
-            self.table_widget.setItem(row, 4, QTableWidgetItem(str(employee.get('required_days', '0'))))
-            self.table_widget.setItem(row, 5, QTableWidgetItem(str(employee.get('actual_days', '0'))))
-            self.table_widget.setItem(row, 6, QTableWidgetItem(str(employee.get('night_shift', '0'))))
-            self.table_widget.setItem(row, 7, QTableWidgetItem(str(employee.get('high_temp', '0'))))
-            self.table_widget.setItem(row, 8, QTableWidgetItem(str(employee.get('late_fine', '0'))))
-            self.table_widget.setItem(row, 9, QTableWidgetItem(str(employee.get('others', '0'))))
-            self.table_widget.setItem(row, 11, QTableWidgetItem(employee.get('signature', '')))
-            
-            # 计算结果
-            self.calculate_row(row)
-            
-            # 如果有月份信息，更新月份选择器（仅用于未来新行的默认值）
-            if 'month' in employee and 1 <= employee['month'] <= 12:
+        # 如果有月份信息，更新月份选择器（仅用于未来新行的默认值）
+        for employee in reversed(employees):
+            if 1 <= employee.get('month', 0) <= 12:
                 self.month_spinbox.setValue(employee['month'])
+                break
     
     def collect_employee_data(self):
         """收集表格中的所有员工数据"""
         employees = []
         
-        for row in range(self.table_widget.rowCount()):
-            # 获取姓名
-            name_item = self.table_widget.item(row, 0)
-            if name_item is None or not name_item.text().strip():
+        for employee in self.table_model.employees():
+            # 验证关键数据
+            if employee['base_salary'] <= 0 or employee['required_days'] <= 0:
+                logger.info("员工 %s 的数据无效: 基本工资或应出勤天数必须大于零", employee['name'])
                 continue
-                
-            # 获取月份
-            try:
-                month = int(self.get_cell_text(row, 2) or self.month_spinbox.value())
-            except ValueError:
-                month = self.month_spinbox.value()
-                
-            # 获取其他数据
-            try:
-                employee = {
-                    'name': name_item.text().strip(),
-                    'year': int(self.get_cell_text(row, 1) or self.year_spinbox.value()),
-                    'month': month,
-                    'base_salary': self.get_cell_value(row, 3, 0.0),
-                    'required_days': self.get_cell_value(row, 4, 0.0),  # 改为浮点数默认值
-                    'actual_days': self.get_cell_value(row, 5, 0.0),    # 改为浮点数默认值
-                    'night_shift': self.get_cell_value(row, 6, 0.0),
-                    'high_temp': self.get_cell_value(row, 7, 0.0),
-                    'late_fine': self.get_cell_value(row, 8, 0.0),
-                    'others': self.get_cell_value(row, 9, 0.0),
-                    'absence_deduction': self.get_cell_value(row, 10, 0.0),
-                    'net_salary': self.get_cell_value(row, 11, 0.0),
-                    'signature': self.get_cell_text(row, 12)
-                }
-                
-                # 验证关键数据
-                if employee['base_salary'] <= 0 or employee['required_days'] <= 0:
-                    print(f"行 {row+1} 的数据无效: 基本工资或应出勤天数必须大于零")
-                    continue
-                    
-                employees.append(employee)
-            except Exception as e:
-                print(f"收集第 {row+1} 行数据时出错: {str(e)}")
+            
+            employees.append(employee)
         
         return employees
     
@@ -426,8 +586,7 @@ class BatchPayslipWindow(QMainWindow):
         # 收集有效的员工数据
         employees = self.collect_employee_data()
         
-        # 打印调试信息
-        print(f"收集到 {len(employees)} 个有效员工数据")
+        logger.debug("收集到 %d 个有效员工数据", len(employees))
         
         if not employees:
             QMessageBox.warning(self, "警告", "没有有效的员工数据！请确保至少有一行完整的员工信息，包括姓名、基本工资和出勤天数。")
@@ -438,42 +597,39 @@ class BatchPayslipWindow(QMainWindow):
         if not output_dir:
             return
         
-        try:
-            # 获取当前年份和月份
-            year = self.year_spinbox.value()
-            month = self.month_spinbox.value()
-            
-            # 获取自定义表名
-            default_filename = f"{year}年{month}月工资表.xlsx"
-            filename, ok = QInputDialog.getText(
-                self, 
-                "输入文件名", 
-                "请输入工资表文件名：", 
-                text=default_filename
-            )
-            
-            if not ok or not filename:
-                filename = default_filename
-            
-            # 确保文件名以.xlsx结尾
-            if not filename.lower().endswith('.xlsx'):
-                filename += '.xlsx'
-            
-            from utils.excel import generate_summary_excel
-            output_path = generate_summary_excel(
-                employees, 
-                month, 
-                os.path.join(output_dir, filename)
-            )
-            
+        # 获取当前年份和月份
+        year = self.year_spinbox.value()
+        month = self.month_spinbox.value()
+        
+        # 获取自定义表名
+        default_filename = f"{year}年{month}月工资表.xlsx"
+        filename, ok = QInputDialog.getText(
+            self, 
+            "输入文件名", 
+            "请输入工资表文件名：", 
+            text=default_filename
+        )
+        
+        if not ok or not filename:
+            filename = default_filename
+        
+        # 确保文件名以.xlsx结尾
+        if not filename.lower().endswith('.xlsx'):
+            filename += '.xlsx'
+        
+        def finished(output_path):
+            self.data_manager.archive_batch_mode_data(employees)
             QMessageBox.information(
                 self, 
                 "成功", 
                 f"已成功生成工资汇总表！\n\n保存在：{output_path}"
             )
-            
-        except Exception as e:
-            QMessageBox.critical(self, "错误", f"生成工资表时出错：{str(e)}")
+        
+        def failed(error):
+            QMessageBox.critical(self, "错误", f"生成工资表时出错：{str(error)}")
+        
+        self.start_task("正在生成工资汇总表", _summary_task, employees, month, os.path.join(output_dir, filename),
+                        on_finished=finished, on_failed=failed)
     
     def generate_individual_payslips(self):
         """生成个人工资条"""
@@ -487,27 +643,178 @@ class BatchPayslipWindow(QMainWindow):
             QMessageBox.warning(self, "警告", "没有有效的员工数据！请确保至少有一行完整的员工信息，包括姓名、基本工资和出勤天数。")
             return
         
+        # 选择输出方式
+        output_modes = list(self.OUTPUT_MODES)
+        mode, ok = QInputDialog.getItem(self, "输出方式", "请选择工资条的输出方式：", output_modes, 0, False)
+        if not ok:
+            return
+        
+        if self.OUTPUT_MODES[mode] is not None:
+            self.generate_payslip_archive(employees, self.OUTPUT_MODES[mode])
+            return
+        
         # 选择输出目录
         output_dir = QFileDialog.getExistingDirectory(self, "选择输出目录", "")
         if not output_dir:
             return
         
-        try:
-            from utils.excel import batch_generate_excel
-            file_paths = batch_generate_excel(employees, output_dir)
-            
+        # 员工较多时使用多进程并行生成
+        workers = 0 if len(employees) >= self.PARALLEL_THRESHOLD else 1
+        if workers != 1 and self.profile_session is not None:
+            # 工作进程不在分析范围内，性能分析时改为在当前进程中生成
+            workers = 1
+            self.profile_session.note("性能分析期间个人工资条在当前进程中生成（正常情况下使用多进程并行生成）")
+        
+        def finished(file_paths):
+            self.data_manager.archive_batch_mode_data(employees)
             QMessageBox.information(
                 self, 
                 "成功", 
                 f"已成功生成{len(file_paths)}份个人工资条！\n\n保存在：{output_dir}"
             )
-            
-        except Exception as e:
-            QMessageBox.critical(self, "错误", f"生成工资条时出错：{str(e)}")
+        
+        def failed(error):
+            from utils.excel import BatchGenerateError
+            if isinstance(error, BatchGenerateError):
+                QMessageBox.warning(
+                    self,
+                    "部分失败",
+                    f"已生成{len(error.file_paths)}份个人工资条，保存在：{output_dir}\n\n{str(error)}"
+                )
+            else:
+                QMessageBox.critical(self, "错误", f"生成工资条时出错：{str(error)}")
+        
+        self.start_task("正在生成个人工资条", _payslips_task, employees, output_dir, workers,
+                        on_finished=finished, on_failed=failed)
+    
+    def generate_payslip_archive(self, employees, as_workbook):
+        """
+        将个人工资条写入单个zip压缩包或多工作表工作簿
+        
+        参数:
+            employees (list): 员工数据字典列表
+            as_workbook (bool): 是否生成多工作表的工作簿
+        """
+        timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
+        if as_workbook:
+            default_name = f"工资条_{timestamp}.xlsx"
+            file_filter = "Excel文件 (*.xlsx)"
+        else:
+            default_name = f"工资条_{timestamp}.zip"
+            file_filter = "ZIP压缩包 (*.zip)"
+        
+        output_path, _ = QFileDialog.getSaveFileName(self, "保存工资条", default_name, file_filter)
+        if not output_path:
+            return
+        
+        def finished(output_path):
+            self.data_manager.archive_batch_mode_data(employees)
+            QMessageBox.information(
+                self,
+                "成功",
+                f"已成功生成{len(employees)}份个人工资条！\n\n保存在：{output_path}"
+            )
+        
+        def failed(error):
+            from utils.excel import BatchGenerateError
+            if isinstance(error, BatchGenerateError):
+                QMessageBox.warning(
+                    self,
+                    "部分失败",
+                    f"已生成{len(employees) - len(error.failures)}份个人工资条，保存在：{output_path}\n\n{str(error)}"
+                )
+            else:
+                QMessageBox.critical(self, "错误", f"生成工资条时出错：{str(error)}")
+        
+        self.start_task("正在生成个人工资条", _archive_task, employees, output_path, as_workbook,
+                        on_finished=finished, on_failed=failed)
+    
+    def start_task(self, label, task, *args, on_finished, on_failed, on_cancelled=None, on_rows=None):
+        """
+        在后台线程中执行任务，并显示可取消的进度对话框
+        
+        任务的进度、分批数据和结果都通过信号回到界面线程处理，
+        进度对话框为窗口模态，任务执行期间不能编辑表格
+        
+        参数:
+            label (str): 进度对话框中显示的文字
+            task (callable): 任务函数，调用方式为 task(worker, *args)
+            on_finished (callable): 任务完成时调用，参数为任务的返回值
+            on_failed (callable): 任务出错时调用，参数为异常对象
+            on_cancelled (callable, optional): 任务被取消时调用
+            on_rows (callable, optional): 任务分批返回员工数据时调用
+        """
+        worker = Worker(task, *args)
+        worker.profile_session = self.profile_session
+        # 任务执行期间暂停延迟保存，见schedule_save()
+        self.save_timer.stop()
+        
+        dialog = QProgressDialog(label, "取消", 0, 0, self)
+        dialog.setWindowTitle("请稍候")
+        dialog.setWindowModality(Qt.WindowModal)
+        dialog.setMinimumDuration(0)
+        dialog.setAutoClose(False)
+        dialog.setAutoReset(False)
+        dialog.canceled.connect(worker.cancel)
+        
+        def progress(done, total):
+            if total:
+                dialog.setMaximum(total)
+                dialog.setValue(done)
+                dialog.setLabelText(f"{label}（{done}/{total}）")
+            else:
+                dialog.setLabelText(f"{label}（已处理{done}条）")
+        
+        def done(callback, *result):
+            if self.current_worker is not worker:
+                # 关闭窗口时已处理，忽略之后送达的信号
+                return
+            self.current_worker = None
+            self.settle_task = None
+            dialog.canceled.disconnect(worker.cancel)
+            dialog.close()
+            if worker.profile_session is not None:
+                # 在显示结果对话框之前结束分析，不计入等待用户关闭对话框的时间
+                self.finish_profile(worker.profile_session, *result)
+            if self.snapshot_pending or self.dirty_rows:
+                # 恢复任务期间暂停的延迟保存（回调中保存数据时会停止计时）
+                self.save_timer.start()
+            if callback:
+                callback(*result)
+        
+        def rows(batch):
+            if self.current_worker is worker:
+                on_rows(batch)
+        
+        worker.signals.progress.connect(progress)
+        if on_rows:
+            worker.signals.rows.connect(rows)
+        worker.signals.finished.connect(lambda result: done(on_finished, result))
+        worker.signals.failed.connect(lambda error: done(on_failed, error))
+        worker.signals.cancelled.connect(lambda: done(on_cancelled))
+        
+        handlers = {Worker.FINISHED: on_finished, Worker.FAILED: on_failed, Worker.CANCELLED: on_cancelled}
+        
+        def settle():
+            # 先送达已排队的分批数据和结果信号（结果信号送达时由done()处理），
+            # 没有送达时按任务记录的实际结果处理，只有任务确实被取消时才恢复数据
+            QCoreApplication.sendPostedEvents(None, QEvent.MetaCall)
+            if self.current_worker is not worker:
+                return
+            if worker.outcome is None:
+                logger.warning("后台任务没有结束，无法处理其结果")
+                return
+            args = () if worker.outcome == Worker.CANCELLED else (worker.result,)
+            done(handlers[worker.outcome], *args)
+        
+        self.current_worker = worker
+        self.settle_task = settle
+        dialog.show()
+        QThreadPool.globalInstance().start(worker)
     
     def clear_data(self):
         """清除所有数据"""
-        if self.table_widget.rowCount() > 0:
+        if self.table_model.rowCount() > 0:
             reply = QMessageBox.question(
                 self, 
                 "确认清除", 
@@ -517,63 +824,118 @@ class BatchPayslipWindow(QMainWindow):
             )
             
             if reply == QMessageBox.Yes:
-                self.table_widget.setRowCount(0)
+                self.table_model.clear()
                 # 清除数据管理器中的批量模式数据
-                self.data_manager.batch_mode_data = []
-    
-    def get_cell_text(self, row, column):
-        """获取单元格文本内容"""
-        item = self.table_widget.item(row, column)
-        if item is None:
-            return ""
-        return item.text().strip()
+                self.data_manager.clear_batch_mode_data()
     
     def save_data(self):
-        """保存表格数据到数据管理器"""
+        """保存整个表格数据到数据管理器"""
+        self.save_timer.stop()
+        self.dirty_rows = set()
+        self.snapshot_pending = False
         try:
-            employees = []
+            # 跳过没有姓名的行，按列整块保存
+            with perf.span('window.save'):
+                employees = self.table_model.employee_store()
+                self.data_manager.save_batch_mode_data(employees)
+            perf.count('window.saved_rows', len(employees))
             
-            for row in range(self.table_widget.rowCount()):
-                name = self.get_cell_text(row, 0)
-                if not name:  # 跳过没有姓名的行
-                    continue
-                
-                # 获取月份
-                try:
-                    month = int(self.get_cell_text(row, 2) or self.month_spinbox.value())
-                except ValueError:
-                    month = self.month_spinbox.value()
-                    
-                employee = {
-                    'name': name,
-                    'year': int(self.get_cell_text(row, 1) or self.year_spinbox.value()),
-                    'month': month,
-                    'base_salary': self.get_cell_value(row, 3, 0.0),
-                    'required_days': self.get_cell_value(row, 4, 0.0),  # 改为浮点数默认值
-                    'actual_days': self.get_cell_value(row, 5, 0.0),    # 改为浮点数默认值
-                    'night_shift': self.get_cell_value(row, 6, 0.0),
-                    'high_temp': self.get_cell_value(row, 7, 0.0),
-                    'late_fine': self.get_cell_value(row, 8, 0.0),
-                    'others': self.get_cell_value(row, 9, 0.0),
-                    'absence_deduction': self.get_cell_value(row, 10, 0.0),
-                    'net_salary': self.get_cell_value(row, 11, 0.0),
-                    'signature': self.get_cell_text(row, 12)
-                }
-                employees.append(employee)
+            # 记录每行在数据管理器中的位置，之后的编辑只更新对应的一条
+            self.saved_positions = array('l', [-1]) * self.table_model.rowCount()
+            for position, row in enumerate(self.table_model.named_rows()):
+                self.saved_positions[row] = position
             
-            self.data_manager.save_batch_mode_data(employees)
-            print(f"已保存 {len(employees)} 条员工数据")
+            logger.debug("已保存 %d 条员工数据", len(employees))
         except Exception as e:
-            print(f"保存数据时出错: {str(e)}")
+            logger.warning("保存数据时出错: %s", e)
     
     def load_data(self):
         """从数据管理器加载数据到表格"""
         employees = self.data_manager.get_batch_mode_data()
         if employees:
             self.load_employees(employees)
-            print(f"已加载 {len(employees)} 条员工数据")
+            logger.debug("已加载 %d 条员工数据", len(employees))
+    
+    def show_perf_stats(self):
+        """显示性能统计面板"""
+        if self.perf_dialog is None:
+            from ui.perf_panel import PerfStatsDialog
+            self.perf_dialog = PerfStatsDialog(self)
+        self.perf_dialog.show()
+        self.perf_dialog.raise_()
+        self.perf_dialog.activateWindow()
     
     def closeEvent(self, event):
-        """窗口关闭时保存数据"""
+        """窗口关闭时取消后台任务并保存数据"""
+        if self.current_worker is not None:
+            self.current_worker.cancel()
+            QThreadPool.globalInstance().waitForDone()
+            # 任务可能在取消之前已经完成，按实际结果处理后再保存
+            self.settle_task()
         self.save_data()
-        super().closeEvent(event)
\ No newline at end of file
+        super().closeEvent(event)
+
+
+def _format_keys(keys, limit=10):
+    """将(姓名, 年份, 月份)列表格式化为提示文字，最多列出limit个"""
+    keys = list(keys)
+    text = "、".join(f"{name}（{year}年{month}月）" for name, year, month in keys[:limit])
+    if len(keys) > limit:
+        text += "等"
+    return text
+
+
+def _output_dir(result):
+    """从后台任务的返回值（文件路径或路径列表）或BatchGenerateError中取出输出文件所在的目录"""
+    paths = getattr(result, 'file_paths', result)
+    if isinstance(paths, (list, tuple)):
+        paths = paths[0] if paths else None
+    if isinstance(paths, str) and paths:
+        return os.path.dirname(os.path.abspath(paths))
+    return None
+
+
+def _import_task(worker, file_path, summary, chunk_size):
+    """后台导入：分批读取员工数据并交给界面线程显示"""
+    from utils.data_import import iter_employee_data
+    
+    count = 0
+    chunks = iter_employee_data(file_path, chunk_size=chunk_size, summary=summary)
+    try:
+        for chunk in chunks:
+            worker.emit_rows(chunk)
+            count += len(chunk)
+            worker.report_progress(count)
+    finally:
+        chunks.close()
+    
+    if not count:
+        raise ValueError("没有找到有效的员工数据")
+    return count
+
+
+def _summary_task(worker, employees, month, output_path):
+    """后台生成汇总工资表，每写入一名员工报告一次进度"""
+    from utils.excel import generate_summary_excel
+    
+    total = len(employees)
+    
+    def rows():
+        for done, employee in enumerate(employees, 1):
+            yield employee
+            worker.report_progress(done, total)
+    
+    return generate_summary_excel(rows(), month, output_path)
+
+
+def _payslips_task(worker, employees, output_dir, workers):
+    """后台生成个人工资条文件"""
+    from utils.excel import batch_generate_excel
+    return batch_generate_excel(employees, output_dir, workers=workers, progress_callback=worker.report_progress)
+
+
+def _archive_task(worker, employees, output_path, as_workbook):
+    """后台将个人工资条写入单个压缩包或工作簿"""
+    from utils.excel import generate_payslip_archive
+    return generate_payslip_archive(employees, output_path, as_workbook=as_workbook,
+                                    progress_callback=worker.report_progress)
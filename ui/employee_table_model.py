@@ -0,0 +1,439 @@
+"""
+批量模式员工表格数据模型
+按列存储员工数据，表格视图只读取当前可见的单元格
+"""
+
+import sys
+import os
+from array import array
+from math import isfinite
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QVariant
+from PyQt5.QtGui import QColor, QBrush
+
+# 导入自定义模块
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.calculator import (calculate_absence_deduction, calculate_net_salary,
+                             calculate_batch, validate_input)
+from utils.employee_store import EmployeeStore, INT_MIN, INT_MAX
+from utils import perf
+
+
+# 表头
+HEADERS = ["姓名", "年份", "月份", "基本工资", "应出勤天数", "实际出勤天数",
+           "夜班补助", "高温补贴", "迟到罚款", "其他", "缺勤扣款", "实发工资", "签字"]
+
+# 各列对应的员工数据字段
+FIELDS = ['name', 'year', 'month', 'base_salary', 'required_days', 'actual_days',
+          'night_shift', 'high_temp', 'late_fine', 'others',
+          'absence_deduction', 'net_salary', 'signature']
+
+# 列序号
+NAME_COLUMN = 0
+YEAR_COLUMN = 1
+MONTH_COLUMN = 2
+REQUIRED_DAYS_COLUMN = 4
+DEDUCTION_COLUMN = 10
+NET_SALARY_COLUMN = 11
+SIGNATURE_COLUMN = 12
+
+# 文本列、整数列和参与计算的数值列
+TEXT_COLUMNS = (NAME_COLUMN, SIGNATURE_COLUMN)
+INT_COLUMNS = (YEAR_COLUMN, MONTH_COLUMN)
+NUMBER_COLUMNS = (3, 4, 5, 6, 7, 8, 9)
+
+# 自动计算的列（只读）
+COMPUTED_COLUMNS = (DEDUCTION_COLUMN, NET_SALARY_COLUMN)
+
+# 缺勤扣款为负时的文字颜色
+NEGATIVE_BRUSH = QBrush(QColor("red"))
+
+
+class EmployeeTableModel(QAbstractTableModel):
+    """
+    员工表格数据模型
+    
+    文本列使用列表，数值列使用array按列紧凑存储，编辑时即转换为数值，
+    不再保存每个单元格的字符串。缺勤扣款和实发工资不单独保存输入，
+    在显示或导出时按需计算并缓存，输入变化后重新计算
+    """
+    
+    def __init__(self, parent=None):
+        """初始化空表格"""
+        super().__init__(parent)
+        
+        # 年份或月份为空时使用的默认值
+        self.default_year = 0
+        self.default_month = 1
+        
+        self._init_columns()
+    
+    def _init_columns(self):
+        """创建空的列存储"""
+        self._columns = {}
+        for column in TEXT_COLUMNS:
+            self._columns[column] = []
+        for column in INT_COLUMNS:
+            self._columns[column] = array('l')
+        for column in NUMBER_COLUMNS + COMPUTED_COLUMNS:
+            self._columns[column] = array('d')
+        
+        # 每行的计算结果是否需要重新计算
+        self._stale = bytearray()
+    
+    def rowCount(self, parent=QModelIndex()):
+        """行数"""
+        if parent.isValid():
+            return 0
+        return len(self._stale)
+    
+    def columnCount(self, parent=QModelIndex()):
+        """列数"""
+        if parent.isValid():
+            return 0
+        return len(HEADERS)
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        """表头：列标题和行号"""
+        if role != Qt.DisplayRole:
+            return QVariant()
+        if orientation == Qt.Horizontal:
+            return HEADERS[section]
+        return str(section + 1)
+    
+    def flags(self, index):
+        """自动计算的列只读，其余列可编辑"""
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsSelectable | Qt.ItemIsEnabled
+        if index.column() not in COMPUTED_COLUMNS:
+            flags |= Qt.ItemIsEditable
+        return flags
+    
+    def data(self, index, role=Qt.DisplayRole):
+        """只在视图请求时把单元格的值格式化为文本"""
+        if not index.isValid():
+            return QVariant()
+        
+        row, column = index.row(), index.column()
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            value = self.value(row, column)
+            if column in TEXT_COLUMNS:
+                return value
+            if column in COMPUTED_COLUMNS:
+                # 加0.0使-0.0显示为0.00
+                return f"{value + 0.0:.2f}"
+            return _format_number(value)
+        
+        if role == Qt.ForegroundRole and column == DEDUCTION_COLUMN:
+            # 缺勤扣款为负值时显示为红色
+            if self.value(row, column) < 0:
+                return NEGATIVE_BRUSH
+        
+        return QVariant()
+    
+    def setData(self, index, value, role=Qt.EditRole):
+        """
+        编辑单元格，输入在此时转换为数值
+        
+        返回:
+            bool: 输入有效并已保存时返回True
+        """
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        
+        row, column = index.row(), index.column()
+        if column in COMPUTED_COLUMNS:
+            return False
+        
+        converted = self._convert(column, value)
+        if converted is None:
+            return False
+        
+        self._columns[column][row] = converted
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        
+        # 参与计算的列变化后，该行的缺勤扣款和实发工资需要重新计算
+        if column in NUMBER_COLUMNS:
+            self._stale[row] = 1
+            self.dataChanged.emit(self.index(row, DEDUCTION_COLUMN), self.index(row, NET_SALARY_COLUMN))
+        return True
+    
+    def value(self, row, column):
+        """
+        获取单元格的值
+        
+        参数:
+            row (int): 行号
+            column (int): 列号
+        
+        返回:
+            str/int/float: 文本列返回字符串，其余列返回数值
+        """
+        if column in COMPUTED_COLUMNS and self._stale[row]:
+            self._compute_row(row)
+        return self._columns[column][row]
+    
+    def employee(self, row):
+        """
+        获取一行员工数据
+        
+        参数:
+            row (int): 行号
+        
+        返回:
+            dict: 员工数据字典
+        """
+        if self._stale[row]:
+            self._compute_row(row)
+        return {field: self._columns[column][row] for column, field in enumerate(FIELDS)}
+    
+    def employees(self):
+        """
+        获取所有填写了姓名的员工数据
+        
+        返回:
+            list: 员工数据字典列表
+        """
+        self._compute_stale()
+        columns = [self._columns[column] for column in range(len(FIELDS))]
+        return [dict(zip(FIELDS, values)) for values in zip(*columns) if values[NAME_COLUMN]]
+    
+    def named_rows(self):
+        """
+        获取填写了姓名的行号，与employees()返回的数据一一对应
+        
+        返回:
+            list: 行号列表
+        """
+        return [row for row, name in enumerate(self._columns[NAME_COLUMN]) if name]
+    
+    def employee_store(self):
+        """
+        将填写了姓名的行按列导出，各列整块复制，不逐行创建字典
+        
+        返回:
+            EmployeeStore: 按列存储的员工数据，行顺序与named_rows()一致
+        """
+        self._compute_stale()
+        rows = self.named_rows()
+        columns = {}
+        for column, field in enumerate(FIELDS):
+            values = self._columns[column]
+            if len(rows) == len(values):
+                columns[field] = values[:]
+            elif isinstance(values, array):
+                columns[field] = array(values.typecode, map(values.__getitem__, rows))
+            else:
+                columns[field] = list(map(values.__getitem__, rows))
+        return EmployeeStore.from_columns(columns)
+    
+    def set_employees(self, employees):
+        """
+        用员工数据替换表格全部内容
+        
+        按列一次性填充，整个过程只发出一次重置信号，
+        缺勤扣款和实发工资整列批量计算一次
+        
+        参数:
+            employees (list/EmployeeStore): 员工数据字典列表，或按列存储的员工数据
+        """
+        self.beginResetModel()
+        self._init_columns()
+        self._extend(employees)
+        self.endResetModel()
+    
+    def append_employees(self, employees):
+        """
+        在表格末尾批量添加多行（用于导入时分批显示）
+        
+        参数:
+            employees (list): 员工数据字典列表
+        """
+        if not employees:
+            return
+        first = self.rowCount()
+        self.beginInsertRows(QModelIndex(), first, first + len(employees) - 1)
+        self._extend(employees)
+        self.endInsertRows()
+    
+    def append_employee(self, employee):
+        """
+        在表格末尾添加一行
+        
+        参数:
+            employee (dict): 员工数据字典，缺少的字段使用默认值
+        
+        返回:
+            int: 新行的行号
+        """
+        row = self.rowCount()
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._append(employee)
+        self.endInsertRows()
+        return row
+    
+    def remove_rows(self, rows):
+        """
+        删除指定的行
+        
+        参数:
+            rows (iterable): 要删除的行号
+        """
+        removed = set(rows)
+        if not removed:
+            return
+        
+        self.beginResetModel()
+        keep = [row for row in range(self.rowCount()) if row not in removed]
+        for column, values in self._columns.items():
+            if isinstance(values, array):
+                self._columns[column] = array(values.typecode, (values[row] for row in keep))
+            else:
+                self._columns[column] = [values[row] for row in keep]
+        self._stale = bytearray(self._stale[row] for row in keep)
+        self.endResetModel()
+    
+    def clear(self):
+        """清除所有行"""
+        self.beginResetModel()
+        self._init_columns()
+        self.endResetModel()
+    
+    def _append(self, employee):
+        """追加一行数据，不发出信号"""
+        for column, field in enumerate(FIELDS):
+            if column in COMPUTED_COLUMNS:
+                self._columns[column].append(0.0)
+                continue
+            
+            value = self._convert(column, employee.get(field))
+            if value is None:
+                # 无法识别的值按空值处理
+                value = self._convert(column, "")
+            self._columns[column].append(value)
+        self._stale.append(1)
+    
+    def _extend(self, employees):
+        """按列追加多行数据并批量计算新增的行，不发出信号"""
+        count = len(employees)
+        if not count:
+            return
+        
+        for column, field in enumerate(FIELDS):
+            if column in COMPUTED_COLUMNS:
+                continue
+            if isinstance(employees, EmployeeStore):
+                # 按列存储的数据类型已经一致，数值列直接整块复制
+                values = employees.column(field)
+                if column in TEXT_COLUMNS:
+                    self._columns[column].extend(values)
+                else:
+                    self._columns[column].frombytes(values.cast('B'))
+                continue
+            values = [employee.get(field) for employee in employees]
+            self._columns[column].extend(self._column_values(column, values))
+        
+        with perf.span('table.calculate'):
+            deductions, net_salaries = calculate_batch(*(self._columns[column][-count:] for column in NUMBER_COLUMNS))
+        perf.count('table.calculated_rows', count)
+        self._columns[DEDUCTION_COLUMN].extend(deductions)
+        self._columns[NET_SALARY_COLUMN].extend(net_salaries)
+        self._stale.extend(bytes(count))
+    
+    def _column_values(self, column, values):
+        """将一列输入转换为列存储，数值列全部是有限数值时直接整列转换"""
+        if column in NUMBER_COLUMNS and all(type(value) in (int, float) and _is_finite(value) for value in values):
+            return array('d', values)
+        
+        converted = []
+        for value in values:
+            value = self._convert(column, value)
+            if value is None:
+                # 无法识别的值按空值处理
+                value = self._convert(column, "")
+            converted.append(value)
+        
+        if column in TEXT_COLUMNS:
+            return converted
+        return array('l' if column in INT_COLUMNS else 'd', converted)
+    
+    def _convert(self, column, value):
+        """
+        将输入转换为列的存储类型
+        
+        返回:
+            str/int/float: 转换后的值，输入无效时返回None
+        """
+        if column in TEXT_COLUMNS:
+            return "" if value is None else str(value).strip()
+        
+        if value is None or isinstance(value, str):
+            text = "" if value is None else value.strip()
+            if not text:
+                # 年份和月份为空时使用当前选择的年月，其余数值为0
+                if column == YEAR_COLUMN:
+                    return self.default_year
+                if column == MONTH_COLUMN:
+                    return self.default_month
+                return 0.0
+            value = validate_input(text, None)
+            if value is None:
+                return None
+        
+        if not _is_finite(value):
+            return None
+        if column in INT_COLUMNS:
+            if value != int(value):
+                return None
+            value = int(value)
+            if not INT_MIN <= value <= INT_MAX:
+                return None
+            if column == MONTH_COLUMN and not 1 <= value <= 12:
+                return None
+            return value
+        return float(value)
+    
+    def _compute_row(self, row):
+        """计算一行的缺勤扣款和实发工资"""
+        columns = self._columns
+        base_salary = columns[3][row]
+        absence_deduction = calculate_absence_deduction(base_salary, columns[4][row], columns[5][row])
+        columns[DEDUCTION_COLUMN][row] = absence_deduction
+        columns[NET_SALARY_COLUMN][row] = calculate_net_salary(
+            base_salary, absence_deduction, columns[6][row], columns[7][row], columns[8][row], columns[9][row])
+        self._stale[row] = 0
+    
+    def _compute_stale(self):
+        """计算所有需要重新计算的行，数量较多时整列批量计算"""
+        stale_count = self._stale.count(1)
+        if not stale_count:
+            return
+        
+        perf.count('table.calculated_rows', stale_count)
+        if stale_count < 64:
+            row = self._stale.find(1)
+            while row != -1:
+                self._compute_row(row)
+                row = self._stale.find(1, row + 1)
+            return
+        
+        with perf.span('table.calculate'):
+            deductions, net_salaries = calculate_batch(*(self._columns[column] for column in NUMBER_COLUMNS))
+        self._columns[DEDUCTION_COLUMN] = array('d', deductions)
+        self._columns[NET_SALARY_COLUMN] = array('d', net_salaries)
+        self._stale = bytearray(len(self._stale))
+
+
+def _format_number(value):
+    """数值显示为文本，整数不显示小数部分"""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _is_finite(value):
+    """是否为有限数值，超出浮点数范围的整数视为无效"""
+    try:
+        return isfinite(value)
+    except OverflowError:
+        return False
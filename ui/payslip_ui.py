@@ -4,6 +4,7 @@
 
 import sys
 import os
+import logging
 from datetime import datetime
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                            QHBoxLayout, QFormLayout, QLabel, QLineEdit, 
@@ -14,9 +15,10 @@ from PyQt5.QtGui import QRegExpValidator, QIcon, QFont
 # 导入自定义模块
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from core.calculator import calculate_absence_deduction, calculate_net_salary
-from utils.excel import generate_excel
 from utils.data_manager import DataManager
 
+logger = logging.getLogger(__name__)
+
 
 class PayslipGeneratorWindow(QMainWindow):
     """
@@ -174,7 +176,7 @@ class PayslipGeneratorWindow(QMainWindow):
     def update_month(self, month):
         """更新月份"""
         self.data_manager.set_current_month(month)
-        print(f"已将月份设置为: {month}月")
+        logger.debug("已将月份设置为: %d月", month)
     
     def generate_payslip(self):
         """生成工资条"""
@@ -233,7 +235,8 @@ class PayslipGeneratorWindow(QMainWindow):
         # 保存数据到数据管理器
         self.data_manager.save_single_mode_data(employee_data)
         
-        # 生成Excel文件
+        # 生成Excel文件（首次生成时才导入openpyxl）
+        from utils.excel import generate_excel
         try:
             file_path = generate_excel(employee_data)
             QMessageBox.information(
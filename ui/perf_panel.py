@@ -0,0 +1,117 @@
+"""
+性能统计面板
+显示utils.perf记录的各区间耗时和计数器，可开启/关闭统计、清零和复制结果
+"""
+
+import sys
+import os
+from PyQt5.QtWidgets import (QApplication, QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                             QCheckBox, QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView)
+from PyQt5.QtCore import Qt, QTimer
+
+# 导入自定义模块
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import perf
+
+
+class PerfStatsDialog(QDialog):
+    """性能统计面板（非模态），显示期间每秒刷新一次"""
+    
+    HEADERS = ["名称", "次数", "总耗时(ms)", "平均(ms)", "最长(ms)"]
+    
+    # 自动刷新间隔（毫秒）
+    REFRESH_MS = 1000
+    
+    def __init__(self, parent=None):
+        """初始化面板"""
+        super().__init__(parent)
+        self.setWindowTitle("性能统计")
+        self.resize(720, 420)
+        
+        layout = QVBoxLayout(self)
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+        
+        self.table = QTableWidget(0, len(self.HEADERS))
+        self.table.setHorizontalHeaderLabels(self.HEADERS)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        layout.addWidget(self.table)
+        
+        button_layout = QHBoxLayout()
+        self.enable_checkbox = QCheckBox("开启统计")
+        self.enable_checkbox.setChecked(perf.enabled)
+        self.reset_button = QPushButton("清零")
+        self.copy_button = QPushButton("复制")
+        self.close_button = QPushButton("关闭")
+        button_layout.addWidget(self.enable_checkbox)
+        button_layout.addStretch()
+        button_layout.addWidget(self.reset_button)
+        button_layout.addWidget(self.copy_button)
+        button_layout.addWidget(self.close_button)
+        layout.addLayout(button_layout)
+        
+        self.enable_checkbox.toggled.connect(self.set_enabled)
+        self.reset_button.clicked.connect(self.reset)
+        self.copy_button.clicked.connect(self.copy_summary)
+        self.close_button.clicked.connect(self.close)
+        
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(self.REFRESH_MS)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh()
+    
+    def showEvent(self, event):
+        """显示时开始自动刷新"""
+        self.refresh()
+        self.refresh_timer.start()
+        super().showEvent(event)
+    
+    def hideEvent(self, event):
+        """隐藏时停止自动刷新"""
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+    
+    def set_enabled(self, checked):
+        """开启或关闭统计"""
+        if checked:
+            perf.enable()
+        else:
+            perf.disable()
+        self.refresh()
+    
+    def reset(self):
+        """清空统计结果"""
+        perf.reset()
+        self.refresh()
+    
+    def copy_summary(self):
+        """将统计文本复制到剪贴板"""
+        QApplication.clipboard().setText(perf.format_summary())
+    
+    def refresh(self):
+        """重新读取统计结果"""
+        summary = perf.summary()
+        if summary['enabled']:
+            self.status_label.setText("统计已开启，导入、生成Excel和表格计算/保存的耗时会记录在下表中")
+        else:
+            self.status_label.setText("统计未开启，勾选“开启统计”后重新执行需要分析的操作")
+        
+        rows = [(name, item['count'], item['total'], item['mean'], item['max'])
+                for name, item in summary['spans'].items()]
+        rows.extend((name, value, None, None, None) for name, value in summary['counters'].items())
+        
+        self.table.setRowCount(len(rows))
+        for row, values in enumerate(rows):
+            for column, value in enumerate(values):
+                if value is None:
+                    text = ""
+                elif column >= 2:
+                    text = f"{value * 1e3:.3f}"
+                else:
+                    text = str(value)
+                item = QTableWidgetItem(text)
+                if column:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, column, item)
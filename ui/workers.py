@@ -0,0 +1,125 @@
+"""
+后台任务模块
+在线程池中执行导入和生成等耗时操作，通过信号把进度和结果交回界面线程
+"""
+
+import time
+import logging
+import threading
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerCancelled(Exception):
+    """用户取消了后台任务"""
+
+
+class WorkerSignals(QObject):
+    """
+    后台任务的信号
+    
+    信号对象在界面线程中创建，后台线程发出的信号会排队到界面线程执行，
+    连接的槽函数可以直接操作界面和表格模型
+    """
+    
+    # 进度：(已完成数量, 总数量)，总数量为0表示未知
+    progress = pyqtSignal(int, int)
+    # 分批返回的员工数据
+    rows = pyqtSignal(list)
+    # 任务完成，参数为任务的返回值
+    finished = pyqtSignal(object)
+    # 任务出错，参数为异常对象
+    failed = pyqtSignal(object)
+    # 任务被取消
+    cancelled = pyqtSignal()
+
+
+class Worker(QRunnable):
+    """
+    后台任务
+    
+    任务函数的第一个参数为Worker本身，用于报告进度、分批返回数据和检查是否已取消
+    """
+    
+    # 进度信号的最小间隔（秒），避免大量信号堆积在界面线程
+    PROGRESS_INTERVAL = 0.05
+    
+    # 任务的结果（outcome属性）
+    FINISHED = 'finished'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+    
+    def __init__(self, task, *args, **kwargs):
+        """
+        参数:
+            task (callable): 任务函数，调用方式为 task(worker, *args, **kwargs)
+        """
+        super().__init__()
+        self.task = task
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+        self._cancel_event = threading.Event()
+        self._last_progress = 0.0
+        # 开启性能分析时由窗口设置，任务在分析下执行（见utils.profiling.ProfileSession）
+        self.profile_session = None
+        # 任务结束后的结果（FINISHED/FAILED/CANCELLED）和返回值或异常，在发出信号之前记录，
+        # 界面线程不等排队的信号送达也能知道任务的实际结果
+        self.outcome = None
+        self.result = None
+    
+    def cancel(self):
+        """请求取消任务，任务在下一次报告进度或返回数据时停止"""
+        self._cancel_event.set()
+    
+    def is_cancelled(self):
+        """是否已请求取消"""
+        return self._cancel_event.is_set()
+    
+    def check_cancelled(self):
+        """已请求取消时抛出WorkerCancelled"""
+        if self._cancel_event.is_set():
+            raise WorkerCancelled()
+    
+    def report_progress(self, done, total=0):
+        """
+        报告进度（可直接作为progress_callback传给生成函数）
+        
+        参数:
+            done (int): 已完成数量
+            total (int, optional): 总数量，0表示未知
+        """
+        self.check_cancelled()
+        now = time.monotonic()
+        if done == total or now - self._last_progress >= self.PROGRESS_INTERVAL:
+            self._last_progress = now
+            self.signals.progress.emit(done, total)
+    
+    def emit_rows(self, rows):
+        """
+        分批返回员工数据
+        
+        参数:
+            rows (list): 员工数据字典列表
+        """
+        self.check_cancelled()
+        self.signals.rows.emit(rows)
+    
+    def run(self):
+        """在线程池中执行任务"""
+        try:
+            if self.profile_session is not None:
+                result = self.profile_session.run(self.task, self, *self.args, **self.kwargs)
+            else:
+                result = self.task(self, *self.args, **self.kwargs)
+        except WorkerCancelled:
+            self.outcome = self.CANCELLED
+            self.signals.cancelled.emit()
+        except Exception as e:
+            logger.warning("后台任务出错：%s", e)
+            self.outcome, self.result = self.FAILED, e
+            self.signals.failed.emit(e)
+        else:
+            self.outcome, self.result = self.FINISHED, result
+            self.signals.finished.emit(result)
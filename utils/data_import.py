@@ -5,302 +5,520 @@
 
 import os
 import csv
+import json
+import time
+import logging
+from math import isfinite
+from itertools import islice
 from openpyxl import Workbook, load_workbook
 from datetime import datetime
 
+from utils import perf
 
-def import_employee_data(file_path):
+
+logger = logging.getLogger(__name__)
+
+
+# 列名映射（中文 -> 英文）
+COLUMN_MAP = {
+    '姓名': 'name',
+    '月份': 'month',
+    '基本工资': 'base_salary',
+    '应出勤天数': 'required_days',
+    '实际出勤天数': 'actual_days',
+    '夜班补助': 'night_shift',
+    '高温补贴': 'high_temp',
+    '迟到罚款': 'late_fine',
+    '其他': 'others'
+}
+
+# 识别表头行时必须出现的中文列
+REQUIRED_CN_COLUMNS = ['姓名', '基本工资', '应出勤天数', '实际出勤天数']
+
+# 映射后必须存在的字段
+REQUIRED_COLUMNS = ['name', 'base_salary', 'required_days', 'actual_days']
+
+# 需要转换为数值的字段
+NUMERIC_FIELDS = ['base_salary', 'required_days', 'actual_days',
+                  'night_shift', 'high_temp', 'late_fine', 'others']
+
+
+def _iter_excel_rows(file_path):
+    """按行流式读取Excel文件，每行返回一个值元组"""
+    wb = load_workbook(filename=file_path, read_only=True, data_only=True)
+    try:
+        yield from wb.active.iter_rows(values_only=True)
+    finally:
+        wb.close()
+
+
+def _iter_csv_rows(file_path, delimiter=','):
+    """按行流式读取CSV文件，每行返回一个字符串列表"""
+    with open(file_path, newline='', encoding='utf-8-sig') as f:
+        yield from csv.reader(f, delimiter=delimiter)
+
+
+def _iter_tsv_rows(file_path):
+    """按行流式读取制表符分隔的文本文件"""
+    return _iter_csv_rows(file_path, delimiter='\t')
+
+
+def _iter_jsonl_rows(file_path):
     """
-    导入员工数据 - 不依赖pandas，支持中文表头，自动检测表头行，支持多表头格式
+    按行流式读取JSON Lines文件
     
-    参数:
-        file_path (str): 数据文件路径
+    每行可以是一个数组（等同于表格中的一行），也可以是一个对象，
+    对象会被展开为“表头行 + 数据行”，与多表头格式一致
+    """
+    with open(file_path, encoding='utf-8-sig') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                yield ()
+                continue
+            record = json.loads(line)
+            if isinstance(record, dict):
+                yield tuple(record.keys())
+                yield tuple(record.values())
+            else:
+                yield tuple(record)
+
+
+# 文件扩展名 -> 行数据源，新增格式只需在此注册一个返回行迭代器的函数
+ROW_SOURCES = {
+    '.xlsx': _iter_excel_rows,
+    '.xls': _iter_excel_rows,
+    '.csv': _iter_csv_rows,
+    '.tsv': _iter_tsv_rows,
+    '.jsonl': _iter_jsonl_rows,
+}
+
+
+class HeaderResolver:
+    """
+    表头解析器 - 按表头签名缓存列映射结果
     
-    返回:
-        list: 员工数据字典列表
+    多表头格式中每名员工前都会重复同一表头，首次遇到某个表头时完成
+    精确/不区分大小写/包含关系三级匹配，之后相同的表头只需一次字典查找
     """
-    # 获取文件扩展名
-    _, ext = os.path.splitext(file_path)
-    ext = ext.lower()
     
-    employees = []
+    def __init__(self, column_map=None, max_size=128):
+        """
+        初始化表头解析器
+        
+        参数:
+            column_map (dict, optional): 列名映射（中文 -> 英文），默认为COLUMN_MAP
+            max_size (int, optional): 最多缓存的表头签名数量
+        """
+        self.column_map = column_map if column_map is not None else COLUMN_MAP
+        self.max_size = max_size
+        self._cache = {}
+        
+        # 命中/未命中计数，用于确认缓存在实际文件上的效果
+        self.hits = 0
+        self.misses = 0
+    
+    def resolve(self, headers):
+        """
+        解析一行候选表头
+        
+        参数:
+            headers (list): 表头文本列表，空单元格为None
+        
+        返回:
+            tuple: (字段名, 列索引) 对组成的元组；不是表头行时返回None，
+                   是表头行但缺少必要的列时返回空元组
+        """
+        signature = tuple(headers)
+        mapping = self._cache.get(signature)
+        if mapping is not None:
+            self.hits += 1
+            return mapping
+        
+        # 检查是否为表头行（不是表头的行不进入缓存）
+        found_headers = [h for h in headers if h is not None]
+        if not found_headers or not all(any(required_cn in h for h in found_headers)
+                                        for required_cn in REQUIRED_CN_COLUMNS):
+            return None
+        
+        self.misses += 1
+        mapped_indices = self.map_headers(headers)
+        
+        # 检查必要的列是否存在
+        missing_columns = [col for col in REQUIRED_COLUMNS if col not in mapped_indices]
+        if missing_columns:
+            logger.warning("表头缺少必要的列：%s", missing_columns)
+            mapping = ()
+        else:
+            mapping = tuple(mapped_indices.items())
+        
+        if len(self._cache) >= self.max_size:
+            self._cache.clear()
+        self._cache[signature] = mapping
+        return mapping
+    
+    def map_headers(self, headers):
+        """
+        将表头映射为字段名到列索引的字典
+        
+        参数:
+            headers (list): 表头文本列表，空单元格为None
+        
+        返回:
+            dict: 字段名 -> 列索引
+        """
+        column_map = self.column_map
+        mapped_indices = {}
+        for i, header in enumerate(headers):
+            if header is None:
+                continue
+            
+            header_lower = header.lower()
+            
+            # 1. 首先尝试精确匹配
+            if header in column_map:
+                mapped_indices[column_map[header]] = i
+                continue
+            
+            # 2. 然后尝试不区分大小写的精确匹配
+            for cn, en in column_map.items():
+                if cn.lower() == header_lower:
+                    mapped_indices[en] = i
+                    break
+            
+            # 3. 最后尝试包含关系匹配
+            if not any(cn.lower() == header_lower for cn in column_map):
+                for cn, en in column_map.items():
+                    if cn.lower() in header_lower or header_lower in cn.lower():
+                        mapped_indices[en] = i
+                        break
+        
+        logger.debug("列映射结果: %s", mapped_indices)
+        return mapped_indices
+
+
+def _to_number(value):
+    """将单元格值转换为有限的浮点数，支持带千位分隔符的文本，无法转换时抛出ValueError"""
+    if type(value) in (int, float):
+        number = float(value)
+    else:
+        number = float(str(value).replace(',', ''))
+    if not isfinite(number):
+        raise ValueError(f"不是有限数值：{value!r}")
+    return number
+
+
+def _to_month(value):
+    """将单元格值转换为月份，不是1到12的整数时抛出ValueError"""
+    number = _to_number(value)
+    if not number.is_integer() or not 1 <= number <= 12:
+        raise ValueError(f"月份超出范围：{value!r}")
+    return int(number)
+
+
+class ImportSummary:
+    """
+    单次导入的统计摘要
+    
+    记录读取行数、导入人数、数值转换警告（含行号）以及各阶段耗时，
+    传入导入函数后由解析过程填充
+    """
+    
+    def __init__(self):
+        """初始化统计摘要"""
+        self.file_path = None
+        self.rows_read = 0
+        self.rows_imported = 0
+        self.header_rows = 0
+        self.header_cache_hits = 0
+        self.header_cache_misses = 0
+        self.months_defaulted = 0
+        
+        # 数值转换警告列表，每项为 (行号, 字段名, 原始值, 说明)
+        self.warnings = []
+        
+        # 各阶段耗时（秒）：read为读取和解码文件，parse为识别表头和转换数据
+        self.phase_times = {'read': 0.0, 'parse': 0.0}
+    
+    def add_warning(self, row_number, field, value, message):
+        """
+        记录一条数据转换警告
+        
+        参数:
+            row_number (int): 数据所在行号（从1开始）
+            field (str): 字段名
+            value: 原始单元格值
+            message (str): 警告说明
+        """
+        self.warnings.append((row_number, field, value, message))
+    
+    @property
+    def total_time(self):
+        """导入总耗时（秒）"""
+        return sum(self.phase_times.values())
+    
+    def format_report(self):
+        """
+        生成可读的摘要文本
+        
+        返回:
+            str: 摘要文本
+        """
+        lines = [
+            f"读取行数：{self.rows_read}",
+            f"导入员工：{self.rows_imported}",
+            f"表头行数：{self.header_rows}（缓存命中{self.header_cache_hits}次）",
+            f"耗时：读取{self.phase_times['read']:.3f}秒，解析{self.phase_times['parse']:.3f}秒",
+        ]
+        if self.months_defaulted:
+            lines.append(f"缺少月份已设为当前月份：{self.months_defaulted}条")
+        for row_number, field, value, message in self.warnings:
+            lines.append(f"第{row_number}行 {field}：{value!r} {message}")
+        return "\n".join(lines)
+
+
+def _timed_rows(rows, summary):
+    """包装行迭代器，累计读取和解码所花的时间"""
+    perf_counter = time.perf_counter
+    phase_times = summary.phase_times
+    iterator = iter(rows)
+    while True:
+        start = perf_counter()
+        try:
+            row = next(iterator)
+        except StopIteration:
+            phase_times['read'] += perf_counter() - start
+            return
+        phase_times['read'] += perf_counter() - start
+        yield row
+
+
+def parse_employee_rows(rows, resolver=None, summary=None):
+    """
+    从行迭代器中逐条解析员工数据，与文件格式无关
+    
+    按顺序只遍历一次：识别到表头行后，下一行作为数据行；
+    空行和其他无关行在表头检测中被自然跳过
     
-    # 列名映射（中文 -> 英文）
-    column_map = {
-        '姓名': 'name',
-        '月份': 'month',
-        '基本工资': 'base_salary',
-        '应出勤天数': 'required_days',
-        '实际出勤天数': 'actual_days',
-        '夜班补助': 'night_shift',
-        '高温补贴': 'high_temp',
-        '迟到罚款': 'late_fine',
-        '其他': 'others'
-    }
+    参数:
+        rows (iterable): 行迭代器，每行为单元格值的序列
+        resolver (HeaderResolver, optional): 表头解析器，默认每次解析新建一个
+        summary (ImportSummary, optional): 导入统计摘要，传入后填充统计信息
     
-    # 反向映射字典，用于错误提示（英文 -> 中文）
-    reverse_map = {v: k for k, v in column_map.items()}
+    生成:
+        dict: 员工数据字典
+    """
+    if resolver is None:
+        resolver = HeaderResolver()
+    
+    # 只在开始时判断一次日志级别和性能统计，未开启时热路径上不做任何格式化和计时
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+    perf_enabled = perf.enabled
+    if perf_enabled:
+        perf_counter = time.perf_counter
+        header_time = 0.0
+        convert_time = 0.0
+        if summary is None:
+            # 读取耗时由统计摘要累计
+            summary = ImportSummary()
     
-    # 必要的中文列
-    required_cn_columns = ['姓名', '基本工资', '应出勤天数', '实际出勤天数']
+    if summary is not None:
+        rows = _timed_rows(rows, summary)
+        start_time = time.perf_counter()
+        hits_before = resolver.hits
+        misses_before = resolver.misses
+    
+    mapping = None  # 上一行为表头时，保存其列映射，当前行按数据行处理
+    row_number = 0
+    imported = 0
+    header_rows = 0
     
     try:
-        if ext in ['.xlsx', '.xls']:
-            # 使用openpyxl读取Excel文件
-            wb = load_workbook(filename=file_path, read_only=True, data_only=True)
-            ws = wb.active
-            
-            # 按行扫描工作表，识别表头行和数据行
-            current_row = 1
-            max_row = ws.max_row
-            
-            while current_row <= max_row:
-                # 尝试将当前行作为表头
-                headers = []
-                for col in range(1, ws.max_column + 1):
-                    cell_value = ws.cell(row=current_row, column=col).value
-                    if cell_value is not None:
-                        headers.append(str(cell_value).strip())
-                    else:
-                        headers.append(None)
+        for row_number, row in enumerate(rows, 1):
+            if mapping is not None:
+                # 表头的下一行作为数据行
+                employee = {}
+                row_length = len(row)
                 
-                # 检查是否为表头行
-                found_headers = [h for h in headers if h is not None]
-                missing_count = 0
-                for required_cn in required_cn_columns:
-                    if not any(required_cn in h or h == required_cn for h in found_headers):
-                        missing_count += 1
-                
-                if missing_count == 0:  # 找到了可能的表头行
-                    print(f"在第{current_row}行检测到表头: {headers}")
-                    
-                    # 映射列名
-                    mapped_indices = {}
-                    for i, header in enumerate(headers):
-                        if header is None:
-                            continue
-                            
-                        header_lower = header.lower()
-                        
-                        # 1. 首先尝试精确匹配
-                        if header in column_map:
-                            mapped_indices[column_map[header]] = i
-                            continue
-                        
-                        # 2. 然后尝试不区分大小写的精确匹配
-                        for cn, en in column_map.items():
-                            if cn.lower() == header_lower:
-                                mapped_indices[en] = i
-                                break
-                                
-                        # 3. 最后尝试包含关系匹配
-                        if not any(cn.lower() == header_lower for cn in column_map):
-                            for cn, en in column_map.items():
-                                if cn.lower() in header_lower or header_lower in cn.lower():
-                                    mapped_indices[en] = i
-                                    break
-                    
-                    print(f"列映射结果: {mapped_indices}")
-                    
-                    # 检查必要的列是否存在
-                    required_columns = ['name', 'base_salary', 'required_days', 'actual_days']
-                    missing_columns = [col for col in required_columns if col not in mapped_indices]
-                    if missing_columns:
-                        print(f"第{current_row}行缺少必要的列：{missing_columns}，尝试下一行")
-                        current_row += 1
+                # 获取映射后的值
+                for en, i in mapping:
+                    if i >= row_length:
                         continue
-                    
-                    # 读取下一行作为数据
-                    if current_row + 1 <= max_row:
-                        data_row = current_row + 1
-                        employee = {}
-                        
-                        # 获取映射后的值
-                        for en, i in mapped_indices.items():
-                            cell_value = ws.cell(row=data_row, column=i+1).value
-                            if cell_value is not None:
-                                employee[en] = cell_value
-                        
-                        # 如果有姓名，添加到员工列表
-                        if employee.get('name'):
-                            # 确保数值字段类型正确
-                            for field in ['base_salary', 'required_days', 'actual_days', 
-                                         'night_shift', 'high_temp', 'late_fine', 'others']:
-                                if field in employee:
-                                    try:
-                                        if field in ['required_days', 'actual_days']:
-                                            employee[field] = float(str(employee[field]).replace(',', ''))
-                                        else:
-                                            employee[field] = float(str(employee[field]).replace(',', ''))
-                                    except (ValueError, TypeError):
-                                        print(f"警告：{field}字段的值'{employee[field]}'无法转换为数值，已设为0")
-                                        employee[field] = 0
-                                else:
-                                    employee[field] = 0
-                            
-                            # 处理月份字段
-                            if 'month' in employee:
-                                try:
-                                    employee['month'] = int(float(str(employee['month']).replace(',', '')))
-                                except (ValueError, TypeError):
-                                    employee['month'] = datetime.now().month
-                                    print(f"警告：月份字段值无效，已设为当前月份{employee['month']}")
-                            else:
-                                employee['month'] = datetime.now().month
-                                print(f"警告：缺少月份字段，已设为当前月份{employee['month']}")
-                            
-                            employees.append(employee)
-                            print(f"成功导入员工：{employee['name']}")
-                        
-                        # 跳过当前表头和数据行，以及可能的空行
-                        current_row = data_row + 1
-                        # 跳过空行
-                        while current_row <= max_row:
-                            has_data = False
-                            for col in range(1, ws.max_column + 1):
-                                if ws.cell(row=current_row, column=col).value is not None:
-                                    has_data = True
-                                    break
-                            if has_data:
-                                break
-                            current_row += 1
-                    else:
-                        # 已经到达文件末尾
-                        break
-                else:
-                    # 不是表头行，继续检查下一行
-                    current_row += 1
-            
-            wb.close()
-            
-        elif ext == '.csv':
-            # 使用csv模块读取CSV文件
-            with open(file_path, newline='', encoding='utf-8-sig') as f:
-                reader = csv.reader(f)
-                rows = list(reader)
+                    cell_value = row[i]
+                    if cell_value is None:
+                        continue
+                    if isinstance(cell_value, str):
+                        cell_value = cell_value.strip()
+                        if not cell_value:
+                            continue
+                    employee[en] = cell_value
                 
-                if not rows:
-                    raise ValueError("CSV文件为空")
+                mapping = None
                 
-                # 按行扫描，识别表头行和数据行
-                row_index = 0
-                while row_index < len(rows):
-                    # 尝试将当前行作为表头
-                    headers = [h.strip() for h in rows[row_index] if h]
+                # 如果有姓名，添加到员工列表
+                if employee.get('name'):
+                    if perf_enabled:
+                        convert_start = perf_counter()
                     
-                    # 检查是否为表头行
-                    missing_count = 0
-                    for required_cn in required_cn_columns:
-                        if not any(required_cn in h or h == required_cn for h in headers):
-                            missing_count += 1
-                    
-                    if missing_count == 0:  # 找到了可能的表头行
-                        print(f"在第{row_index+1}行检测到表头: {headers}")
-                        
-                        # 映射列名
-                        mapped_indices = {}
-                        for i, header in enumerate(headers):
-                            if not header:
-                                continue
-                                
-                            header_lower = header.lower()
-                            
-                            # 1. 首先尝试精确匹配
-                            if header in column_map:
-                                mapped_indices[column_map[header]] = i
-                                continue
-                            
-                            # 2. 然后尝试不区分大小写的精确匹配
-                            for cn, en in column_map.items():
-                                if cn.lower() == header_lower:
-                                    mapped_indices[en] = i
-                                    break
-                                    
-                            # 3. 最后尝试包含关系匹配
-                            if not any(cn.lower() == header_lower for cn in column_map):
-                                for cn, en in column_map.items():
-                                    if cn.lower() in header_lower or header_lower in cn.lower():
-                                        mapped_indices[en] = i
-                                        break
-                        
-                        print(f"列映射结果: {mapped_indices}")
-                        
-                        # 检查必要的列是否存在
-                        required_columns = ['name', 'base_salary', 'required_days', 'actual_days']
-                        missing_columns = [col for col in required_columns if col not in mapped_indices]
-                        if missing_columns:
-                            print(f"第{row_index+1}行缺少必要的列：{missing_columns}，尝试下一行")
-                            row_index += 1
-                            continue
-                        
-                        # 读取下一行作为数据
-                        if row_index + 1 < len(rows):
-                            data_row = row_index + 1
-                            row_data = rows[data_row]
-                            employee = {}
-                            
-                            # 获取映射后的值
-                            for en, i in mapped_indices.items():
-                                if i < len(row_data):
-                                    cell_value = row_data[i].strip()
-                                    if cell_value:
-                                        employee[en] = cell_value
-                            
-                            # 如果有姓名，添加到员工列表
-                            if employee.get('name'):
-                                # 确保数值字段类型正确
-                                for field in ['base_salary', 'required_days', 'actual_days', 
-                                             'night_shift', 'high_temp', 'late_fine', 'others']:
-                                    if field in employee:
-                                        try:
-                                            if field in ['required_days', 'actual_days']:
-                                                employee[field] = float(str(employee[field]).replace(',', ''))
-                                            else:
-                                                employee[field] = float(str(employee[field]).replace(',', ''))
-                                        except (ValueError, TypeError):
-                                            print(f"警告：{field}字段的值'{employee[field]}'无法转换为数值，已设为0")
-                                            employee[field] = 0
-                                    else:
-                                        employee[field] = 0
-                                
-                                # 处理月份字段
-                                if 'month' in employee:
-                                    try:
-                                        employee['month'] = int(float(str(employee['month']).replace(',', '')))
-                                    except (ValueError, TypeError):
-                                        employee['month'] = datetime.now().month
-                                        print(f"警告：月份字段值无效，已设为当前月份{employee['month']}")
-                                else:
-                                    employee['month'] = datetime.now().month
-                                    print(f"警告：缺少月份字段，已设为当前月份{employee['month']}")
-                                
-                                employees.append(employee)
-                                print(f"成功导入员工：{employee['name']}")
-                            
-                            # 跳过当前表头和数据行，以及可能的空行
-                            row_index = data_row + 1
-                            # 跳过空行
-                            while row_index < len(rows):
-                                if any(cell.strip() for cell in rows[row_index] if cell):
-                                    break
-                                row_index += 1
+                    # 确保数值字段类型正确
+                    for field in NUMERIC_FIELDS:
+                        if field in employee:
+                            try:
+                                employee[field] = _to_number(employee[field])
+                            except (ValueError, TypeError, OverflowError):
+                                logger.warning("第%d行%s字段的值%r无法转换为数值，已设为0",
+                                               row_number, field, employee[field])
+                                if summary is not None:
+                                    summary.add_warning(row_number, field, employee[field],
+                                                        "无法转换为数值，已设为0")
+                                employee[field] = 0
                         else:
-                            # 已经到达文件末尾
-                            break
+                            employee[field] = 0
+                    
+                    # 处理月份字段
+                    if 'month' in employee:
+                        try:
+                            employee['month'] = _to_month(employee['month'])
+                        except (ValueError, TypeError, OverflowError):
+                            logger.warning("第%d行月份字段的值%r无效，已设为当前月份",
+                                           row_number, employee['month'])
+                            if summary is not None:
+                                summary.add_warning(row_number, 'month', employee['month'],
+                                                    "月份无效，已设为当前月份")
+                            employee['month'] = datetime.now().month
                     else:
-                        # 不是表头行，继续检查下一行
-                        row_index += 1
-        else:
-            raise ValueError(f"不支持的文件类型：{ext}")
-        
-        if not employees:
-            raise ValueError("没有找到有效的员工数据")
-        
-        return employees
+                        employee['month'] = datetime.now().month
+                        if summary is not None:
+                            summary.months_defaulted += 1
+                        if debug_enabled:
+                            logger.debug("第%d行缺少月份字段，已设为当前月份%d", row_number, employee['month'])
+                    
+                    if perf_enabled:
+                        convert_time += perf_counter() - convert_start
+                    imported += 1
+                    if debug_enabled:
+                        logger.debug("第%d行成功导入员工：%s", row_number, employee['name'])
+                    yield employee
+                continue
+            
+            # 尝试将当前行作为表头
+            if perf_enabled:
+                header_start = perf_counter()
+            headers = []
+            for cell_value in row:
+                if cell_value is not None:
+                    cell_value = str(cell_value).strip()
+                headers.append(cell_value or None)
+            
+            # 检查是否为表头行并映射列名
+            mapping = resolver.resolve(headers)
+            if perf_enabled:
+                header_time += perf_counter() - header_start
+            if mapping is not None:
+                header_rows += 1
+                if debug_enabled:
+                    logger.debug("在第%d行检测到表头: %s", row_number, headers)
+                if not mapping:
+                    logger.warning("第%d行表头缺少必要的列，尝试下一行", row_number)
+                    mapping = None
+    finally:
+        if summary is not None:
+            summary.rows_read = row_number
+            summary.rows_imported = imported
+            summary.header_rows = header_rows
+            summary.header_cache_hits = resolver.hits - hits_before
+            summary.header_cache_misses = resolver.misses - misses_before
+            elapsed = time.perf_counter() - start_time
+            summary.phase_times['parse'] = max(elapsed - summary.phase_times['read'], 0.0)
+        if perf_enabled:
+            # 表头识别和数值转换的耗时包含在解析耗时中
+            perf.add_time('import.read', summary.phase_times['read'])
+            perf.add_time('import.parse', summary.phase_times['parse'])
+            perf.add_time('import.header_mapping', header_time, row_number - imported)
+            perf.add_time('import.numeric_coercion', convert_time, imported)
+            perf.count('import.rows', summary.rows_read)
+            perf.count('import.employees', summary.rows_imported)
+            perf.count('import.header_rows', summary.header_rows)
+            perf.count('import.header_cache_misses', summary.header_cache_misses)
+            perf.count('import.warnings', len(summary.warnings))
     
+    if row_number == 0:
+        raise ValueError("文件为空")
+
+
+def iter_employee_data(file_path, chunk_size=None, resolver=None, summary=None):
+    """
+    流式导入员工数据，边读取边返回，内存占用与文件大小无关
+    
+    参数:
+        file_path (str): 数据文件路径
+        chunk_size (int, optional): 指定后按批返回，每批最多chunk_size条
+        resolver (HeaderResolver, optional): 表头解析器，传入后可读取其命中/未命中计数
+        summary (ImportSummary, optional): 导入统计摘要，传入后填充统计信息
+    
+    返回:
+        iterator: 逐条返回员工数据字典；指定chunk_size时逐批返回员工数据字典列表
+    """
+    # 获取文件扩展名
+    _, ext = os.path.splitext(file_path)
+    ext = ext.lower()
+    
+    row_source = ROW_SOURCES.get(ext)
+    if row_source is None:
+        raise ValueError(f"导入数据时出错：不支持的文件类型：{ext}")
+    
+    if summary is not None:
+        summary.file_path = file_path
+    
+    employees = _iter_employee_data(row_source, file_path, resolver, summary)
+    if chunk_size:
+        return _iter_chunks(employees, chunk_size)
+    return employees
+
+
+def _iter_employee_data(row_source, file_path, resolver, summary):
+    """逐条解析员工数据，并统一包装导入错误"""
+    try:
+        yield from parse_employee_rows(row_source(file_path), resolver, summary)
     except Exception as e:
-        print(f"导入数据时出错：{str(e)}")
+        logger.error("导入数据时出错：%s", e)
         raise ValueError(f"导入数据时出错：{str(e)}")
+    
+    if summary is not None:
+        logger.info("导入完成：%s，读取%d行，导入%d条，警告%d条，耗时%.3f秒",
+                    file_path, summary.rows_read, summary.rows_imported,
+                    len(summary.warnings), summary.total_time)
+
+
+def _iter_chunks(iterable, size):
+    """将迭代器按固定大小分批"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def import_employee_data(file_path, resolver=None, summary=None):
+    """
+    导入员工数据 - 不依赖pandas，支持中文表头，自动检测表头行，支持多表头格式
+    
+    参数:
+        file_path (str): 数据文件路径
+        resolver (HeaderResolver, optional): 表头解析器，传入后可读取其命中/未命中计数
+        summary (ImportSummary, optional): 导入统计摘要，传入后填充统计信息
+    
+    返回:
+        list: 员工数据字典列表
+    """
+    employees = list(iter_employee_data(file_path, resolver=resolver, summary=summary))
+    
+    if not employees:
+        logger.error("导入数据时出错：没有找到有效的员工数据")
+        raise ValueError("导入数据时出错：没有找到有效的员工数据")
+    
+    return employees
 
 
 def export_template(file_path):
@@ -376,5 +594,5 @@ def export_template(file_path):
         wb.save(file_path)
         return True
     except Exception as e:
-        print(f"导出模板时出错：{str(e)}")
+        logger.error("导出模板时出错：%s", e)
         raise Exception(f"导出模板时出错：{str(e)}")
\ No newline at end of file
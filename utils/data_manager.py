@@ -1,10 +1,19 @@
 """
 数据管理器模块
-用于在单人模式和批量模式之间共享数据
+用于在单人模式和批量模式之间共享数据，打开数据库后修改会同时保存到磁盘
 """
 
+import os
+import sys
+import sqlite3
+import logging
 from datetime import datetime
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.employee_store import EmployeeStore
+
+logger = logging.getLogger(__name__)
+
 class DataManager:
     """数据管理器单例类"""
     
@@ -43,8 +52,53 @@ class DataManager:
             'others': 0.0
         }
         
-        # 批量模式数据
-        self.batch_mode_data = []
+        # 批量模式数据（按列存储）
+        self.batch_mode_data = EmployeeStore()
+        
+        # 数据库，调用open_storage()后才保存到磁盘
+        self.storage = None
+    
+    def open_storage(self, path=None):
+        """
+        打开数据库并加载上次保存的数据
+        
+        参数:
+            path (str, optional): 数据库文件路径，默认见utils.storage.default_db_path()
+        
+        返回:
+            int: 加载的批量模式员工人数
+        """
+        from utils.storage import PayslipStorage
+        
+        storage = PayslipStorage(path)
+        self.batch_mode_data = storage.load_roster()
+        single_mode_data = storage.load_setting('single_mode_data')
+        if single_mode_data:
+            self.single_mode_data = single_mode_data
+        self.storage = storage
+        return len(self.batch_mode_data)
+    
+    def close_storage(self):
+        """关闭数据库"""
+        if self.storage is not None:
+            self.storage.close()
+            self.storage = None
+    
+    def _persist(self, method, *args):
+        """
+        调用数据库的写入方法，未打开数据库时不执行
+        
+        写入失败只记录警告，内存中的数据不受影响
+        
+        参数:
+            method (str): PayslipStorage的方法名
+        """
+        if self.storage is None:
+            return
+        try:
+            getattr(self.storage, method)(*args)
+        except sqlite3.Error as e:
+            logger.warning("保存到数据库时出错：%s", e)
     
     def save_single_mode_data(self, data):
         """
@@ -59,6 +113,7 @@ class DataManager:
             self.single_mode_data['year'] = self.current_year
         if 'month' not in self.single_mode_data:
             self.single_mode_data['month'] = self.current_month
+        self._persist('save_setting', 'single_mode_data', self.single_mode_data)
     
     def get_single_mode_data(self):
         """
@@ -74,25 +129,133 @@ class DataManager:
         保存批量模式数据
         
         参数:
-            data_list (list): 员工数据字典列表
+            data_list (list/EmployeeStore): 员工数据字典列表，或按列存储的员工数据
+                （传入EmployeeStore时直接接管，不复制数据，调用方之后不应再修改它）
         """
-        # 确保每个数据项都有年份和月份字段
-        for item in data_list:
-            if 'year' not in item:
-                item['year'] = self.current_year
-            if 'month' not in item:
-                item['month'] = self.current_month
+        if isinstance(data_list, EmployeeStore):
+            self.batch_mode_data = data_list
+        else:
+            # 缺少年份和月份字段时使用当前年月
+            self.batch_mode_data = EmployeeStore(data_list, self.current_year, self.current_month)
+        self._persist('save_roster', self.batch_mode_data)
+    
+    def update_batch_mode_row(self, index, data):
+        """
+        更新批量模式中的一条数据，其余数据不变
+        
+        参数:
+            index (int): 数据在批量模式数据中的位置
+            data (dict): 员工数据字典
+        """
+        self.update_batch_mode_rows([(index, data)])
+    
+    def update_batch_mode_rows(self, updates):
+        """
+        更新批量模式中的多条数据，打开数据库时在一个事务中写入
+        
+        参数:
+            updates (list): (位置, 员工数据字典) 列表
+        """
+        store = self.batch_mode_data
+        for index, data in updates:
+            store.set_row(index, data, self.current_year, self.current_month)
+        self._persist('save_roster_rows', [(index, store[index]) for index, _ in updates])
+    
+    def upsert_batch_mode_data(self, data):
+        """
+        按(姓名, 年份, 月份)更新批量模式中已有的数据，不存在时添加
         
-        self.batch_mode_data = [item.copy() for item in data_list]
+        参数:
+            data (dict): 员工数据字典
+        
+        返回:
+            tuple: (数据在批量模式数据中的位置, 是否为新增)
+        """
+        row, inserted = self.batch_mode_data.upsert(data, self.current_year, self.current_month)
+        self._persist('save_roster_rows', [(row, self.batch_mode_data[row])])
+        return row, inserted
+    
+    def merge_batch_mode_data(self, data_list, summary=None):
+        """
+        将导入的员工数据合并到批量模式数据中，同一员工同一月份的数据被更新，其余添加到末尾
+        
+        分批合并时不逐批写入数据库，合并完成后调用save_batch_mode_data()一次写入
+        
+        参数:
+            data_list (iterable): 员工数据字典
+            summary (MergeSummary, optional): 统计结果，分批合并时传入同一个对象累计
+        
+        返回:
+            MergeSummary: 新增、更新和重复的统计结果
+        """
+        return self.batch_mode_data.merge(data_list, self.current_year, self.current_month, summary)
     
     def get_batch_mode_data(self):
         """
         获取批量模式数据
         
         返回:
-            list: 员工数据字典列表的副本
+            EmployeeStore: 批量模式数据的只读快照，可按列表方式遍历和索引，
+                每项为只读的员工数据视图；之后的修改不影响快照
+        """
+        return self.batch_mode_data.snapshot()
+    
+    def archive_batch_mode_data(self, employees):
+        """
+        将生成工资表/工资条时的员工数据归档到工资历史，替换这些月份原有的历史
+        
+        编辑表格时的自动保存只更新员工名单，不写入工资历史
+        
+        参数:
+            employees (list): 员工数据字典列表
+        """
+        self._persist('archive', employees)
+    
+    def history_periods(self):
+        """
+        获取有工资历史的月份
+        
+        返回:
+            list: 每月汇总字典列表（见PayrollHistory.rollup()），未打开数据库时为空列表
         """
-        return [item.copy() for item in self.batch_mode_data]
+        if self.storage is None:
+            return []
+        return self.storage.history.periods()
+    
+    def get_period_data(self, year, month):
+        """
+        获取某个月的历史员工数据，用于重新生成以前月份的工资条
+        
+        参数:
+            year (int): 年份
+            month (int): 月份
+        
+        返回:
+            EmployeeStore: 员工数据，未打开数据库或没有数据时为空
+        """
+        if self.storage is None:
+            return EmployeeStore()
+        return self.storage.history.period(year, month)
+    
+    def year_to_date(self, year, month):
+        """
+        获取年度累计（由每月汇总累加）
+        
+        参数:
+            year (int): 年份
+            month (int): 累计到该月（包含）
+        
+        返回:
+            dict: 年度累计，未打开数据库时返回None
+        """
+        if self.storage is None:
+            return None
+        return self.storage.history.year_to_date(year, month)
+    
+    def clear_batch_mode_data(self):
+        """清除批量模式数据"""
+        self.batch_mode_data = EmployeeStore()
+        self._persist('save_roster', self.batch_mode_data)
     
     def set_current_year(self, year):
         """
@@ -120,7 +283,7 @@ class DataManager:
         将单人模式数据转换为批量模式数据
         
         返回:
-            list: 包含单人模式数据的列表
+            EmployeeStore: 批量模式数据的只读快照（见get_batch_mode_data()），已包含单人模式数据
         """
         # 如果单人模式数据中有名字，则添加到批量模式数据中
         if self.single_mode_data.get('name'):
@@ -129,19 +292,9 @@ class DataManager:
                 self.single_mode_data['year'] = self.current_year
             if 'month' not in self.single_mode_data:
                 self.single_mode_data['month'] = self.current_month
-                
-            # 如果批量模式数据为空，直接添加单人数据
-            if not self.batch_mode_data:
-                self.batch_mode_data = [self.single_mode_data.copy()]
-            # 否则，检查是否已有同名数据，如有则更新，没有则添加
-            else:
-                name = self.single_mode_data['name']
-                for i, item in enumerate(self.batch_mode_data):
-                    if item.get('name') == name:
-                        self.batch_mode_data[i] = self.single_mode_data.copy()
-                        return self.get_batch_mode_data()
-                # 没找到同名数据，添加新数据
-                self.batch_mode_data.append(self.single_mode_data.copy())
+            
+            # 已有同一员工同一月份的数据时更新，没有则添加
+            self.upsert_batch_mode_data(self.single_mode_data)
         
         return self.get_batch_mode_data()
     
@@ -159,4 +312,6 @@ class DataManager:
             'late_fine': 0.0,
             'others': 0.0
         }
-        self.batch_mode_data = [] 
\ No newline at end of file
+        self.batch_mode_data = EmployeeStore()
+        self._persist('save_setting', 'single_mode_data', self.single_mode_data)
+        self._persist('save_roster', self.batch_mode_data)
@@ -0,0 +1,51 @@
+"""
+诊断日志模块
+统一配置日志输出，替代各模块中直接print的调试信息
+"""
+
+import os
+import sys
+import logging
+
+
+# 通过环境变量调整日志级别和输出文件，例如 PAYSLIP_LOG_LEVEL=DEBUG
+LOG_LEVEL_ENV = 'PAYSLIP_LOG_LEVEL'
+LOG_FILE_ENV = 'PAYSLIP_LOG_FILE'
+
+LOG_FORMAT = '%(asctime)s %(levelname)s %(name)s: %(message)s'
+
+
+def configure_logging(level=None, log_file=None):
+    """
+    配置应用日志输出
+
+    默认只输出WARNING及以上级别，调试信息在级别未开启时不会被格式化。
+    打包后的窗口程序没有控制台，此时日志写入指定文件，未指定则丢弃。
+
+    参数:
+        level (str/int, optional): 日志级别，默认读取环境变量PAYSLIP_LOG_LEVEL，否则为WARNING
+        log_file (str, optional): 日志文件路径，默认读取环境变量PAYSLIP_LOG_FILE
+    """
+    if level is None:
+        level = os.environ.get(LOG_LEVEL_ENV, 'WARNING')
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+        if not isinstance(level, int):
+            level = logging.WARNING
+
+    if log_file is None:
+        log_file = os.environ.get(LOG_FILE_ENV)
+
+    if log_file:
+        handler = logging.FileHandler(log_file, encoding='utf-8')
+    elif sys.stderr is not None:
+        handler = logging.StreamHandler()
+    else:
+        handler = logging.NullHandler()
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    root_logger = logging.getLogger()
+    for old_handler in list(root_logger.handlers):
+        root_logger.removeHandler(old_handler)
+    root_logger.addHandler(handler)
+    root_logger.setLevel(level)
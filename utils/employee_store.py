@@ -0,0 +1,498 @@
+"""
+员工数据列存储模块
+按列紧凑保存批量模式的员工数据，提供只读视图、写时复制的快照，
+以及按(姓名, 年份, 月份)查找、更新或添加和合并的索引
+"""
+
+import sys
+from array import array
+from math import isfinite
+from collections.abc import Mapping, Sequence
+
+
+# 员工数据字段（与批量模式表格的列顺序相同）
+FIELDS = ('name', 'year', 'month', 'base_salary', 'required_days', 'actual_days',
+          'night_shift', 'high_temp', 'late_fine', 'others',
+          'absence_deduction', 'net_salary', 'signature')
+
+# 文本字段、整数字段和数值字段
+TEXT_FIELDS = ('name', 'signature')
+INT_FIELDS = ('year', 'month')
+NUMBER_FIELDS = tuple(field for field in FIELDS if field not in TEXT_FIELDS + INT_FIELDS)
+
+# 索引键的字段：同一员工同一月份只应有一条数据
+KEY_FIELDS = ('name', 'year', 'month')
+
+# 整数列和数值列的array类型
+INT_TYPECODE = 'l'
+NUMBER_TYPECODE = 'd'
+
+# 整数列能保存的范围，Windows上long为32位
+INT_MAX = 2 ** (8 * array(INT_TYPECODE).itemsize - 1) - 1
+INT_MIN = -INT_MAX - 1
+
+
+class EmployeeView(Mapping):
+    """
+    一名员工数据的只读视图
+    
+    不复制数据，读取时直接访问存储中的列，可以像字典一样使用get()、items()等方法，
+    需要可修改的字典时使用copy()
+    """
+    
+    __slots__ = ('_store', '_row')
+    
+    def __init__(self, store, row):
+        """
+        参数:
+            store (EmployeeStore): 员工数据存储
+            row (int): 行号
+        """
+        self._store = store
+        self._row = row
+    
+    def __getitem__(self, field):
+        return self._store._columns[field][self._row]
+    
+    def __iter__(self):
+        return iter(FIELDS)
+    
+    def __len__(self):
+        return len(FIELDS)
+    
+    def copy(self):
+        """
+        返回:
+            dict: 员工数据字典
+        """
+        return dict(self)
+    
+    def __repr__(self):
+        return f"EmployeeView({dict(self)!r})"
+
+
+class TextColumnView(Sequence):
+    """文本列的只读视图，不复制数据"""
+    
+    __slots__ = ('_values',)
+    
+    def __init__(self, values):
+        self._values = values
+    
+    def __getitem__(self, index):
+        return self._values[index]
+    
+    def __len__(self):
+        return len(self._values)
+    
+    def __iter__(self):
+        return iter(self._values)
+
+
+class MergeSummary:
+    """
+    合并员工数据的统计结果
+    
+    记录新增和更新的人数，以及导入数据中重复出现的(姓名, 年份, 月份)
+    """
+    
+    def __init__(self):
+        """初始化统计结果"""
+        self.inserted = 0
+        self.updated = 0
+        
+        # 导入数据中重复出现的键及出现次数，后出现的数据覆盖先出现的
+        self.duplicates = {}
+        
+        # 已合并的键，用于发现导入数据内部的重复
+        self.keys = set()
+    
+    def format_report(self):
+        """
+        生成可读的摘要文本
+        
+        返回:
+            str: 摘要文本
+        """
+        lines = [f"新增员工：{self.inserted}", f"更新员工：{self.updated}"]
+        for (name, year, month), count in self.duplicates.items():
+            lines.append(f"{name}（{year}年{month}月）在导入数据中出现{count}次，已使用最后一条")
+        return "\n".join(lines)
+
+
+class EmployeeStore(Sequence):
+    """
+    员工数据列存储
+    
+    姓名和签字按列保存为字符串列表（姓名经过驻留，同名员工共用一个字符串），
+    年份和月份保存为array('l')，金额和天数保存为array('d')，
+    每名员工约占150字节，约为每人一个字典的五分之一。
+    
+    按序号访问返回只读视图EmployeeView；snapshot()不复制数据，
+    与快照共享列的存储在下一次修改前才复制各列（写时复制）。
+    
+    (姓名, 年份, 月份)到行号的索引在第一次查找时建立，之后随修改同步更新，
+    查找、更新或添加都不需要扫描全部数据；同一个键对应多行时记录在重复行中
+    """
+    
+    def __init__(self, employees=(), year=0, month=1):
+        """
+        参数:
+            employees (iterable, optional): 员工数据字典
+            year (int, optional): 缺少年份时使用的默认值
+            month (int, optional): 缺少月份时使用的默认值
+        """
+        self._columns = _empty_columns()
+        # 列是否与快照或导出的列视图共享，共享时修改前需要先复制
+        self._shared = False
+        
+        # 键到第一次出现的行号的索引，以及键到其余重复行号的映射，未建立时为None
+        self._index = None
+        self._duplicates = None
+        for employee in employees:
+            self._append_row(employee, year, month)
+    
+    @classmethod
+    def from_columns(cls, columns):
+        """
+        直接使用已按列整理好的数据创建存储，不逐行转换
+        
+        参数:
+            columns (dict): 字段名到列数据的映射，文本列为字符串列表，
+                整数列和数值列为对应类型的array，各列由存储接管，调用方不应再修改
+        
+        返回:
+            EmployeeStore: 员工数据存储
+        """
+        store = cls()
+        lengths = {len(columns[field]) for field in FIELDS}
+        if len(lengths) > 1:
+            raise ValueError("各列的行数不一致")
+        
+        for field in FIELDS:
+            values = columns[field]
+            if field in TEXT_FIELDS:
+                values = [sys.intern(value) for value in values] if field == 'name' else list(values)
+            else:
+                typecode = INT_TYPECODE if field in INT_FIELDS else NUMBER_TYPECODE
+                if not isinstance(values, array) or values.typecode != typecode:
+                    values = array(typecode, values)
+            store._columns[field] = values
+        return store
+    
+    def __len__(self):
+        return len(self._columns['name'])
+    
+    def __getitem__(self, row):
+        """
+        参数:
+            row (int): 行号，支持负数
+        
+        返回:
+            EmployeeView: 该行员工数据的只读视图
+        """
+        return EmployeeView(self, self._check_row(row))
+    
+    def __iter__(self):
+        for row in range(len(self)):
+            yield EmployeeView(self, row)
+    
+    def column(self, field):
+        """
+        获取一列数据的只读视图，不复制数据
+        
+        数值列返回只读memoryview，可用array.frombytes(view.cast('B'))整列复制；
+        文本列返回TextColumnView。视图在存储之后被修改时保持不变
+        
+        参数:
+            field (str): 字段名
+        
+        返回:
+            memoryview/TextColumnView: 列的只读视图
+        """
+        # 导出视图后存储不再原地修改这些列
+        self._shared = True
+        values = self._columns[field]
+        if field in TEXT_FIELDS:
+            return TextColumnView(values)
+        return memoryview(values).toreadonly()
+    
+    def find(self, name, year, month):
+        """
+        查找员工
+        
+        参数:
+            name (str): 员工姓名
+            year (int): 年份
+            month (int): 月份
+        
+        返回:
+            int: 第一条匹配数据的行号，不存在时返回-1
+        """
+        self._build_index()
+        return self._index.get((name, year, month), -1)
+    
+    def duplicates(self):
+        """
+        获取重复的数据，直接读取索引，不扫描全部数据
+        
+        返回:
+            dict: (姓名, 年份, 月份)到行号列表的映射，只包含对应多行的键
+        """
+        self._build_index()
+        return {key: sorted([self._index[key]] + rows) for key, rows in self._duplicates.items()}
+    
+    def snapshot(self):
+        """
+        创建当前数据的快照，不复制数据
+        
+        返回:
+            EmployeeStore: 快照，之后对原存储的修改不影响快照
+        """
+        snapshot = EmployeeStore()
+        snapshot._columns = dict(self._columns)
+        snapshot._index = self._index
+        snapshot._duplicates = self._duplicates
+        snapshot._shared = True
+        self._shared = True
+        return snapshot
+    
+    def set_row(self, row, employee, year=0, month=1):
+        """
+        更新一名员工的数据
+        
+        参数:
+            row (int): 行号
+            employee (dict): 员工数据字典，缺少的字段使用默认值
+            year (int, optional): 缺少年份时使用的默认值
+            month (int, optional): 缺少月份时使用的默认值
+        """
+        row = self._check_row(row)
+        self._own()
+        self._set_values(row, _row_values(employee, year, month))
+    
+    def append(self, employee, year=0, month=1):
+        """
+        在末尾添加一名员工
+        
+        参数:
+            employee (dict): 员工数据字典，缺少的字段使用默认值
+            year (int, optional): 缺少年份时使用的默认值
+            month (int, optional): 缺少月份时使用的默认值
+        """
+        self._own()
+        self._append_row(employee, year, month)
+    
+    def upsert(self, employee, year=0, month=1):
+        """
+        按(姓名, 年份, 月份)更新已有的员工数据，不存在时添加到末尾
+        
+        参数:
+            employee (dict): 员工数据字典，缺少的字段使用默认值
+            year (int, optional): 缺少年份时使用的默认值
+            month (int, optional): 缺少月份时使用的默认值
+        
+        返回:
+            tuple: (行号, 是否为新增)
+        """
+        values = _row_values(employee, year, month)
+        row = self.find(*_key(values))
+        self._own()
+        if row >= 0:
+            self._set_values(row, values)
+            return row, False
+        
+        self._append_values(values)
+        return len(self) - 1, True
+    
+    def merge(self, employees, year=0, month=1, summary=None):
+        """
+        将导入的员工数据合并到现有数据中，同一员工同一月份的数据被更新，其余添加到末尾
+        
+        参数:
+            employees (iterable): 员工数据字典
+            year (int, optional): 缺少年份时使用的默认值
+            month (int, optional): 缺少月份时使用的默认值
+            summary (MergeSummary, optional): 统计结果，分批合并时可传入同一个对象累计
+        
+        返回:
+            MergeSummary: 统计结果
+        """
+        if summary is None:
+            summary = MergeSummary()
+        
+        for employee in employees:
+            values = _row_values(employee, year, month)
+            key = _key(values)
+            row = self.find(*key)
+            if key in summary.keys:
+                summary.duplicates[key] = summary.duplicates.get(key, 1) + 1
+            elif row < 0:
+                summary.inserted += 1
+            else:
+                summary.updated += 1
+            summary.keys.add(key)
+            
+            self._own()
+            if row < 0:
+                self._append_values(values)
+            else:
+                self._set_values(row, values)
+        return summary
+    
+    def rows(self):
+        """
+        返回:
+            list: 按FIELDS顺序排列的各行数据元组
+        """
+        return list(zip(*(self._columns[field] for field in FIELDS)))
+    
+    def to_dicts(self):
+        """
+        返回:
+            list: 员工数据字典列表（可修改的副本）
+        """
+        return [dict(zip(FIELDS, values)) for values in self.rows()]
+    
+    def _check_row(self, row):
+        """检查行号，负数转换为对应的正数行号"""
+        count = len(self)
+        if row < 0:
+            row += count
+        if not 0 <= row < count:
+            raise IndexError("员工序号超出范围")
+        return row
+    
+    def _own(self):
+        """列与其他对象共享时先复制各列和索引，之后可以原地修改"""
+        if self._shared:
+            self._columns = {field: values[:] for field, values in self._columns.items()}
+            if self._index is not None:
+                self._index = dict(self._index)
+                self._duplicates = {key: rows[:] for key, rows in self._duplicates.items()}
+            self._shared = False
+    
+    def _append_row(self, employee, year, month):
+        """追加一行，调用前需确保列没有共享"""
+        self._append_values(_row_values(employee, year, month))
+    
+    def _append_values(self, values):
+        """追加一行已转换的数据并更新索引，调用前需确保列没有共享"""
+        row = len(self)
+        for field, value in zip(FIELDS, values):
+            self._columns[field].append(value)
+        if self._index is not None:
+            self._index_add(_key(values), row)
+    
+    def _set_values(self, row, values):
+        """用已转换的数据覆盖一行并更新索引，调用前需确保列没有共享"""
+        if self._index is not None:
+            old_key = tuple(self._columns[field][row] for field in KEY_FIELDS)
+            new_key = _key(values)
+            if old_key != new_key:
+                self._index_remove(old_key, row)
+                self._index_add(new_key, row)
+        for field, value in zip(FIELDS, values):
+            self._columns[field][row] = value
+    
+    def _build_index(self):
+        """第一次查找时建立索引"""
+        if self._index is not None:
+            return
+        index = {}
+        duplicates = {}
+        keys = zip(*(self._columns[field] for field in KEY_FIELDS))
+        for row, key in enumerate(keys):
+            first = index.setdefault(key, row)
+            if first != row:
+                duplicates.setdefault(key, []).append(row)
+        self._index = index
+        self._duplicates = duplicates
+    
+    def _index_add(self, key, row):
+        """在索引中记录一行"""
+        first = self._index.setdefault(key, row)
+        if first == row:
+            return
+        if row < first:
+            # 索引始终指向行号最小的一行
+            self._index[key] = row
+            row = first
+        self._duplicates.setdefault(key, []).append(row)
+    
+    def _index_remove(self, key, row):
+        """从索引中移除一行"""
+        rows = self._duplicates.get(key)
+        if self._index[key] == row:
+            if not rows:
+                del self._index[key]
+                return
+            row = min(rows)
+            self._index[key] = row
+        rows.remove(row)
+        if not rows:
+            del self._duplicates[key]
+
+
+def _empty_columns():
+    """创建空的各列"""
+    columns = {}
+    for field in FIELDS:
+        if field in TEXT_FIELDS:
+            columns[field] = []
+        elif field in INT_FIELDS:
+            columns[field] = array(INT_TYPECODE)
+        else:
+            columns[field] = array(NUMBER_TYPECODE)
+    return columns
+
+
+def _key(values):
+    """从按FIELDS顺序排列的一行数据中取出索引键"""
+    return values[0], values[1], values[2]
+
+
+def _row_values(employee, year, month):
+    """将员工数据字典转换为各列的存储类型，按FIELDS的顺序返回"""
+    get = employee.get
+    name = get('name')
+    values = [sys.intern("" if name is None else str(name)),
+              _to_int(get('year'), year), _to_int(get('month'), month)]
+    for field in NUMBER_FIELDS:
+        value = get(field)
+        # 已经是有限浮点数时直接使用
+        values.append(value if type(value) is float and isfinite(value) else _to_float(value))
+    signature = get('signature')
+    values.append("" if signature is None else str(signature))
+    return values
+
+
+def _to_int(value, default):
+    """转换为整数，无法识别或超出array('l')的范围时使用默认值"""
+    if value is None:
+        return default
+    if type(value) is int:
+        # 整数直接比较范围，转换为浮点数会丢失精度
+        number = value
+    else:
+        try:
+            number = float(value)
+        except (TypeError, ValueError, OverflowError):
+            return default
+        if not isfinite(number) or number != int(number):
+            return default
+        number = int(number)
+    if not INT_MIN <= number <= INT_MAX:
+        return default
+    return number
+
+
+def _to_float(value):
+    """转换为浮点数，无法识别时为0"""
+    if value is None:
+        return 0.0
+    try:
+        number = float(value)
+    except (TypeError, ValueError, OverflowError):
+        return 0.0
+    return number if isfinite(number) else 0.0
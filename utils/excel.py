@@ -4,9 +4,72 @@ Excel工资条生成模块
 """
 
 import os
+import re
+import csv
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from copy import copy
 from datetime import datetime
+from io import BytesIO, StringIO
+from itertools import chain
+from math import isfinite
+from xml.sax.saxutils import escape, quoteattr
+from zipfile import ZipFile, ZIP_DEFLATED, ZIP_STORED
 from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.styles import Font, Alignment, Border, Side, PatternFill, NamedStyle
+from core.calculator import to_cents, from_cents
+from utils import perf
+
+
+# 所有单元格共有的边框和对齐方式
+THIN_BORDER = Border(
+    left=Side(style='thin'), 
+    right=Side(style='thin'), 
+    top=Side(style='thin'), 
+    bottom=Side(style='thin')
+)
+CENTER_ALIGNMENT = Alignment(horizontal='center', vertical='center')
+
+# 预先构建的命名样式：样式类型 -> NamedStyle
+# 每个工作簿只注册一次，单元格按名称引用，不再为每个单元格新建样式对象
+CELL_STYLES = {
+    'header': NamedStyle(
+        name='工资条_表头',
+        font=Font(bold=True, size=12),
+        fill=PatternFill(start_color="DDDDDD", end_color="DDDDDD", fill_type="solid"),
+        border=THIN_BORDER,
+        alignment=CENTER_ALIGNMENT
+    ),
+    'normal': NamedStyle(
+        name='工资条_数据',
+        font=Font(size=11),
+        border=THIN_BORDER,
+        alignment=CENTER_ALIGNMENT
+    ),
+    'deduction': NamedStyle(
+        name='工资条_扣款',
+        font=Font(size=11, color="FF0000"),  # 红色字体表示扣款
+        border=THIN_BORDER,
+        alignment=CENTER_ALIGNMENT
+    ),
+    'total': NamedStyle(
+        name='工资条_合计',
+        font=Font(bold=True, size=12),
+        fill=PatternFill(start_color="E6F2FF", end_color="E6F2FF", fill_type="solid"),
+        border=THIN_BORDER,
+        alignment=CENTER_ALIGNMENT
+    ),
+}
+
+# 个人工资条表头
+PAYSLIP_HEADERS = ["姓名", "年份", "月份", "基本工资", "应出勤天数", "实际出勤天数", 
+                   "夜班补助", "高温补贴", "迟到罚款", "其他", "缺勤扣款", "实发工资", "签字"]
+
+# 工资条数据行各列的样式类型（第11列缺勤扣款、第12列实发工资单独设置）
+DATA_ROW_STYLES = ['normal'] * 10 + ['deduction', 'total', 'normal']
 
 
 def generate_excel(employee_data, output_path=None):
@@ -29,55 +92,13 @@ def generate_excel(employee_data, output_path=None):
     year = employee_data.get('year', datetime.now().year)
     month = employee_data.get('month', datetime.now().month)
     
-    # 设置列宽
-    for col in ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K', 'L', 'M']:
-        ws.column_dimensions[col].width = 15
-    
-    # 添加表头（直接从第1行开始）
-    row = 1
-    ws.cell(row=row, column=1).value = "姓名"
-    ws.cell(row=row, column=2).value = "年份"
-    ws.cell(row=row, column=3).value = "月份"
-    ws.cell(row=row, column=4).value = "基本工资"
-    ws.cell(row=row, column=5).value = "应出勤天数"
-    ws.cell(row=row, column=6).value = "实际出勤天数"
-    ws.cell(row=row, column=7).value = "夜班补助"
-    ws.cell(row=row, column=8).value = "高温补贴"
-    ws.cell(row=row, column=9).value = "迟到罚款"
-    ws.cell(row=row, column=10).value = "其他"
-    ws.cell(row=row, column=11).value = "缺勤扣款"
-    ws.cell(row=row, column=12).value = "实发工资"
-    ws.cell(row=row, column=13).value = "签字"
-    
-    # 设置标题样式
-    for col in range(1, 14):
-        cell = ws.cell(row=row, column=col)
-        set_cell_style(cell, 'header')
+    # 设置列宽、表头和样式
+    _setup_payslip_sheet(wb, ws)
     
     # 添加数据（从第2行开始）
-    row = 2
-    ws.cell(row=row, column=1).value = employee_data.get('name', '')
-    ws.cell(row=row, column=2).value = year
-    ws.cell(row=row, column=3).value = month
-    ws.cell(row=row, column=4).value = employee_data.get('base_salary', 0)
-    ws.cell(row=row, column=5).value = employee_data.get('required_days', 0)
-    ws.cell(row=row, column=6).value = employee_data.get('actual_days', 0)
-    ws.cell(row=row, column=7).value = employee_data.get('night_shift', 0)
-    ws.cell(row=row, column=8).value = employee_data.get('high_temp', 0)
-    ws.cell(row=row, column=9).value = employee_data.get('late_fine', 0)
-    ws.cell(row=row, column=10).value = employee_data.get('others', 0)
-    ws.cell(row=row, column=11).value = employee_data.get('absence_deduction', 0)
-    ws.cell(row=row, column=12).value = employee_data.get('net_salary', 0)
-    ws.cell(row=row, column=13).value = employee_data.get('signature', '')
-    
-    # 设置数据样式
-    for col in range(1, 14):
-        cell = ws.cell(row=row, column=col)
-        set_cell_style(cell, 'normal')
-    
-    # 设置特殊单元格样式
-    set_cell_style(ws.cell(row=row, column=11), 'deduction')
-    set_cell_style(ws.cell(row=row, column=12), 'total')
+    values = _payslip_values(employee_data, year, month)
+    for col, value in enumerate(values, 1):
+        ws.cell(row=2, column=col).value = value
     
     # 确定保存路径
     if not output_path:
@@ -92,16 +113,256 @@ def generate_excel(employee_data, output_path=None):
     return output_path
 
 
-def batch_generate_excel(employees, output_dir=None):
+def _setup_payslip_sheet(wb, ws):
+    """设置个人工资条的列宽、表头（第1行）以及数据行（第2行）样式"""
+    # 设置列宽
+    for col in ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K', 'L', 'M']:
+        ws.column_dimensions[col].width = 15
+    
+    # 添加表头并设置标题样式（直接从第1行开始）
+    register_styles(wb)
+    for col, header in enumerate(PAYSLIP_HEADERS, 1):
+        cell = ws.cell(row=1, column=col)
+        cell.value = header
+        set_cell_style(cell, 'header')
+    
+    # 设置数据样式（缺勤扣款和实发工资使用特殊样式）
+    for col, style_type in enumerate(DATA_ROW_STYLES, 1):
+        set_cell_style(ws.cell(row=2, column=col), style_type)
+
+
+def _payslip_values(employee_data, year, month):
+    """按工资条列顺序取出员工数据"""
+    return [
+        employee_data.get('name', ''),
+        year,
+        month,
+        employee_data.get('base_salary', 0),
+        employee_data.get('required_days', 0),
+        employee_data.get('actual_days', 0),
+        employee_data.get('night_shift', 0),
+        employee_data.get('high_temp', 0),
+        employee_data.get('late_fine', 0),
+        employee_data.get('others', 0),
+        employee_data.get('absence_deduction', 0),
+        employee_data.get('net_salary', 0),
+        employee_data.get('signature', '')
+    ]
+
+
+class PayslipTemplate:
+    """
+    个人工资条模板
+    
+    每批只用openpyxl生成一次带列宽、表头和样式的工资条文件，
+    之后每位员工只替换工作表XML中的第2行数据，其余文件内容原样复用
+    """
+    
+    # 模板中的工作表文件
+    SHEET_NAME = 'xl/worksheets/sheet1.xml'
+    
+    def __init__(self):
+        """生成模板文件并拆分出第2行前后的工作表XML"""
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "工资条"
+        _setup_payslip_sheet(wb, ws)
+        
+        buffer = BytesIO()
+        wb.save(buffer)
+        
+        # 除工作表外的文件内容都不变，预先压缩并计算校验值，每位员工直接复用
+        # 每项为 (文件名, 压缩方式, CRC, 压缩后内容, 原始大小)，工作表只有前两项；使用元组以便传给工作进程
+        self._entries = []
+        # 未压缩的原始文件内容，合并为多工作表工作簿时使用
+        self._files = {}
+        sheet_xml = None
+        with ZipFile(buffer) as archive:
+            for info in archive.infolist():
+                data = archive.read(info)
+                self._files[info.filename] = data
+                if info.filename == self.SHEET_NAME:
+                    sheet_xml = data.decode('utf-8')
+                    entry = (info.filename, info.compress_type)
+                else:
+                    entry = (info.filename, info.compress_type) + _compress_entry(data, info.compress_type)
+                self._entries.append(entry)
+        
+        match = re.search(r'(<row r="2"[^>]*>)(.*?)</row>', sheet_xml, re.S)
+        self._sheet_prefix = sheet_xml[:match.start()] + match.group(1)
+        self._sheet_suffix = '</row>' + sheet_xml[match.end():]
+        
+        # 第2行各单元格的坐标和样式编号
+        self._cells = re.findall(r'<c r="([A-Z]+2)" s="(\d+)"', match.group(2))
+        
+        # 压缩包内所有文件使用模板生成时的时间
+        date_time = datetime.now()
+        self._dos_time = (date_time.hour << 11) | (date_time.minute << 5) | (date_time.second // 2)
+        self._dos_date = ((date_time.year - 1980) << 9) | (date_time.month << 5) | date_time.day
+    
+    def render_sheet(self, employee_data):
+        """
+        生成员工工资条的工作表XML
+        
+        参数:
+            employee_data (dict): 员工工资数据
+        
+        返回:
+            bytes: 工作表XML；数据中含有模板无法直接写入的值时返回None
+        """
+        year = employee_data.get('year', datetime.now().year)
+        month = employee_data.get('month', datetime.now().month)
+        values = _payslip_values(employee_data, year, month)
+        
+        cells = []
+        for (coordinate, style_id), value in zip(self._cells, values):
+            cell_xml = _cell_xml(coordinate, style_id, value)
+            if cell_xml is None:
+                return None
+            cells.append(cell_xml)
+        return (self._sheet_prefix + ''.join(cells) + self._sheet_suffix).encode('utf-8')
+    
+    def render(self, employee_data):
+        """
+        生成员工工资条文件内容
+        
+        参数:
+            employee_data (dict): 员工工资数据
+        
+        返回:
+            bytes: xlsx文件内容；数据中含有模板无法直接写入的值时返回None
+        """
+        sheet_xml = self.render_sheet(employee_data)
+        if sheet_xml is None:
+            return None
+        
+        # 直接拼接zip结构：本地文件头+内容，最后是中央目录
+        parts = []
+        central_directory = []
+        offset = 0
+        for entry in self._entries:
+            name, compress_type = entry[0], entry[1]
+            if len(entry) == 2:
+                crc, data, size = _compress_entry(sheet_xml, compress_type)
+            else:
+                crc, data, size = entry[2:]
+            name_bytes = name.encode('utf-8')
+            
+            header = struct.pack('<4s2B4HL2L2H', b'PK\x03\x04', 20, 0, 0, compress_type,
+                                 self._dos_time, self._dos_date, crc, len(data), size,
+                                 len(name_bytes), 0)
+            central_directory.append(
+                struct.pack('<4s4B4HL2L5H2L', b'PK\x01\x02', 20, 0, 20, 0, 0, compress_type,
+                            self._dos_time, self._dos_date, crc, len(data), size,
+                            len(name_bytes), 0, 0, 0, 0, 0o600 << 16, offset) + name_bytes)
+            parts.append(header)
+            parts.append(name_bytes)
+            parts.append(data)
+            offset += len(header) + len(name_bytes) + len(data)
+        
+        central_directory = b''.join(central_directory)
+        parts.append(central_directory)
+        parts.append(struct.pack('<4s4H2LH', b'PK\x05\x06', 0, 0, len(self._entries),
+                                 len(self._entries), len(central_directory), offset, 0))
+        return b''.join(parts)
+    
+    def save(self, employee_data, output_path):
+        """
+        生成员工工资条文件并保存
+        
+        参数:
+            employee_data (dict): 员工工资数据
+            output_path (str): 输出文件路径
+        
+        返回:
+            str: 生成的Excel文件路径
+        """
+        content = self.render(employee_data)
+        if content is None:
+            # 特殊的值交给openpyxl处理
+            return generate_excel(employee_data, output_path)
+        with open(output_path, 'wb') as f:
+            f.write(content)
+        return output_path
+
+
+def _compress_entry(data, compress_type):
+    """
+    压缩压缩包中的一个文件
+    
+    返回:
+        tuple: (CRC, 压缩后内容, 原始大小)
+    """
+    if compress_type == ZIP_DEFLATED:
+        compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+        compressed = compressor.compress(data) + compressor.flush()
+    else:
+        compressed = data
+    return zlib.crc32(data), compressed, len(data)
+
+
+def _cell_xml(coordinate, style_id, value):
+    """
+    按openpyxl的写法生成单元格XML，不支持的值返回None
+    """
+    if value is None:
+        return f'<c r="{coordinate}" s="{style_id}" t="n"/>'
+    
+    value_type = type(value)
+    if value_type is str:
+        if not value:
+            return f'<c r="{coordinate}" s="{style_id}" t="inlineStr" />'
+        if len(value) > 32767 or ILLEGAL_CHARACTERS_RE.search(value):
+            return None
+        stripped = value.strip()
+        space = ' xml:space="preserve"' if stripped and stripped != value else ''
+        return (f'<c r="{coordinate}" s="{style_id}" t="inlineStr">'
+                f'<is><t{space}>{escape(value)}</t></is></c>')
+    
+    if value_type is int or (value_type is float and isfinite(value)):
+        return f'<c r="{coordinate}" s="{style_id}" t="n"><v>{"%.16g" % value}</v></c>'
+    
+    return None
+
+
+class BatchGenerateError(Exception):
+    """批量生成工资条时部分员工失败"""
+    
+    def __init__(self, failures, file_paths):
+        """
+        参数:
+            failures (list): 失败列表，每项为 (员工序号, 姓名, 错误信息)
+            file_paths (list): 成功生成的Excel文件路径列表
+        """
+        self.failures = failures
+        self.file_paths = file_paths
+        details = "；".join(f"{name}：{message}" for _, name, message in failures[:5])
+        if len(failures) > 5:
+            details += "……"
+        super().__init__(f"{len(failures)}名员工的工资条生成失败（{details}）")
+
+
+def batch_generate_excel(employees, output_dir=None, workers=1, chunk_size=50,
+                         progress_callback=None, use_template=True):
     """
     批量生成工资条Excel文件
     
+    单个员工生成失败不会中断其他员工，全部处理完后统一报告失败
+    
     参数:
         employees (list): 员工数据字典列表
         output_dir (str, optional): 输出目录，默认为桌面
+        workers (int, optional): 并行进程数，默认为1（在当前进程中生成），0表示使用全部CPU核心
+        chunk_size (int, optional): 每个任务包含的员工数量
+        progress_callback (callable, optional): 进度回调，参数为 (已完成数量, 总数量)，
+            回调抛出异常时停止生成
+        use_template (bool, optional): 是否使用预先生成的模板，只替换每位员工的数据行
     
     返回:
-        list: 生成的Excel文件路径列表
+        list: 生成的Excel文件路径列表，顺序与输入一致
+    
+    异常:
+        BatchGenerateError: 有员工生成失败时抛出，其中包含失败明细和成功生成的文件路径
     """
     if output_dir is None:
         # 默认保存到桌面
@@ -113,39 +374,359 @@ def batch_generate_excel(employees, output_dir=None):
     # 时间戳（用于生成文件名）
     timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
     
-    # 生成的文件路径列表
-    file_paths = []
-    
-    # 为每位员工生成工资条
-    for employee in employees:
+    # 为每位员工确定输出文件路径
+    tasks = []
+    for index, employee in enumerate(employees):
         # 获取年份和月份
         year = employee.get('year', datetime.now().year)
         month = employee.get('month', datetime.now().month)
         
         # 生成文件名
         filename = f"{year}年{month}月_工资条_{employee.get('name', 'unknown')}_{timestamp}.xlsx"
-        output_path = os.path.join(output_dir, filename)
-        
-        # 调用单个生成函数
-        generate_excel(employee, output_path)
-        file_paths.append(output_path)
+        tasks.append((index, employee, os.path.join(output_dir, filename)))
+    
+    chunks = [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+    
+    # 每批只生成一次模板，随任务一起分发到工作进程
+    with perf.span('excel.payslips.template'):
+        template = PayslipTemplate() if use_template and tasks else None
+    total = len(tasks)
+    done = 0
+    results = []
+    
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    
+    if workers <= 1 or len(chunks) <= 1:
+        # 在当前进程中逐批生成
+        for chunk in chunks:
+            results.extend(_generate_chunk(chunk, template))
+            done += len(chunk)
+            if progress_callback:
+                progress_callback(done, total)
+    else:
+        # 按批分发到多个进程并行生成
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+            futures = {executor.submit(_generate_chunk, chunk, template): chunk for chunk in chunks}
+            try:
+                for future in as_completed(futures):
+                    chunk = futures[future]
+                    try:
+                        results.extend(future.result())
+                    except Exception as e:
+                        # 工作进程异常退出，整批记为失败
+                        results.extend((index, None, str(e)) for index, _, _ in chunk)
+                    done += len(chunk)
+                    if progress_callback:
+                        progress_callback(done, total)
+            except BaseException:
+                # 进度回调抛出异常（如用户取消）时，尚未开始的批次不再执行
+                for future in futures:
+                    future.cancel()
+                raise
+    
+    # 按输入顺序整理结果
+    results.sort(key=lambda result: result[0])
+    file_paths = [path for _, path, error in results if error is None]
+    failures = [(index, tasks[index][1].get('name', 'unknown'), error)
+                for index, _, error in results if error is not None]
+    
+    perf.count('excel.payslips.files', len(file_paths))
+    perf.count('excel.payslips.failures', len(failures))
+    if failures:
+        raise BatchGenerateError(failures, file_paths)
     
     return file_paths
 
 
+def _generate_chunk(tasks, template=None):
+    """
+    生成一批工资条（在工作进程中执行）
+    
+    参数:
+        tasks (list): 任务列表，每项为 (员工序号, 员工数据, 输出路径)
+        template (PayslipTemplate, optional): 工资条模板，为None时逐个用openpyxl生成
+    
+    返回:
+        list: 结果列表，每项为 (员工序号, 输出路径, 错误信息)，成功时错误信息为None
+    """
+    results = []
+    for index, employee, output_path in tasks:
+        try:
+            with perf.span('excel.payslips.save'):
+                if template is not None:
+                    template.save(employee, output_path)
+                else:
+                    generate_excel(employee, output_path)
+            results.append((index, output_path, None))
+        except Exception as e:
+            results.append((index, None, str(e)))
+    return results
+
+
+# 单文件输出时附带的索引
+MANIFEST_NAME = '索引.csv'
+MANIFEST_SHEET_TITLE = '索引'
+MANIFEST_HEADERS = ['序号', '姓名', '年份', '月份', '实发工资', '文件']
+
+# 文件名和工作表名称中不允许出现的字符
+INVALID_FILENAME_RE = re.compile(r'[\\/:*?"<>|]')
+INVALID_TITLE_RE = re.compile(r'[\\/*?:\[\]]')
+
+
+def generate_payslip_archive(employees, output_path=None, as_workbook=False, progress_callback=None):
+    """
+    将全部个人工资条写入同一个文件
+    
+    默认生成zip压缩包，每位员工一个xlsx文件；as_workbook为True时生成一个工作簿，每位员工一个工作表。
+    工资条逐个生成后直接写入目标文件，不在磁盘上产生单独的工资条文件，
+    并附带索引（zip中为索引.csv，工作簿中为第一个工作表），列出每位员工的姓名、月份和实发工资
+    
+    参数:
+        employees (list): 员工数据字典列表
+        output_path (str, optional): 输出文件路径，默认为桌面
+        as_workbook (bool, optional): 是否生成多工作表的工作簿
+        progress_callback (callable, optional): 进度回调，参数为 (已完成数量, 总数量)，
+            回调抛出异常时停止生成并删除未完成的文件
+    
+    返回:
+        str: 生成的文件路径
+    
+    异常:
+        BatchGenerateError: 有员工生成失败时抛出，其余员工的工资条仍会写入文件
+    """
+    if not output_path:
+        # 默认保存到桌面
+        desktop = os.path.join(os.path.expanduser('~'), 'Desktop')
+        timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
+        extension = 'xlsx' if as_workbook else 'zip'
+        output_path = os.path.join(desktop, f"工资条_{timestamp}.{extension}")
+    
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    
+    with perf.span('excel.archive.template'):
+        template = PayslipTemplate()
+    try:
+        with perf.span('excel.archive.write'):
+            if as_workbook:
+                failures = _write_payslip_workbook(template, employees, output_path, progress_callback)
+            else:
+                failures = _write_payslip_zip(template, employees, output_path, progress_callback)
+    except BaseException:
+        # 中途出错或被取消时不留下不完整的文件
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        raise
+    
+    perf.count('excel.archive.employees', len(employees))
+    perf.count('excel.archive.failures', len(failures))
+    if failures:
+        raise BatchGenerateError(failures, [output_path])
+    
+    return output_path
+
+
+def _manifest_entry(index, employee):
+    """取出索引中的员工信息：(序号, 姓名, 年份, 月份, 实发工资)"""
+    return (
+        index + 1,
+        employee.get('name', 'unknown'),
+        employee.get('year', datetime.now().year),
+        employee.get('month', datetime.now().month),
+        employee.get('net_salary', 0)
+    )
+
+
+def _write_payslip_zip(template, employees, output_path, progress_callback=None):
+    """
+    将工资条逐个写入zip压缩包
+    
+    返回:
+        list: 失败列表，每项为 (员工序号, 姓名, 错误信息)
+    """
+    total = len(employees)
+    manifest = []
+    failures = []
+    
+    # xlsx本身已经压缩，压缩包中直接存储
+    with ZipFile(output_path, 'w', ZIP_STORED) as archive:
+        for index, employee in enumerate(employees):
+            number, name, year, month, net_salary = _manifest_entry(index, employee)
+            filename = f"{number:04d}_{year}年{month}月_工资条_{INVALID_FILENAME_RE.sub('_', str(name))}.xlsx"
+            try:
+                content = template.render(employee)
+                if content is None:
+                    # 特殊的值交给openpyxl处理
+                    buffer = BytesIO()
+                    generate_excel(employee, buffer)
+                    content = buffer.getvalue()
+                archive.writestr(filename, content)
+                manifest.append((number, name, year, month, net_salary, filename))
+            except Exception as e:
+                failures.append((index, name, str(e)))
+            
+            if progress_callback:
+                progress_callback(index + 1, total)
+        
+        # 索引使用带BOM的UTF-8，Excel可直接打开
+        buffer = StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(MANIFEST_HEADERS)
+        writer.writerows(manifest)
+        archive.writestr(MANIFEST_NAME, buffer.getvalue().encode('utf-8-sig'))
+    
+    return failures
+
+
+def _write_payslip_workbook(template, employees, output_path, progress_callback=None):
+    """
+    将工资条逐个作为工作表写入同一个工作簿
+    
+    每位员工的工作表直接使用模板的工作表XML（模板无法直接写入的值改用openpyxl生成该工作表），
+    样式、主题等文件所有工作表共用；工作簿目录、关系和内容类型文件在全部工作表写完后按实际数量生成
+    
+    返回:
+        list: 失败列表，每项为 (员工序号, 姓名, 错误信息)
+    """
+    total = len(employees)
+    manifest = []
+    failures = []
+    
+    # 第1个工作表为索引，员工工作表从sheet2开始
+    sheet_titles = [MANIFEST_SHEET_TITLE]
+    
+    with ZipFile(output_path, 'w', ZIP_DEFLATED) as archive:
+        for filename, data in template._files.items():
+            if filename not in (template.SHEET_NAME, 'xl/workbook.xml',
+                                'xl/_rels/workbook.xml.rels', '[Content_Types].xml'):
+                archive.writestr(filename, data)
+        
+        for index, employee in enumerate(employees):
+            number, name, year, month, net_salary = _manifest_entry(index, employee)
+            # 工作表名称最长31个字符，以序号开头保证不重复
+            title = f"{number}_{INVALID_TITLE_RE.sub('_', str(name))}"[:31].rstrip("'")
+            try:
+                sheet_xml = template.render_sheet(employee)
+                if sheet_xml is None:
+                    # 特殊的值交给openpyxl处理
+                    sheet_xml = _openpyxl_sheet_xml(template, employee)
+                sheet_titles.append(title)
+                archive.writestr(f'xl/worksheets/sheet{len(sheet_titles)}.xml', sheet_xml)
+                manifest.append((number, name, year, month, net_salary, title))
+            except Exception as e:
+                failures.append((index, name, str(e)))
+            
+            if progress_callback:
+                progress_callback(index + 1, total)
+        
+        archive.writestr(template.SHEET_NAME, _manifest_sheet_xml(template, manifest))
+        for filename, data in _workbook_parts(template, sheet_titles).items():
+            archive.writestr(filename, data)
+    
+    return failures
+
+
+def _openpyxl_sheet_xml(template, employee):
+    """
+    用openpyxl生成员工工资条的工作表XML，用于模板无法直接写入的值
+    
+    生成的文件除工作表外与模板相同时，工作表才能与模板生成的工作表放入同一个工作簿
+    
+    返回:
+        bytes: 工作表XML
+    """
+    buffer = BytesIO()
+    generate_excel(employee, buffer)
+    with ZipFile(buffer) as archive:
+        names = archive.namelist()
+        if set(names) != set(template._files) or archive.read('xl/styles.xml') != template._files['xl/styles.xml']:
+            raise ValueError("openpyxl生成的工资条与模板的结构不同，无法写入同一工作簿")
+        return archive.read(template.SHEET_NAME)
+
+
+def _manifest_sheet_xml(template, manifest):
+    """生成索引工作表XML，表头和数据沿用工资条的样式"""
+    header_style = re.search(r'<c r="A1" s="(\d+)"', template._sheet_prefix).group(1)
+    normal_style = template._cells[0][1]
+    
+    rows = []
+    for row_index, (values, style_id) in enumerate(
+            chain([(MANIFEST_HEADERS, header_style)], ((entry, normal_style) for entry in manifest)), 1):
+        cells = []
+        for col, value in enumerate(values):
+            cell_xml = _cell_xml(f'{chr(ord("A") + col)}{row_index}', style_id, value)
+            if cell_xml is None:
+                # 无法写入的值（如姓名含控制字符）在索引中留空
+                cell_xml = _cell_xml(f'{chr(ord("A") + col)}{row_index}', style_id, None)
+            cells.append(cell_xml)
+        rows.append(f'<row r="{row_index}">{"".join(cells)}</row>')
+    
+    cols = ''.join(f'<col width="15" customWidth="1" min="{col}" max="{col}" />'
+                   for col in range(1, len(MANIFEST_HEADERS) + 1))
+    return ('<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            f'<cols>{cols}</cols><sheetData>{"".join(rows)}</sheetData></worksheet>').encode('utf-8')
+
+
+def _workbook_parts(template, sheet_titles):
+    """
+    按工作表数量改写模板的工作簿目录、关系和内容类型文件
+    
+    返回:
+        dict: 文件名 -> 文件内容
+    """
+    count = len(sheet_titles)
+    
+    # 工作簿目录：列出全部工作表
+    workbook_xml = template._files['xl/workbook.xml'].decode('utf-8')
+    sheets = ''.join(
+        f'<sheet name={quoteattr(title)} sheetId="{i}" state="visible" r:id="rId{i}" />'
+        for i, title in enumerate(sheet_titles, 1))
+    workbook_xml = re.sub(r'<sheets>.*?</sheets>', lambda _: f'<sheets>{sheets}</sheets>', workbook_xml)
+    
+    # 工作簿关系：工作表使用rId1~rIdN，样式、主题等依次后移
+    def replace_relationship(match):
+        relationship = match.group(0)
+        if '/relationships/worksheet"' in relationship:
+            return ''.join(relationship.replace('sheet1.xml', f'sheet{i}.xml').replace('"rId1"', f'"rId{i}"')
+                           for i in range(1, count + 1))
+        return re.sub(r'Id="rId(\d+)"', lambda m: f'Id="rId{int(m.group(1)) + count - 1}"', relationship)
+    
+    rels_xml = re.sub(r'<Relationship [^>]*/>', replace_relationship,
+                      template._files['xl/_rels/workbook.xml.rels'].decode('utf-8'))
+    
+    # 内容类型：为每个工作表声明一次
+    def replace_override(match):
+        return ''.join(match.group(0).replace('sheet1.xml', f'sheet{i}.xml') for i in range(1, count + 1))
+    
+    content_types_xml = re.sub(r'<Override PartName="/xl/worksheets/sheet1.xml"[^>]*/>', replace_override,
+                               template._files['[Content_Types].xml'].decode('utf-8'))
+    
+    return {
+        'xl/workbook.xml': workbook_xml.encode('utf-8'),
+        'xl/_rels/workbook.xml.rels': rels_xml.encode('utf-8'),
+        '[Content_Types].xml': content_types_xml.encode('utf-8'),
+    }
+
+
 def generate_summary_excel(employees, month=None, output_path=None):
     """
     生成汇总工资条Excel文件 - 每个员工数据前都有表头
     
+    使用只写模式逐行流式写入，内存占用与员工数量无关
+    
     参数:
-        employees (list): 员工数据字典列表
+        employees (iterable): 员工数据字典列表，也可以是逐条返回员工数据的迭代器
         month (int, optional): 默认月份，默认为当前月份
         output_path (str, optional): 输出文件路径，默认为桌面
     
     返回:
         str: 生成的Excel文件路径
     """
-    if not employees:
+    employees = iter(employees)
+    first_employee = next(employees, None)
+    if first_employee is None:
         raise ValueError("没有员工数据")
     
     # 默认使用当前月份和年份
@@ -154,15 +735,17 @@ def generate_summary_excel(employees, month=None, output_path=None):
         month = datetime.now().month
     
     # 尝试从员工数据中获取年份
-    if employees and 'year' in employees[0]:
-        year = employees[0]['year']
+    if 'year' in first_employee:
+        year = first_employee['year']
     
-    # 创建工作簿
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "工资表"
+    # 创建只写工作簿
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("工资表")
     
-    # 设置列宽
+    # 注册命名样式
+    register_styles(wb)
+    
+    # 设置列宽（只写模式下必须在写入数据前设置）
     columns = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K', 'L', 'M']
     for col in columns:
         ws.column_dimensions[col].width = 15
@@ -171,70 +754,66 @@ def generate_summary_excel(employees, month=None, output_path=None):
     headers = ["姓名", "年份", "月份", "基本工资", "应出勤天数", "实际出勤天数", 
               "夜班补助", "高温补贴", "迟到罚款", "其他", "缺勤扣款", "实发工资", "签字"]
     
-    # 当前行
-    current_row = 1
-    
-    # 为每个员工添加表头和数据
-    for employee in employees:
-        # 添加表头
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=current_row, column=col)
-            cell.value = header
-            set_cell_style(cell, 'header')
-        
-        # 添加员工数据
-        current_row += 1
-        ws.cell(row=current_row, column=1).value = employee.get('name', '')
-        ws.cell(row=current_row, column=2).value = employee.get('year', year)
-        ws.cell(row=current_row, column=3).value = employee.get('month', month)
-        ws.cell(row=current_row, column=4).value = employee.get('base_salary', 0)
-        ws.cell(row=current_row, column=5).value = employee.get('required_days', 0)
-        ws.cell(row=current_row, column=6).value = employee.get('actual_days', 0)
-        ws.cell(row=current_row, column=7).value = employee.get('night_shift', 0)
-        ws.cell(row=current_row, column=8).value = employee.get('high_temp', 0)
-        ws.cell(row=current_row, column=9).value = employee.get('late_fine', 0)
-        ws.cell(row=current_row, column=10).value = employee.get('others', 0)
-        ws.cell(row=current_row, column=11).value = employee.get('absence_deduction', 0)
-        ws.cell(row=current_row, column=12).value = employee.get('net_salary', 0)
-        ws.cell(row=current_row, column=13).value = employee.get('signature', '')
-        
-        # 设置样式
-        for col in range(1, 14):
-            cell = ws.cell(row=current_row, column=col)
-            set_cell_style(cell, 'normal')
-        
-        # 设置特殊单元格样式
-        set_cell_style(ws.cell(row=current_row, column=11), 'deduction')
-        set_cell_style(ws.cell(row=current_row, column=12), 'total')
-        
-        # 添加空行（除非是最后一个员工）
-        if employee != employees[-1]:
-            current_row += 2  # 增加2行，留出一个空行
-    
-    # 计算总计并添加到最后一行
-    if employees:
-        # 空两行
-        current_row += 2
-        
-        # 添加总计行
-        ws.cell(row=current_row, column=1).value = "总计"
-        set_cell_style(ws.cell(row=current_row, column=1), 'header')
-        
-        # 计算各列总计
-        total_base_salary = sum(e.get('base_salary', 0) for e in employees)
-        total_high_temp = sum(e.get('high_temp', 0) for e in employees)
-        total_absence_deduction = sum(e.get('absence_deduction', 0) for e in employees)
-        total_net_salary = sum(e.get('net_salary', 0) for e in employees)
-        
-        # 添加总计值
-        ws.cell(row=current_row, column=4).value = total_base_salary
-        ws.cell(row=current_row, column=8).value = total_high_temp
-        ws.cell(row=current_row, column=11).value = total_absence_deduction
-        ws.cell(row=current_row, column=12).value = total_net_salary
-        
-        # 设置总计行样式
-        for col in [4, 8, 11, 12]:
-            set_cell_style(ws.cell(row=current_row, column=col), 'total')
+    # 只写模式下每行追加后立即写出，所有员工可复用同一组带样式的单元格，只更新数据
+    header_row = [_write_only_cell(ws, header, 'header') for header in headers]
+    data_row = [_write_only_cell(ws, None, style_type) for style_type in DATA_ROW_STYLES]
+    
+    # 各列总计（按整数分累计，避免大量浮点数相加产生误差）
+    total_base_salary = 0
+    total_high_temp = 0
+    total_absence_deduction = 0
+    total_net_salary = 0
+    
+    # 为每个员工添加表头和数据（只写模式下设置样式和写出XML都在append中完成）
+    try:
+        with perf.span('excel.summary.rows'):
+            for index, employee in enumerate(chain([first_employee], employees)):
+                # 员工之间留出一个空行
+                if index:
+                    ws.append([])
+                
+                # 添加表头
+                ws.append(header_row)
+                
+                # 添加员工数据（缺勤扣款和实发工资使用特殊样式）
+                values = [
+                    employee.get('name', ''),
+                    employee.get('year', year),
+                    employee.get('month', month),
+                    employee.get('base_salary', 0),
+                    employee.get('required_days', 0),
+                    employee.get('actual_days', 0),
+                    employee.get('night_shift', 0),
+                    employee.get('high_temp', 0),
+                    employee.get('late_fine', 0),
+                    employee.get('others', 0),
+                    employee.get('absence_deduction', 0),
+                    employee.get('net_salary', 0),
+                    employee.get('signature', '')
+                ]
+                for cell, value in zip(data_row, values):
+                    cell.value = value
+                ws.append(data_row)
+                
+                # 累计总计
+                total_base_salary += to_cents(values[3])
+                total_high_temp += to_cents(values[7])
+                total_absence_deduction += to_cents(values[10])
+                total_net_salary += to_cents(values[11])
+    except BaseException:
+        # 中途停止时结束只写工作表的临时文件，不保存工作簿
+        ws.close()
+        raise
+    
+    # 空一行后添加总计行
+    ws.append([])
+    ws.append([
+        _write_only_cell(ws, "总计", 'header'), None, None,
+        _write_only_cell(ws, from_cents(total_base_salary), 'total'), None, None, None,
+        _write_only_cell(ws, from_cents(total_high_temp), 'total'), None, None,
+        _write_only_cell(ws, from_cents(total_absence_deduction), 'total'),
+        _write_only_cell(ws, from_cents(total_net_salary), 'total')
+    ])
     
     # 确定保存路径
     if not output_path:
@@ -245,10 +824,33 @@ def generate_summary_excel(employees, month=None, output_path=None):
         output_path = os.path.join(desktop, filename)
     
     # 保存工作簿
-    wb.save(output_path)
+    with perf.span('excel.summary.save'):
+        wb.save(output_path)
+    perf.count('excel.summary.employees', index + 1)
     return output_path
 
 
+def _write_only_cell(ws, value, style_type):
+    """创建带命名样式的只写单元格"""
+    cell = WriteOnlyCell(ws, value=value)
+    cell.style = CELL_STYLES[style_type].name
+    return cell
+
+
+def register_styles(wb):
+    """
+    在工作簿中注册工资条命名样式，已注册的样式不会重复注册
+    
+    参数:
+        wb (openpyxl.Workbook): 工作簿对象
+    """
+    registered = wb.named_styles
+    for style in CELL_STYLES.values():
+        if style.name not in registered:
+            # 注册副本，避免多个工作簿共用同一个样式对象
+            wb.add_named_style(copy(style))
+
+
 def set_cell_style(cell, style_type):
     """
     设置单元格样式
@@ -257,27 +859,10 @@ def set_cell_style(cell, style_type):
         cell (openpyxl.cell): 单元格对象
         style_type (str): 样式类型，如'header', 'normal', 'deduction', 'total'
     """
-    # 基本样式 - 所有单元格共有
-    thin_border = Border(
-        left=Side(style='thin'), 
-        right=Side(style='thin'), 
-        top=Side(style='thin'), 
-        bottom=Side(style='thin')
-    )
-    cell.border = thin_border
-    cell.alignment = Alignment(horizontal='center', vertical='center')
-    
-    # 特定样式
-    if style_type == 'header':
-        cell.font = Font(bold=True, size=12)
-        cell.fill = PatternFill(start_color="DDDDDD", end_color="DDDDDD", fill_type="solid")
-    
-    elif style_type == 'normal':
-        cell.font = Font(size=11)
-    
-    elif style_type == 'deduction':
-        cell.font = Font(size=11, color="FF0000")  # 红色字体表示扣款
-    
-    elif style_type == 'total':
-        cell.font = Font(bold=True, size=12)
-        cell.fill = PatternFill(start_color="E6F2FF", end_color="E6F2FF", fill_type="solid")
\ No newline at end of file
+    style_name = CELL_STYLES[style_type].name
+    try:
+        cell.style = style_name
+    except ValueError:
+        # 工作簿尚未注册工资条样式
+        register_styles(cell.parent.parent)
+        cell.style = style_name
@@ -0,0 +1,198 @@
+"""
+工资历史模块
+按(年份, 月份)分期保存生成工资表/工资条时的员工工资数据，支持按员工查询一段时间的历史、
+取出某个月的全部数据重新生成工资条，以及基于每月汇总的年度累计统计
+"""
+
+from core.calculator import from_cents, to_cents
+from utils.employee_store import EmployeeStore, FIELDS
+
+
+# 每月汇总的金额字段（按整数分累计）
+ROLLUP_FIELDS = ('base_salary', 'night_shift', 'high_temp', 'late_fine', 'others',
+                 'absence_deduction', 'net_salary')
+
+# 员工数据各字段的列类型（员工名单表和工资历史表共用）
+COLUMN_TYPES = {
+    'name': 'TEXT NOT NULL',
+    'year': 'INTEGER NOT NULL',
+    'month': 'INTEGER NOT NULL',
+    'signature': "TEXT NOT NULL DEFAULT ''",
+}
+COLUMNS_SQL = ", ".join(f"{field} {COLUMN_TYPES.get(field, 'REAL NOT NULL DEFAULT 0')}" for field in FIELDS)
+FIELD_LIST = ", ".join(FIELDS)
+PLACEHOLDERS = ", ".join("?" for _ in FIELDS)
+_ROLLUP_LIST = ", ".join(ROLLUP_FIELDS)
+
+HISTORY_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS payroll_history (
+    {COLUMNS_SQL},
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (name, year, month)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS payroll_history_period ON payroll_history (year, month);
+CREATE TABLE IF NOT EXISTS period_rollups (
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    employee_count INTEGER NOT NULL,
+    {", ".join(f"{field} INTEGER NOT NULL" for field in ROLLUP_FIELDS)},
+    PRIMARY KEY (year, month)
+) WITHOUT ROWID;
+"""
+
+# 从原始数据重新计算一个月的汇总（金额用to_cents换算为分后累加）
+_REFRESH_ROLLUP_SQL = f"""
+INSERT OR REPLACE INTO period_rollups (year, month, employee_count, {_ROLLUP_LIST})
+SELECT year, month, COUNT(*), {", ".join(f"SUM(to_cents({field}))" for field in ROLLUP_FIELDS)}
+FROM payroll_history WHERE year = ? AND month = ? GROUP BY year, month
+"""
+
+_DELETE_PERIOD_SQL = "DELETE FROM payroll_history WHERE year = ? AND month = ?"
+_INSERT_SQL = f"INSERT OR REPLACE INTO payroll_history ({FIELD_LIST}, updated_at) VALUES ({PLACEHOLDERS}, ?)"
+
+
+class PayrollHistory:
+    """
+    按月分期的工资历史
+    
+    payroll_history表以(姓名, 年份, 月份)为主键，同一员工同一月份只保留最新的一条，
+    按员工查询一段时间直接按主键范围读取；按(年份, 月份)建立索引，取某个月的数据不扫描其他月份。
+    每次写入替换所涉及月份的全部数据，改名或删除的员工不会留在历史中。
+    period_rollups表保存每月的人数和各项金额合计（整数分），写入后重新计算受影响月份的汇总；
+    年度累计只需读取最多12条汇总
+    """
+    
+    def __init__(self, connection):
+        """
+        参数:
+            connection (sqlite3.Connection): 数据库连接，表不存在时自动创建
+        """
+        self.connection = connection
+        # SQL中的ROUND在.5时远离零舍入，与Python的round()不同，汇总统一用to_cents换算
+        connection.create_function('to_cents', 1, to_cents)
+        with connection:
+            connection.executescript(HISTORY_SCHEMA)
+    
+    def record(self, rows, updated_at):
+        """
+        用员工工资数据替换所涉及月份的历史，并重新计算这些月份的汇总，在调用方的事务中执行
+        
+        参数:
+            rows (iterable): 按FIELDS顺序排列的行，没有姓名的行被忽略
+            updated_at (str): 写入时间
+        
+        返回:
+            list: 被替换的(年份, 月份)列表
+        """
+        rows = [row for row in rows if row[0]]
+        periods = sorted({(row[1], row[2]) for row in rows})
+        self.connection.executemany(_DELETE_PERIOD_SQL, periods)
+        self.connection.executemany(_INSERT_SQL, ((*row, updated_at) for row in rows))
+        self.connection.executemany(_REFRESH_ROLLUP_SQL, periods)
+        return periods
+    
+    def rebuild_rollups(self):
+        """从原始数据重新计算所有月份的汇总，用于核对或修复汇总表"""
+        with self.connection:
+            self.connection.execute("DELETE FROM period_rollups")
+            periods = self.connection.execute("SELECT DISTINCT year, month FROM payroll_history").fetchall()
+            self.connection.executemany(_REFRESH_ROLLUP_SQL, periods)
+    
+    def employee_history(self, name, start=None, end=None):
+        """
+        查询一名员工一段时间内的工资历史
+        
+        参数:
+            name (str): 员工姓名
+            start (tuple, optional): 起始(年份, 月份)，包含该月
+            end (tuple, optional): 结束(年份, 月份)，包含该月
+        
+        返回:
+            list: 员工数据字典列表，按时间排序
+        """
+        conditions = ["name = ?"]
+        params = [name]
+        if start is not None:
+            conditions.append("(year, month) >= (?, ?)")
+            params.extend(start)
+        if end is not None:
+            conditions.append("(year, month) <= (?, ?)")
+            params.extend(end)
+        cursor = self.connection.execute(
+            f"SELECT {FIELD_LIST} FROM payroll_history WHERE {' AND '.join(conditions)} ORDER BY year, month",
+            params)
+        return [dict(zip(FIELDS, row)) for row in cursor]
+    
+    def period(self, year, month):
+        """
+        取出某个月的全部员工数据
+        
+        参数:
+            year (int): 年份
+            month (int): 月份
+        
+        返回:
+            EmployeeStore: 按姓名排序的员工数据
+        """
+        rows = self.connection.execute(
+            f"SELECT {FIELD_LIST} FROM payroll_history WHERE year = ? AND month = ? ORDER BY name",
+            (year, month)).fetchall()
+        if not rows:
+            return EmployeeStore()
+        return EmployeeStore.from_columns(dict(zip(FIELDS, map(list, zip(*rows)))))
+    
+    def periods(self):
+        """
+        获取有工资历史的月份（读取每月汇总）
+        
+        返回:
+            list: 每月汇总字典列表，按时间排序，见rollup()
+        """
+        cursor = self.connection.execute(
+            f"SELECT year, month, employee_count, {_ROLLUP_LIST} FROM period_rollups ORDER BY year, month")
+        return [_rollup_dict(row) for row in cursor]
+    
+    def rollup(self, year, month):
+        """
+        获取一个月的汇总
+        
+        参数:
+            year (int): 年份
+            month (int): 月份
+        
+        返回:
+            dict: 包含year、month、employee_count和各项金额合计的字典，没有数据时返回None
+        """
+        row = self.connection.execute(
+            f"SELECT year, month, employee_count, {_ROLLUP_LIST} FROM period_rollups WHERE year = ? AND month = ?",
+            (year, month)).fetchone()
+        return None if row is None else _rollup_dict(row)
+    
+    def year_to_date(self, year, month=12):
+        """
+        计算年度累计，直接累加每月汇总，不读取原始数据
+        
+        参数:
+            year (int): 年份
+            month (int, optional): 累计到该月（包含）
+        
+        返回:
+            dict: 包含year、month、months（有数据的月数）、employee_count（各月人数之和）和各项金额合计的字典
+        """
+        row = self.connection.execute(
+            f"SELECT COUNT(*), COALESCE(SUM(employee_count), 0), "
+            f"{', '.join(f'COALESCE(SUM({field}), 0)' for field in ROLLUP_FIELDS)} "
+            f"FROM period_rollups WHERE year = ? AND month <= ?",
+            (year, month)).fetchone()
+        result = {'year': year, 'month': month, 'months': row[0], 'employee_count': row[1]}
+        for field, cents in zip(ROLLUP_FIELDS, row[2:]):
+            result[field] = from_cents(cents)
+        return result
+
+
+def _rollup_dict(row):
+    """将period_rollups的一行转换为字典，金额转换为元"""
+    result = {'year': row[0], 'month': row[1], 'employee_count': row[2]}
+    for field, cents in zip(ROLLUP_FIELDS, row[3:]):
+        result[field] = from_cents(cents)
+    return result
@@ -0,0 +1,171 @@
+"""
+性能统计模块
+在导入、生成Excel和批量窗口的计算/保存等热路径上记录命名的耗时区间（span）和计数器（counter），
+用于定位月末处理慢的原因。默认关闭，关闭时span()返回共享的空上下文，count()直接返回，几乎没有开销
+
+用法:
+    from utils import perf
+    with perf.span('excel.summary.save'):
+        wb.save(path)
+    perf.count('import.rows', rows)
+    perf.summary()   # 汇总结果
+
+逐行执行的循环中应在循环外读取一次perf.enabled，开启时才计时，最后用add_time()一次记录。
+多进程生成个人工资条时，工作进程中的统计不会汇总到主进程
+"""
+
+import os
+import time
+import threading
+
+
+# 通过环境变量在启动时开启统计，例如 PAYSLIP_PERF=1；也可在“性能统计”面板中开启
+PERF_ENV = 'PAYSLIP_PERF'
+
+# 是否开启统计（调用方通过perf.enabled读取，不要用from导入该名称）
+enabled = bool(os.environ.get(PERF_ENV))
+
+_lock = threading.Lock()
+# 区间名 -> [次数, 总耗时, 最长一次耗时]
+_spans = {}
+# 计数器名 -> 累计值
+_counters = {}
+
+
+class _NullSpan:
+    """统计关闭时使用的空上下文"""
+    
+    __slots__ = ()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """记录一个区间的耗时，异常退出时同样记录"""
+    
+    __slots__ = ('name', 'start')
+    
+    def __init__(self, name):
+        self.name = name
+        self.start = 0.0
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        add_time(self.name, time.perf_counter() - self.start)
+        return False
+
+
+def enable():
+    """开启统计"""
+    global enabled
+    enabled = True
+
+
+def disable():
+    """关闭统计，已记录的结果保留"""
+    global enabled
+    enabled = False
+
+
+def reset():
+    """清空已记录的结果"""
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+
+
+def span(name):
+    """
+    创建一个计时区间，用于with语句
+    
+    参数:
+        name (str): 区间名，按“模块.步骤”命名，如'import.read'
+    
+    返回:
+        上下文管理器，统计关闭时为共享的空上下文
+    """
+    if not enabled:
+        return _NULL_SPAN
+    return _Span(name)
+
+
+def add_time(name, seconds, calls=1):
+    """
+    记录一个区间的耗时（用于在循环中自行累计的耗时）
+    
+    参数:
+        name (str): 区间名
+        seconds (float): 耗时（秒）
+        calls (int, optional): 这段耗时包含的次数，最长耗时按这几次的平均值计
+    """
+    if not enabled:
+        return
+    with _lock:
+        record = _spans.get(name)
+        if record is None:
+            _spans[name] = [calls, seconds, seconds / calls if calls else seconds]
+            return
+        record[0] += calls
+        record[1] += seconds
+        longest = seconds / calls if calls else seconds
+        if longest > record[2]:
+            record[2] = longest
+
+
+def count(name, value=1):
+    """
+    累加计数器
+    
+    参数:
+        name (str): 计数器名
+        value (int, optional): 增加的值
+    """
+    if not enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def summary():
+    """
+    获取统计结果
+    
+    返回:
+        dict: {'enabled': 是否开启,
+               'spans': {区间名: {'count': 次数, 'total': 总耗时, 'mean': 平均耗时, 'max': 最长耗时}},
+               'counters': {计数器名: 累计值}}，耗时单位为秒，按名称排序
+    """
+    with _lock:
+        spans = {name: {'count': calls, 'total': total, 'mean': total / calls if calls else 0.0, 'max': longest}
+                 for name, (calls, total, longest) in sorted(_spans.items())}
+        counters = dict(sorted(_counters.items()))
+    return {'enabled': enabled, 'spans': spans, 'counters': counters}
+
+
+def format_summary():
+    """
+    生成可读的统计文本
+    
+    返回:
+        str: 各区间的次数和耗时、各计数器的值
+    """
+    result = summary()
+    if not result['spans'] and not result['counters']:
+        return "尚无统计数据" if result['enabled'] else "性能统计未开启"
+    lines = []
+    for name, item in result['spans'].items():
+        lines.append(f"{name:<28} {item['count']:>8}次  总计{item['total'] * 1e3:10.1f}ms  "
+                     f"平均{item['mean'] * 1e3:8.3f}ms  最长{item['max'] * 1e3:8.3f}ms")
+    for name, value in result['counters'].items():
+        lines.append(f"{name:<28} {value:>8}")
+    return "\n".join(lines)
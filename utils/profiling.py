@@ -0,0 +1,213 @@
+"""
+性能分析模块
+开启后对一次界面操作（从点击按钮到后台任务结束）同时运行cProfile和tracemalloc，
+保存带时间戳的.prof文件和可直接阅读的分析报告（最耗时的函数、内存峰值和占用最多的分配位置），
+用户无需安装任何工具即可把结果发给开发人员
+
+.prof文件可用 python -m pstats 文件名 或 snakeviz 等工具查看。
+性能分析默认关闭，cProfile、pstats和tracemalloc在开始分析时才导入，不增加启动时间
+"""
+
+import io
+import os
+import time
+import threading
+from datetime import datetime
+
+
+# 通过环境变量在启动时开启性能分析，例如 PAYSLIP_PROFILE=1；
+# 也可在批量窗口中按Ctrl+Shift+P随时开启或关闭
+PROFILE_ENV = 'PAYSLIP_PROFILE'
+# 没有输出文件的操作（如导入）保存分析结果的目录，默认为桌面
+PROFILE_DIR_ENV = 'PAYSLIP_PROFILE_DIR'
+
+# 是否开启性能分析（调用方通过profiling.enabled读取）
+enabled = bool(os.environ.get(PROFILE_ENV))
+
+# 分析报告中列出的函数数量和内存分配位置数量
+REPORT_FUNCTIONS = 40
+REPORT_ALLOCATIONS = 30
+# 报告中列出完整调用栈的内存分配数量
+REPORT_TRACEBACKS = 5
+# tracemalloc记录的调用栈深度
+TRACEMALLOC_FRAMES = 10
+
+# 统计内存分配时忽略的位置（tracemalloc模块自身的文件另外忽略）
+IGNORED_ALLOCATIONS = ("<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>", "<unknown>")
+
+
+def enable():
+    """开启性能分析"""
+    global enabled
+    enabled = True
+
+
+def disable():
+    """关闭性能分析，正在进行的分析不受影响"""
+    global enabled
+    enabled = False
+
+
+def default_output_dir():
+    """
+    获取没有输出文件的操作保存分析结果的目录
+    
+    返回:
+        str: 环境变量PAYSLIP_PROFILE_DIR指定的目录，否则为桌面（不存在时为用户目录）
+    """
+    directory = os.environ.get(PROFILE_DIR_ENV)
+    if directory:
+        return directory
+    desktop = os.path.join(os.path.expanduser('~'), 'Desktop')
+    return desktop if os.path.isdir(desktop) else os.path.expanduser('~')
+
+
+class ProfileSession:
+    """
+    一次操作的性能分析
+    
+    start()开始后当前线程的调用都被记录；后台任务通过run()执行时在任务线程中另外记录，
+    finish()时合并保存。Python 3.12起cProfile对所有线程生效且同时只能有一个分析器，
+    此时后台任务直接由start()开始的分析器记录
+    """
+    
+    def __init__(self, action):
+        """
+        参数:
+            action (str): 操作名称，用于文件名和报告标题
+        """
+        import cProfile
+        
+        self.action = action
+        self.started_at = datetime.now()
+        self.notes = []
+        self._profile = cProfile.Profile()
+        self._thread_profiles = []
+        self._lock = threading.Lock()
+        self._start_time = None
+        self._owns_tracemalloc = False
+        self._start_snapshot = None
+    
+    def start(self):
+        """开始分析"""
+        import tracemalloc
+        
+        if tracemalloc.is_tracing():
+            # 已由其他代码开启（如PYTHONTRACEMALLOC），只比较前后差异
+            self._start_snapshot = tracemalloc.take_snapshot()
+        else:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self._owns_tracemalloc = True
+        self._start_time = time.perf_counter()
+        self._profile.enable()
+    
+    def note(self, text):
+        """在报告中记录一条说明"""
+        self.notes.append(text)
+    
+    def run(self, func, *args, **kwargs):
+        """
+        在当前线程（后台任务线程）中执行函数并记录
+        
+        返回:
+            func的返回值
+        """
+        import cProfile
+        
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # 已有分析器对所有线程生效
+            return func(*args, **kwargs)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile.disable()
+            with self._lock:
+                self._thread_profiles.append(profile)
+    
+    def finish(self, output_dir=None):
+        """
+        结束分析并保存结果，应在调用start()的线程中调用
+        
+        参数:
+            output_dir (str, optional): 保存目录，默认见default_output_dir()
+        
+        返回:
+            tuple: (.prof文件路径, 分析报告路径)
+        """
+        import pstats
+        import tracemalloc
+        
+        self._profile.disable()
+        elapsed = time.perf_counter() - self._start_time
+        
+        filters = _allocation_filters()
+        snapshot = tracemalloc.take_snapshot().filter_traces(filters)
+        current, peak = tracemalloc.get_traced_memory()
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+        
+        stats = pstats.Stats(self._profile)
+        with self._lock:
+            for profile in self._thread_profiles:
+                stats.add(profile)
+        
+        if not output_dir:
+            output_dir = default_output_dir()
+        os.makedirs(output_dir, exist_ok=True)
+        base_name = f"性能分析_{self.started_at.strftime('%Y%m%d%H%M%S')}_{self.action}"
+        prof_path = os.path.join(output_dir, base_name + ".prof")
+        report_path = os.path.join(output_dir, base_name + ".txt")
+        
+        stats.dump_stats(prof_path)
+        with open(report_path, 'w', encoding='utf-8') as f:
+            f.write(self._report(stats, snapshot, filters, elapsed, current, peak))
+        return prof_path, report_path
+    
+    def _report(self, stats, snapshot, filters, elapsed, current, peak):
+        """生成分析报告文本"""
+        import platform
+        
+        lines = [
+            f"操作：{self.action}",
+            f"开始时间：{self.started_at.isoformat(timespec='seconds')}",
+            f"耗时：{elapsed:.3f}秒（包含等待对话框输入的时间）",
+            f"Python {platform.python_version()}，{platform.platform()}",
+        ]
+        lines.extend(f"说明：{note}" for note in self.notes)
+        
+        lines.append("")
+        lines.append(f"== 累计耗时最多的{REPORT_FUNCTIONS}个函数 ==")
+        stream = io.StringIO()
+        stats.stream = stream
+        stats.sort_stats('cumulative').print_stats(REPORT_FUNCTIONS)
+        lines.append(stream.getvalue().strip())
+        
+        lines.append("")
+        if self._start_snapshot is not None:
+            lines.append("== 内存：tracemalloc在分析开始前已开启，以下为操作前后的差异 ==")
+            top = snapshot.compare_to(self._start_snapshot.filter_traces(filters), 'lineno')
+            for stat in top[:REPORT_ALLOCATIONS]:
+                lines.append(str(stat))
+            return "\n".join(lines) + "\n"
+        
+        lines.append(f"== 内存：峰值{peak / 2**20:.1f}MB，操作结束时仍占用{current / 2**20:.1f}MB ==")
+        lines.append(f"-- 结束时仍占用内存最多的{REPORT_ALLOCATIONS}个分配位置 --")
+        for stat in snapshot.statistics('lineno')[:REPORT_ALLOCATIONS]:
+            lines.append(str(stat))
+        lines.append(f"-- 其中最多的{REPORT_TRACEBACKS}个分配的调用栈 --")
+        for stat in snapshot.statistics('traceback')[:REPORT_TRACEBACKS]:
+            lines.append(f"{stat.size / 1024:.1f}KiB，{stat.count}个对象")
+            lines.extend(stat.traceback.format())
+        return "\n".join(lines) + "\n"
+
+
+def _allocation_filters():
+    """统计内存分配时使用的过滤条件"""
+    import tracemalloc
+    
+    filters = [tracemalloc.Filter(False, pattern) for pattern in IGNORED_ALLOCATIONS]
+    filters.append(tracemalloc.Filter(False, tracemalloc.__file__))
+    return filters
@@ -0,0 +1,125 @@
+"""
+启动计时模块
+记录程序启动各步骤的耗时和期间新导入的模块，计算从开始运行到显示主窗口的时间并与启动预算比较
+"""
+
+import os
+import sys
+import time
+import logging
+
+
+# 通过环境变量输出启动报告和调整启动预算，例如 PAYSLIP_STARTUP_REPORT=1 PAYSLIP_STARTUP_BUDGET=1500
+STARTUP_REPORT_ENV = 'PAYSLIP_STARTUP_REPORT'
+STARTUP_BUDGET_ENV = 'PAYSLIP_STARTUP_BUDGET'
+
+# 默认启动预算（毫秒）
+DEFAULT_BUDGET_MS = 1500
+
+# 报告中每个步骤最多列出的新导入顶层包数量
+REPORT_MAX_PACKAGES = 8
+
+logger = logging.getLogger(__name__)
+
+
+def startup_budget_ms():
+    """
+    获取启动预算
+    
+    返回:
+        int: 启动预算（毫秒），默认读取环境变量PAYSLIP_STARTUP_BUDGET，否则为DEFAULT_BUDGET_MS
+    """
+    try:
+        return int(os.environ.get(STARTUP_BUDGET_ENV, DEFAULT_BUDGET_MS))
+    except ValueError:
+        return DEFAULT_BUDGET_MS
+
+
+class StartupTimer:
+    """
+    启动计时器
+    
+    每调用一次step()结束上一个步骤并开始新步骤，记录步骤耗时和期间新导入的模块，
+    同时调用on_step回调（用于在启动画面上显示当前步骤）。finish()结束计时并输出报告
+    """
+    
+    def __init__(self, start=None, label="加载程序模块", budget_ms=None, on_step=None, modules=None):
+        """
+        参数:
+            start (float, optional): 开始时间（time.perf_counter()），默认为现在；
+                入口脚本应在导入其他模块前记录，使模块导入耗时计入第一个步骤
+            label (str, optional): 第一个步骤的名称
+            budget_ms (int, optional): 启动预算（毫秒），默认见startup_budget_ms()
+            on_step (callable, optional): 开始新步骤时调用，参数为步骤名称
+            modules (set, optional): 开始时已加载的模块名，默认为现在已加载的模块
+        """
+        self.start = time.perf_counter() if start is None else start
+        self.budget_ms = startup_budget_ms() if budget_ms is None else budget_ms
+        self.on_step = on_step
+        self.steps = []
+        self.total = None
+        self._label = label
+        self._step_start = self.start
+        self._modules = set(sys.modules) if modules is None else set(modules)
+    
+    def step(self, label):
+        """
+        结束当前步骤并开始新步骤
+        
+        参数:
+            label (str): 新步骤的名称
+        """
+        self._close_step()
+        self._label = label
+        if self.on_step is not None:
+            self.on_step(label)
+    
+    def finish(self):
+        """
+        结束计时并输出启动报告：超出预算时记录警告，否则记录INFO日志；
+        设置了环境变量PAYSLIP_STARTUP_REPORT时同时输出到标准错误
+        
+        返回:
+            float: 从开始到现在的耗时（秒）
+        """
+        self._close_step()
+        self.total = time.perf_counter() - self.start
+        
+        level = logging.WARNING if self.over_budget() else logging.INFO
+        report = self.report()
+        logger.log(level, "%s", report)
+        if os.environ.get(STARTUP_REPORT_ENV) and sys.stderr is not None:
+            print(report, file=sys.stderr)
+        return self.total
+    
+    def over_budget(self):
+        """是否超出启动预算"""
+        return self.total is not None and self.total * 1000 > self.budget_ms
+    
+    def report(self):
+        """
+        生成启动报告
+        
+        返回:
+            str: 总耗时、预算和各步骤的耗时、新导入模块数量及主要的新导入包
+        """
+        total = self.total if self.total is not None else time.perf_counter() - self.start
+        status = "超出预算" if total * 1000 > self.budget_ms else "在预算内"
+        lines = [f"启动耗时 {total * 1000:.0f}ms（预算 {self.budget_ms}ms，{status}）"]
+        for label, elapsed, modules in self.steps:
+            packages = sorted({name.partition('.')[0] for name in modules})
+            line = f"  {label:<12} {elapsed * 1000:7.1f}ms  新导入{len(modules)}个模块"
+            if packages:
+                shown = ", ".join(packages[:REPORT_MAX_PACKAGES])
+                more = "等" if len(packages) > REPORT_MAX_PACKAGES else ""
+                line += f"（{shown}{more}）"
+            lines.append(line)
+        return "\n".join(lines)
+    
+    def _close_step(self):
+        """记录当前步骤的耗时和新导入的模块"""
+        now = time.perf_counter()
+        modules = set(sys.modules)
+        self.steps.append((self._label, now - self._step_start, modules - self._modules))
+        self._step_start = now
+        self._modules = modules
@@ -0,0 +1,177 @@
+"""
+数据持久化模块
+使用SQLite保存批量模式的员工名单和每月工资历史（见utils.history），程序重新启动后自动加载
+"""
+
+import os
+import json
+import sqlite3
+from datetime import datetime
+
+from utils.employee_store import EmployeeStore, FIELDS
+from utils.history import PayrollHistory, COLUMNS_SQL, FIELD_LIST, PLACEHOLDERS
+
+
+# 通过环境变量指定数据库文件，例如 PAYSLIP_DB_PATH=D:\工资\payslip.db
+DB_PATH_ENV = 'PAYSLIP_DB_PATH'
+
+# 默认数据库目录名和文件名
+DB_DIR_NAME = 'PayslipGenerator'
+DB_FILE_NAME = 'payslip.db'
+
+# 数据库结构版本（settings、roster表以及utils.history中的工资历史和每月汇总表），结构变化时递增
+SCHEMA_VERSION = 1
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS roster (
+    position INTEGER PRIMARY KEY,
+    {COLUMNS_SQL}
+);
+"""
+
+
+def default_db_path():
+    """
+    获取数据库文件路径
+    
+    优先使用环境变量PAYSLIP_DB_PATH，否则保存在用户数据目录中
+    （Windows为%APPDATA%\\PayslipGenerator，其他系统为~/.payslip）
+    
+    返回:
+        str: 数据库文件路径
+    """
+    path = os.environ.get(DB_PATH_ENV)
+    if path:
+        return path
+    app_data = os.environ.get('APPDATA')
+    if app_data:
+        directory = os.path.join(app_data, DB_DIR_NAME)
+    else:
+        directory = os.path.join(os.path.expanduser('~'), '.payslip')
+    return os.path.join(directory, DB_FILE_NAME)
+
+
+class PayslipStorage:
+    """
+    SQLite数据存储
+    
+    roster表按位置保存批量模式的当前员工名单（编辑时自动保存）；按月分期的工资历史
+    （history属性，见PayrollHistory）只在归档时写入。每次写入都在一个事务中批量完成
+    """
+    
+    def __init__(self, path=None):
+        """
+        打开数据库，不存在时自动创建
+        
+        参数:
+            path (str, optional): 数据库文件路径，默认为default_db_path()，
+                ":memory:"表示只保存在内存中
+        """
+        if path is None:
+            path = default_db_path()
+        if path != ':memory:':
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        
+        self.connection = sqlite3.connect(path)
+        # WAL模式下写入不阻塞读取，每次提交只需追加日志
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+            self.connection.execute("INSERT OR IGNORE INTO settings (key, value) VALUES ('schema_version', ?)",
+                                    (str(SCHEMA_VERSION),))
+        self.history = PayrollHistory(self.connection)
+    
+    def close(self):
+        """关闭数据库"""
+        self.connection.close()
+    
+    def load_roster(self):
+        """
+        加载员工名单
+        
+        返回:
+            EmployeeStore: 按列存储的员工数据
+        """
+        rows = self.connection.execute(f"SELECT {FIELD_LIST} FROM roster ORDER BY position").fetchall()
+        if not rows:
+            return EmployeeStore()
+        return EmployeeStore.from_columns(dict(zip(FIELDS, map(list, zip(*rows)))))
+    
+    def save_roster(self, employees):
+        """
+        用员工数据替换整个员工名单
+        
+        参数:
+            employees (EmployeeStore): 员工数据
+        """
+        with self.connection:
+            self.connection.execute("DELETE FROM roster")
+            self.connection.executemany(
+                f"INSERT INTO roster (position, {FIELD_LIST}) VALUES (?, {PLACEHOLDERS})",
+                ((position, *row) for position, row in enumerate(employees.rows())))
+    
+    def save_roster_rows(self, updates):
+        """
+        更新或添加员工名单中的若干行
+        
+        参数:
+            updates (list): (位置, 员工数据) 列表
+        """
+        rows = [(position, *(employee[field] for field in FIELDS)) for position, employee in updates]
+        with self.connection:
+            self.connection.executemany(
+                f"INSERT OR REPLACE INTO roster (position, {FIELD_LIST}) VALUES (?, {PLACEHOLDERS})", rows)
+    
+    def archive(self, employees):
+        """
+        将员工数据归档到工资历史，替换其中各月份原有的历史
+        
+        参数:
+            employees (iterable): 员工数据字典
+        
+        返回:
+            list: 被替换的(年份, 月份)列表
+        """
+        rows = [tuple(employee[field] for field in FIELDS) for employee in employees]
+        with self.connection:
+            return self.history.record(rows, _now())
+    
+    def load_setting(self, key, default=None):
+        """
+        读取一项设置
+        
+        参数:
+            key (str): 设置名
+            default (optional): 不存在时的返回值
+        
+        返回:
+            设置值（JSON解码后）
+        """
+        row = self.connection.execute("SELECT value FROM settings WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return default
+        return json.loads(row[0])
+    
+    def save_setting(self, key, value):
+        """
+        保存一项设置
+        
+        参数:
+            key (str): 设置名
+            value: 可JSON编码的设置值
+        """
+        with self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+                                    (key, json.dumps(value, ensure_ascii=False)))
+
+
+def _now():
+    """当前时间，用于记录工资历史的写入时间"""
+    return datetime.now().isoformat(timespec='seconds')